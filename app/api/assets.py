@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from typing import List, Optional
+from typing import Dict, List, Optional, BinaryIO, Tuple
 import uuid
-import aiofiles
 import os
 from pathlib import Path
 from datetime import datetime
 import logging
 import hashlib
+import asyncio
 from app.core.semantic_annotator import SemanticAnnotator
 
 from app.models.common import SuccessResponse, ErrorResponse, PaginationParams
 from app.models.assets import AssetMetadata, AssetResponse, AssetListResponse, UploadAssetRequest, AssetType
-from app.config import settings
-from app.dependencies import get_triplestore_client, get_ontology_manager
+from app.config import Settings, get_settings
+from app.dependencies import get_triplestore_client, get_ontology_manager, get_semantic_annotator
 from app.core.triplestore_client import TriplestoreClient
 from app.core.ontology_manager import OntologyManager
 # from app.core.semantic_annotator import *
@@ -21,6 +21,54 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Uploads are copied to disk in 1 MiB chunks, hashed and line-counted in the same pass
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# File extension -> (asset type, WDO classes beyond DigitalInformationCarrier)
+_EXTENSION_CLASSIFICATION: Dict[str, Tuple[AssetType, Tuple[str, ...]]] = {
+    '.py': (AssetType.SOURCE_CODE, ("SourceCodeFile", "PythonSourceCodeFile")),
+    '.js': (AssetType.SOURCE_CODE, ("SourceCodeFile", "JavaScriptSourceCodeFile")),
+    '.ts': (AssetType.SOURCE_CODE, ("SourceCodeFile", "JavaScriptSourceCodeFile")),
+    '.java': (AssetType.SOURCE_CODE, ("SourceCodeFile", "JavaSourceCodeFile")),
+    '.cpp': (AssetType.SOURCE_CODE, ("SourceCodeFile",)),
+    '.md': (AssetType.DOCUMENTATION, ("DocumentationFile",)),
+    '.txt': (AssetType.DOCUMENTATION, ("DocumentationFile",)),
+    '.rst': (AssetType.DOCUMENTATION, ("DocumentationFile",)),
+    '.pdf': (AssetType.DOCUMENTATION, ("DocumentationFile",)),
+    '.json': (AssetType.CONFIGURATION, ("ConfigurationFile",)),
+    '.yml': (AssetType.CONFIGURATION, ("ConfigurationFile",)),
+    '.yaml': (AssetType.CONFIGURATION, ("ConfigurationFile",)),
+    '.toml': (AssetType.CONFIGURATION, ("ConfigurationFile",)),
+    '.png': (AssetType.ASSET_FILE, ("AssetFile",)),
+    '.jpg': (AssetType.ASSET_FILE, ("AssetFile",)),
+    '.svg': (AssetType.ASSET_FILE, ("AssetFile",)),
+    '.css': (AssetType.ASSET_FILE, ("AssetFile",)),
+}
+
+def _write_and_hash(source: BinaryIO, file_path: Path) -> Tuple[str, int, int]:
+    """Copy an upload to disk, returning its SHA-256 checksum, size and line count"""
+    hasher = hashlib.sha256()
+    file_size = 0
+    line_count = 1
+    
+    # Reuse one buffer for every chunk so no per-chunk bytes objects are allocated
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    try:
+        out = open(file_path, 'wb')
+    except FileNotFoundError:
+        # The lifespan creates the upload directory; recreate it if it is missing
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        out = open(file_path, 'wb')
+    with out:
+        while read := source.readinto(buffer):
+            chunk = view[:read]
+            out.write(chunk)
+            hasher.update(chunk)
+            line_count += buffer.count(b'\n', 0, read)
+            file_size += read
+    return hasher.hexdigest(), file_size, line_count
+
 @router.get("/health")
 async def assets_health():
     """Assets API health check"""
@@ -35,23 +83,22 @@ async def upload_asset(
     project_name: Optional[str] = Form(None),
     author: Optional[str] = Form(None),
     triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology_manager: OntologyManager = Depends(get_ontology_manager)
+    ontology_manager: OntologyManager = Depends(get_ontology_manager),
+    semantic_annotator: SemanticAnnotator = Depends(get_semantic_annotator),
+    settings: Settings = Depends(get_settings)
 ):
     """Upload and process a knowledge asset"""
     try:
         # Generate unique ID
         asset_id = str(uuid.uuid4())
         
-        # Create upload directory if it doesn't exist
         upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
         
         # Save file
         file_path = upload_dir / f"{asset_id}_{file.filename}"
-        content = await file.read()
-        
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        checksum, file_size, line_count = await asyncio.to_thread(
+            _write_and_hash, file.file, file_path
+        )
         
         # Parse tags
         tag_list = []
@@ -61,48 +108,23 @@ async def upload_asset(
         # Create basic metadata
         file_extension = Path(file.filename).suffix.lower()
         
-        # Determine asset type
-        asset_type = AssetType.UNKNOWN
-        if file_extension in ['.py', '.js', '.ts', '.java', '.cpp']:
-            asset_type = AssetType.SOURCE_CODE
-        elif file_extension in ['.md', '.txt', '.rst', '.pdf']:
-            asset_type = AssetType.DOCUMENTATION
-        elif file_extension in ['.json', '.yml', '.yaml', '.toml']:
-            asset_type = AssetType.CONFIGURATION
-        elif file_extension in ['.png', '.jpg', '.svg', '.css']:
-            asset_type = AssetType.ASSET_FILE
-        
-        # Calculate checksum
-        checksum = hashlib.sha256(content).hexdigest()
-        
-        # Enhanced WDO classification
-        wdo_classes = ["DigitalInformationCarrier"]
-        if asset_type == AssetType.SOURCE_CODE:
-            wdo_classes.append("SourceCodeFile")
-            if file_extension == '.py':
-                wdo_classes.append("PythonSourceCodeFile")
-            elif file_extension in ['.js', '.ts']:
-                wdo_classes.append("JavaScriptSourceCodeFile")
-            elif file_extension == '.java':
-                wdo_classes.append("JavaSourceCodeFile")
-        elif asset_type == AssetType.DOCUMENTATION:
-            wdo_classes.append("DocumentationFile")
-        elif asset_type == AssetType.CONFIGURATION:
-            wdo_classes.append("ConfigurationFile")
-        elif asset_type == AssetType.ASSET_FILE:
-            wdo_classes.append("AssetFile")
+        # Determine asset type and WDO classification
+        asset_type, extra_classes = _EXTENSION_CLASSIFICATION.get(
+            file_extension, (AssetType.UNKNOWN, ())
+        )
+        wdo_classes = ["DigitalInformationCarrier", *extra_classes]
         
         # Create metadata
         metadata = AssetMetadata(
             id=asset_id,
             file_name=file.filename,
-            file_size=len(content),
+            file_size=file_size,
             file_extension=file_extension,
             mime_type=file.content_type or "application/octet-stream",
             checksum=checksum,
             asset_type=asset_type,
-            line_count=len(content.decode('utf-8', errors='ignore').split('\n')),
-            character_count=len(content),
+            line_count=line_count,
+            character_count=file_size,
             created_at=datetime.now(),
             title=title,
             description=description,
@@ -112,26 +134,28 @@ async def upload_asset(
             wdo_classes=wdo_classes
         )
         
+        # Serialize once; the same dict feeds the annotator and the response
+        metadata_dict = metadata.model_dump()
+        
         # Generate and store RDF triples
-        semantic_annotator = SemanticAnnotator()
         rdf_triples_count = await semantic_annotator.annotate_asset(
-            metadata.dict(), triplestore
+            metadata_dict, triplestore, batch_size=500
         )
         
         # Update metadata with RDF count
-        metadata.rdf_triples_count = rdf_triples_count
+        metadata_dict["rdf_triples_count"] = rdf_triples_count
         
         return SuccessResponse(
             message=f"Asset '{file.filename}' uploaded and annotated successfully",
             data={
                 "asset_id": asset_id,
                 "file_name": file.filename,
-                "file_size": len(content),
+                "file_size": file_size,
                 "asset_type": asset_type,
                 "wdo_classes": wdo_classes,
                 "rdf_triples_count": rdf_triples_count,
                 "checksum": checksum,
-                "metadata": metadata.dict()
+                "metadata": metadata_dict
             }
         )
         
@@ -1,5 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from collections import Counter
+from dataclasses import dataclass
+import asyncio
 import logging
 import time
 import json
@@ -13,18 +18,173 @@ from app.models.common import (
 from app.core.triplestore_client import TriplestoreClient
 from app.core.ontology_manager import OntologyManager
 from app.dependencies import get_triplestore_client, get_ontology_manager
+from app.utils.cache import graph_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+WDO_NS = "http://purl.example.org/web_dev_km_bfo#"
+SBEKMS_NS = "http://sbekms.example.org/instances/"
+
+# SPARQL templates are built once at import; only the per-request fragments are formatted in
+GRAPH_QUERY_PREFIXES = f"""
+        PREFIX wdo: <{WDO_NS}>
+        PREFIX sbekms: <{SBEKMS_NS}>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        PREFIX dcterms: <http://purl.org/dc/terms/>
+"""
+
+# Predicates that clutter visualizations; types are already fetched via ?sType / ?oType
+TECHNICAL_PREDICATES = frozenset({
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#type",
+    "http://www.w3.org/2002/07/owl#sameAs",
+    "http://www.w3.org/2002/07/owl#differentFrom",
+})
+TECHNICAL_PREDICATE_FILTER = "FILTER(?p NOT IN ({}))".format(
+    ", ".join(f"<{predicate}>" for predicate in sorted(TECHNICAL_PREDICATES))
+)
+
+NEIGHBORHOOD_QUERY_TEMPLATE = GRAPH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
+        WHERE {{
+            ?s ?p ?o .
+            {center_filter}
+            
+            # Get labels
+            OPTIONAL {{ ?s rdfs:label ?sLabel }}
+            OPTIONAL {{ ?o rdfs:label ?oLabel }}
+            
+            # Get types
+            OPTIONAL {{ ?s rdf:type ?sType }}
+            OPTIONAL {{ ?o rdf:type ?oType }}
+            
+            # Filter out technical predicates
+            {technical_filter}
+            
+            # Literal-valued properties are fetched separately by NODE_LITERALS_QUERY_TEMPLATE
+            FILTER(isIRI(?o))
+        }}
+        LIMIT {limit}
+        """
+
+# One hop along any predicate in either direction (rdf:nil never appears as a predicate)
+ANY_DIRECTION_STEP = "(!rdf:nil|^!rdf:nil)"
+
+PATH_QUERY_TEMPLATE = GRAPH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
+        WHERE {{
+            # Edges lying on a path between source and target; traversal is done by the store
+            {path_pattern}
+            
+            OPTIONAL {{ ?s rdfs:label ?sLabel }}
+            OPTIONAL {{ ?o rdfs:label ?oLabel }}
+            OPTIONAL {{ ?s rdf:type ?sType }}
+            OPTIONAL {{ ?o rdf:type ?oType }}
+        }}
+        LIMIT {limit}
+        """
+
+CLUSTER_QUERY_TEMPLATE = GRAPH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
+        WHERE {{
+            ?s ?p ?o .
+            ?s rdf:type ?sType .
+            ?o rdf:type ?oType .
+            
+            # Focus on same-type clustering
+            FILTER(?sType = ?oType && isIRI(?o))
+            
+            OPTIONAL {{ ?s rdfs:label ?sLabel }}
+            OPTIONAL {{ ?o rdfs:label ?oLabel }}
+        }}
+        LIMIT {limit}
+        """
+
+FULL_GRAPH_QUERY_TEMPLATE = GRAPH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
+        WHERE {{
+            ?s ?p ?o .
+            
+            # Focus on core entities
+            ?s rdf:type wdo:DigitalInformationCarrier .
+            
+            OPTIONAL {{ ?s rdfs:label ?sLabel }}
+            OPTIONAL {{ ?o rdfs:label ?oLabel }}
+            OPTIONAL {{ ?s rdf:type ?sType }}
+            OPTIONAL {{ ?o rdf:type ?oType }}
+            
+            # Exclude some technical predicates for cleaner visualization
+            {technical_filter}
+            
+            # Literal-valued properties are fetched separately by NODE_LITERALS_QUERY_TEMPLATE
+            FILTER(isIRI(?o))
+        }}
+        LIMIT {limit}
+        """
+
+# Literal-valued properties of the subject nodes returned by a neighborhood or full-graph query;
+# label and type are projected too so subjects seen only here still get a proper node
+NODE_LITERALS_QUERY_TEMPLATE = GRAPH_QUERY_PREFIXES + """
+        SELECT ?s ?p ?o ?sLabel ?sType
+        WHERE {{
+            VALUES ?s {{ {subjects} }}
+            ?s ?p ?o .
+            FILTER(isLiteral(?o))
+            
+            OPTIONAL {{ ?s rdfs:label ?sLabel }}
+            OPTIONAL {{ ?s rdf:type ?sType }}
+        }}
+        """
+
+_EMPTY_BINDING: Dict[str, str] = {}
+
+@dataclass(slots=True)
+class _Node:
+    """Lightweight graph node used while folding SPARQL rows"""
+    id: str
+    label: str
+    type: str
+    properties: Dict[str, Any]
+
+@dataclass(slots=True)
+class _Edge:
+    """Lightweight graph edge used while folding SPARQL rows"""
+    source: str
+    target: str
+    relationship: str
+    properties: Dict[str, Any]
+
+# Namespaces that make up almost every graph URI; matched before any string search
+_KNOWN_NAMESPACES = tuple((namespace, len(namespace)) for namespace in (
+    WDO_NS,
+    SBEKMS_NS,
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "http://www.w3.org/2000/01/rdf-schema#",
+    "http://www.w3.org/2002/07/owl#",
+    "http://purl.org/dc/terms/",
+))
+
+@lru_cache(maxsize=4096)
+def _uri_local_name(uri: str) -> str:
+    """Return the part of a URI after its namespace, last '#', or else its last '/'"""
+    for namespace, length in _KNOWN_NAMESPACES:
+        if uri.startswith(namespace):
+            return uri[length:]
+    index = uri.rfind('#')
+    if index < 0:
+        index = uri.rfind('/')
+    return uri[index + 1:] if index >= 0 else uri
+
 class KnowledgeGraphService:
     """Service for knowledge graph operations and visualization"""
     
+    WDO_NS = WDO_NS
+    SBEKMS_NS = SBEKMS_NS
+    
     def __init__(self, triplestore: TriplestoreClient, ontology: OntologyManager):
         self.triplestore = triplestore
         self.ontology = ontology
-        self.WDO_NS = "http://purl.example.org/web_dev_km_bfo#"
-        self.SBEKMS_NS = "http://sbekms.example.org/instances/"
     
     async def get_knowledge_graph(self, query: GraphQuery) -> KnowledgeGraphResponse:
         """Get knowledge graph based on query parameters"""
@@ -45,6 +205,10 @@ class KnowledgeGraphService:
             query_results = await self.triplestore.query(sparql_query)
             results = query_results.get('results', {}).get('bindings', [])
             
+            # Edge queries only return IRI objects; attach the subjects' literal properties in one extra query
+            if query.query_type in ("neighborhood", "full"):
+                results = results + await self._fetch_literal_properties(results, query)
+            
             # Process results into graph structure
             nodes, edges = self._process_graph_results(results, query)
             
@@ -60,8 +224,8 @@ class KnowledgeGraphService:
             return KnowledgeGraphResponse(
                 status=ResponseStatus.SUCCESS,
                 graph={
-                    "nodes": [node.dict() for node in nodes],
-                    "edges": [edge.dict() for edge in edges]
+                    "nodes": [node.model_dump() for node in nodes],
+                    "edges": [edge.model_dump() for edge in edges]
                 },
                 analytics=analytics,
                 visualization_config=viz_config,
@@ -84,145 +248,78 @@ class KnowledgeGraphService:
         if query.center_entity:
             center_filter = f"FILTER(?s = <{query.center_entity}> || ?o = <{query.center_entity}>)"
         
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        
-        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
-        WHERE {{
-            ?s ?p ?o .
-            {center_filter}
-            
-            # Get labels
-            OPTIONAL {{ ?s rdfs:label ?sLabel }}
-            OPTIONAL {{ ?o rdfs:label ?oLabel }}
-            
-            # Get types
-            OPTIONAL {{ ?s rdf:type ?sType }}
-            OPTIONAL {{ ?o rdf:type ?oType }}
-            
-            # Filter out technical predicates if requested
-            FILTER(?p != rdf:type || ?p = rdf:type)
-        }}
-        LIMIT {query.max_nodes * 2}
-        """
+        return NEIGHBORHOOD_QUERY_TEMPLATE.format(
+            center_filter=center_filter,
+            technical_filter=TECHNICAL_PREDICATE_FILTER,
+            limit=query.max_nodes * 2
+        )
     
     def _build_path_query(self, query: GraphQuery) -> str:
         """Build SPARQL query for path finding between entities"""
         if not query.source_entity or not query.target_entity:
             raise ValueError("Path queries require both source_entity and target_entity")
         
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        source = f"<{query.source_entity}>"
+        target = f"<{query.target_entity}>"
         
-        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
-        WHERE {{
-            # Find all connections involving either source or target entity
-            {{
-                # Direct connection from source to target
-                <{query.source_entity}> ?p <{query.target_entity}> .
-                BIND(<{query.source_entity}> AS ?s)
-                BIND(<{query.target_entity}> AS ?o)
-            }}
-            UNION
-            {{
-                # Direct connection from target to source  
-                <{query.target_entity}> ?p <{query.source_entity}> .
-                BIND(<{query.target_entity}> AS ?s)
-                BIND(<{query.source_entity}> AS ?o)
-            }}
-            UNION
-            {{
-                # Connections through intermediate nodes
-                ?s ?p ?o .
-                {{
-                    <{query.source_entity}> ?p1 ?intermediate .
-                    ?intermediate ?p2 <{query.target_entity}> .
-                    FILTER(?s = <{query.source_entity}> || ?s = ?intermediate || ?s = <{query.target_entity}> ||
-                           ?o = <{query.source_entity}> || ?o = ?intermediate || ?o = <{query.target_entity}>)
-                }}
-            }}
-            
-            OPTIONAL {{ ?s rdfs:label ?sLabel }}
-            OPTIONAL {{ ?o rdfs:label ?oLabel }}
-            OPTIONAL {{ ?s rdf:type ?sType }}
-            OPTIONAL {{ ?o rdf:type ?oType }}
-        }}
-        LIMIT {query.max_nodes}
-        """
+        # Up to depth - 1 optional hops on each side of the matched edge, which may
+        # itself point either way along the path
+        hops = "/".join([f"{ANY_DIRECTION_STEP}?"] * (query.depth - 1))
+        if hops:
+            path_pattern = (
+                f"{{ {source} {hops} ?s . ?s ?p ?o . ?o {hops} {target} . }}\n"
+                f"            UNION\n"
+                f"            {{ {source} {hops} ?o . ?s ?p ?o . ?s {hops} {target} . }}"
+            )
+        else:
+            path_pattern = (
+                f"VALUES (?s ?o) {{ ({source} {target}) ({target} {source}) }}\n"
+                f"            ?s ?p ?o ."
+            )
+        
+        return PATH_QUERY_TEMPLATE.format(path_pattern=path_pattern, limit=query.max_nodes)
     
     def _build_cluster_query(self, query: GraphQuery) -> str:
         """Build SPARQL query for cluster analysis"""
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        
-        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
-        WHERE {{
-            ?s ?p ?o .
-            ?s rdf:type ?sType .
-            ?o rdf:type ?oType .
-            
-            # Focus on same-type clustering
-            FILTER(?sType = ?oType)
-            
-            OPTIONAL {{ ?s rdfs:label ?sLabel }}
-            OPTIONAL {{ ?o rdfs:label ?oLabel }}
-        }}
-        LIMIT {query.max_nodes}
-        """
+        return CLUSTER_QUERY_TEMPLATE.format(limit=query.max_nodes)
     
     def _build_full_graph_query(self, query: GraphQuery) -> str:
         """Build SPARQL query for full graph overview"""
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
+        return FULL_GRAPH_QUERY_TEMPLATE.format(
+            technical_filter=TECHNICAL_PREDICATE_FILTER,
+            limit=query.max_nodes
+        )
+    
+    def _build_node_literals_query(self, subjects: List[str]) -> str:
+        """Build SPARQL query for the literal-valued properties of the given subjects"""
+        return NODE_LITERALS_QUERY_TEMPLATE.format(subjects=" ".join(f"<{subject}>" for subject in subjects))
+    
+    async def _fetch_literal_properties(self, results: List[Dict], query: GraphQuery) -> List[Dict]:
+        """Fetch literal (subject, predicate, value) rows for the subjects of an edge query"""
+        subjects = dict.fromkeys(
+            row['s']['value'] for row in results if row.get('s')
+        )
+        if query.query_type == "neighborhood" and query.center_entity:
+            subjects[query.center_entity] = None
+        if not subjects:
+            return []
         
-        SELECT DISTINCT ?s ?p ?o ?sLabel ?oLabel ?sType ?oType
-        WHERE {{
-            ?s ?p ?o .
-            
-            # Focus on core entities
-            ?s rdf:type wdo:DigitalInformationCarrier .
-            
-            OPTIONAL {{ ?s rdfs:label ?sLabel }}
-            OPTIONAL {{ ?o rdfs:label ?oLabel }}
-            OPTIONAL {{ ?s rdf:type ?sType }}
-            OPTIONAL {{ ?o rdf:type ?oType }}
-            
-            # Exclude some technical predicates for cleaner visualization
-            FILTER(?p != <http://www.w3.org/1999/02/22-rdf-syntax-ns#type>)
-        }}
-        LIMIT {query.max_nodes}
-        """
+        literal_results = await self.triplestore.query(self._build_node_literals_query(list(subjects)))
+        return literal_results.get('results', {}).get('bindings', [])
     
     def _process_graph_results(self, results: List[Dict], query: GraphQuery) -> tuple[List[GraphNode], List[GraphEdge]]:
         """Process SPARQL results into graph nodes and edges"""
-        nodes_dict = {}
-        edges_list = []
+        nodes_dict: Dict[str, _Node] = {}
+        edges_list: List[_Edge] = []
         
         for result in results:
             # Extract subject node
-            subject_uri = result.get('s', {}).get('value', '')
-            subject_label = result.get('sLabel', {}).get('value', self._extract_label_from_uri(subject_uri))
-            subject_type = result.get('sType', {}).get('value', 'Unknown')
-            
+            subject_uri = (result.get('s') or _EMPTY_BINDING).get('value', '')
             if subject_uri and subject_uri not in nodes_dict:
-                nodes_dict[subject_uri] = GraphNode(
+                subject_type = (result.get('sType') or _EMPTY_BINDING).get('value', 'Unknown')
+                nodes_dict[subject_uri] = _Node(
                     id=subject_uri,
-                    label=subject_label,
+                    label=(result.get('sLabel') or _EMPTY_BINDING).get('value') or self._extract_label_from_uri(subject_uri),
                     type=self._extract_class_name(subject_type),
                     properties={
                         "uri": subject_uri,
@@ -231,15 +328,16 @@ class KnowledgeGraphService:
                 )
             
             # Extract object node
-            object_uri = result.get('o', {}).get('value', '')
-            object_label = result.get('oLabel', {}).get('value', self._extract_label_from_uri(object_uri))
-            object_type = result.get('oType', {}).get('value', 'Unknown')
+            object_binding = result.get('o') or _EMPTY_BINDING
+            object_uri = object_binding.get('value', '')
+            object_is_uri = object_binding.get('type') == 'uri'
             
             # Only create object node if it's a URI (not literal)
-            if object_uri.startswith('http') and object_uri not in nodes_dict:
-                nodes_dict[object_uri] = GraphNode(
+            if object_is_uri and object_uri not in nodes_dict:
+                object_type = (result.get('oType') or _EMPTY_BINDING).get('value', 'Unknown')
+                nodes_dict[object_uri] = _Node(
                     id=object_uri,
-                    label=object_label,
+                    label=(result.get('oLabel') or _EMPTY_BINDING).get('value') or self._extract_label_from_uri(object_uri),
                     type=self._extract_class_name(object_type),
                     properties={
                         "uri": object_uri,
@@ -247,29 +345,41 @@ class KnowledgeGraphService:
                     }
                 )
             
+            if not subject_uri:
+                continue
+            
             # Extract relationship
-            predicate_uri = result.get('p', {}).get('value', '')
+            predicate_uri = (result.get('p') or _EMPTY_BINDING).get('value', '')
             relationship_name = self._extract_relationship_name(predicate_uri)
             
             # Create edge if both nodes are URIs
-            if subject_uri and object_uri.startswith('http'):
-                edge = GraphEdge(
+            if object_is_uri:
+                edges_list.append(_Edge(
                     source=subject_uri,
                     target=object_uri,
                     relationship=relationship_name,
                     properties={
                         "predicate_uri": predicate_uri
                     }
-                )
-                edges_list.append(edge)
+                ))
             
             # For literals, add as node property instead
-            elif subject_uri and not object_uri.startswith('http'):
-                if subject_uri in nodes_dict:
-                    prop_name = self._extract_relationship_name(predicate_uri)
-                    nodes_dict[subject_uri].properties[prop_name] = object_uri
+            elif subject_uri in nodes_dict:
+                nodes_dict[subject_uri].properties[relationship_name] = object_uri
         
-        return list(nodes_dict.values()), edges_list
+        # Rows are already well-formed, so skip per-field validation when building the models
+        nodes = [
+            GraphNode.model_construct(id=node.id, label=node.label, type=node.type, properties=node.properties)
+            for node in nodes_dict.values()
+        ]
+        edges = [
+            GraphEdge.model_construct(
+                source=edge.source, target=edge.target,
+                relationship=edge.relationship, properties=edge.properties
+            )
+            for edge in edges_list
+        ]
+        return nodes, edges
     
     def _calculate_graph_analytics(self, nodes: List[GraphNode], edges: List[GraphEdge]) -> GraphAnalytics:
         """Calculate graph analytics and statistics"""
@@ -277,66 +387,54 @@ class KnowledgeGraphService:
         total_edges = len(edges)
         
         # Count node types
-        node_types = {}
-        for node in nodes:
-            node_type = node.type
-            node_types[node_type] = node_types.get(node_type, 0) + 1
-        
-        # Count relationship types
-        relationship_types = {}
-        for edge in edges:
-            rel_type = edge.relationship
-            relationship_types[rel_type] = relationship_types.get(rel_type, 0) + 1
+        node_types = Counter(node.type for node in nodes)
         
-        # Calculate degree statistics
-        degree_count = {}
+        # Count relationship types and node degrees in a single pass over edges
+        relationship_types = Counter()
+        degree_count = Counter()
         for edge in edges:
-            degree_count[edge.source] = degree_count.get(edge.source, 0) + 1
-            degree_count[edge.target] = degree_count.get(edge.target, 0) + 1
+            relationship_types[edge.relationship] += 1
+            degree_count[edge.source] += 1
+            degree_count[edge.target] += 1
         
-        avg_degree = sum(degree_count.values()) / len(degree_count) if degree_count else 0
+        # Every edge contributes exactly two endpoint degrees
+        avg_degree = 2 * total_edges / len(degree_count) if degree_count else 0
         max_degree = max(degree_count.values()) if degree_count else 0
         
         # Calculate density
         max_possible_edges = total_nodes * (total_nodes - 1) / 2 if total_nodes > 1 else 1
         density = total_edges / max_possible_edges if max_possible_edges > 0 else 0
         
+        # Both ratios are non-negative, so half-up integer rounding is exact enough for display
         return GraphAnalytics(
             total_nodes=total_nodes,
             total_edges=total_edges,
-            node_types=node_types,
-            relationship_types=relationship_types,
-            avg_degree=round(avg_degree, 2),
+            node_types=dict(node_types),
+            relationship_types=dict(relationship_types),
+            avg_degree=int(avg_degree * 100 + 0.5) / 100,
             max_degree=max_degree,
             connected_components=1,  # Simplified - would need more complex analysis
-            density=round(density, 4)
+            density=int(density * 10000 + 0.5) / 10000
         )
     
     def _extract_label_from_uri(self, uri: str) -> str:
         """Extract a readable label from URI"""
-        if '#' in uri:
-            return uri.split('#')[-1]
-        elif '/' in uri:
-            return uri.split('/')[-1]
-        return uri
+        return _uri_local_name(uri)
     
     def _extract_class_name(self, class_uri: str) -> str:
         """Extract class name from URI"""
         if not class_uri or class_uri == 'Unknown':
             return 'Resource'
-        if '#' in class_uri:
-            return class_uri.split('#')[-1]
-        elif '/' in class_uri:
-            return class_uri.split('/')[-1]
-        return class_uri
+        return _uri_local_name(class_uri)
     
     def _extract_relationship_name(self, predicate_uri: str) -> str:
         """Extract relationship name from predicate URI"""
-        if '#' in predicate_uri:
-            return predicate_uri.split('#')[-1]
-        elif '/' in predicate_uri:
-            return predicate_uri.split('/')[-1]
-        return predicate_uri
+        return _uri_local_name(predicate_uri)
+
+@lru_cache()
+def get_knowledge_graph_service() -> KnowledgeGraphService:
+    """Get knowledge graph service singleton"""
+    return KnowledgeGraphService(get_triplestore_client(), get_ontology_manager())
 
 # API Endpoints
 @router.get("/health")
@@ -349,11 +447,10 @@ async def graph_health():
         "features": ["visualization", "analytics", "exploration", "querying"]
     }
 
-@router.post("/explore", response_model=KnowledgeGraphResponse)
+@router.post("/explore", response_model=KnowledgeGraphResponse, response_class=ORJSONResponse)
 async def explore_knowledge_graph(
     query: GraphQuery,
-    triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology: OntologyManager = Depends(get_ontology_manager)
+    service: KnowledgeGraphService = Depends(get_knowledge_graph_service)
 ):
     """
     Explore the knowledge graph with different query types:
@@ -363,7 +460,6 @@ async def explore_knowledge_graph(
     - **cluster**: Find clusters of related entities
     - **full**: Get overview of the entire knowledge graph
     """
-    service = KnowledgeGraphService(triplestore, ontology)
     return await service.get_knowledge_graph(query)
 
 @router.get("/neighborhood/{entity_id}")
@@ -371,8 +467,7 @@ async def get_entity_neighborhood(
     entity_id: str,
     depth: int = Query(2, ge=1, le=5, description="Exploration depth"),
     max_nodes: int = Query(50, ge=10, le=200, description="Maximum nodes"),
-    triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology: OntologyManager = Depends(get_ontology_manager)
+    service: KnowledgeGraphService = Depends(get_knowledge_graph_service)
 ):
     """Get the neighborhood graph around a specific entity"""
     query = GraphQuery(
@@ -382,7 +477,6 @@ async def get_entity_neighborhood(
         max_nodes=max_nodes
     )
     
-    service = KnowledgeGraphService(triplestore, ontology)
     return await service.get_knowledge_graph(query)
 
 @router.get("/analytics")
@@ -392,6 +486,10 @@ async def get_graph_analytics(
 ):
     """Get comprehensive graph analytics and statistics"""
     try:
+        cached_data = graph_cache.get("analytics")
+        if cached_data is not None:
+            return SuccessResponse(message="Retrieved graph analytics", data=cached_data)
+        
         # Get basic statistics
         stats_query = """
         SELECT 
@@ -404,7 +502,22 @@ async def get_graph_analytics(
         }
         """
         
-        query_results = await triplestore.query(stats_query)
+        # Get type distribution
+        type_query = """
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        SELECT ?type (COUNT(?s) AS ?count)
+        WHERE {
+            ?s rdf:type ?type .
+        }
+        GROUP BY ?type
+        ORDER BY DESC(?count)
+        """
+        
+        # Both aggregations are independent, so run them concurrently
+        query_results, type_results = await asyncio.gather(
+            triplestore.query(stats_query),
+            triplestore.query(type_query)
+        )
         results = query_results.get('results', {}).get('bindings', [])
         
         basic_stats = {}
@@ -417,18 +530,6 @@ async def get_graph_analytics(
                 "total_triples": int(result.get('triples', {}).get('value', 0))
             }
         
-        # Get type distribution
-        type_query = """
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        SELECT ?type (COUNT(?s) AS ?count)
-        WHERE {
-            ?s rdf:type ?type .
-        }
-        GROUP BY ?type
-        ORDER BY DESC(?count)
-        """
-        
-        type_results = await triplestore.query(type_query)
         type_bindings = type_results.get('results', {}).get('bindings', [])
         
         type_distribution = {}
@@ -438,13 +539,16 @@ async def get_graph_analytics(
             type_name = type_uri.split('#')[-1] if '#' in type_uri else type_uri.split('/')[-1]
             type_distribution[type_name] = count
         
+        analytics_data = {
+            "basic_statistics": basic_stats,
+            "type_distribution": type_distribution,
+            "generated_at": datetime.now().isoformat()
+        }
+        graph_cache.set("analytics", analytics_data)
+        
         return SuccessResponse(
             message="Retrieved graph analytics",
-            data={
-                "basic_statistics": basic_stats,
-                "type_distribution": type_distribution,
-                "generated_at": datetime.now().isoformat()
-            }
+            data=analytics_data
         )
         
     except Exception as e:
@@ -1,21 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import time
+import orjson
+import hashlib
+import re
+import secrets
 from datetime import datetime, date
 
 from app.models.common import (
     SearchResponse, SearchResult, SuccessResponse, ResponseStatus
 )
 from app.core.triplestore_client import TriplestoreClient
-from app.core.ontology_manager import OntologyManager
-from app.dependencies import get_triplestore_client, get_ontology_manager
+from app.dependencies import get_triplestore_client
+from app.utils.cache import not_modified, search_cache, query_cache_generation
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Class names and file extensions are spliced into queries unquoted, so they must be plain names
+_CLASS_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_FILE_TYPE_RE = re.compile(r"^[A-Za-z0-9_]+$")
+
+# Needles shorter than this use a plain lowercase CONTAINS; longer ones a case-insensitive REGEX
+REGEX_MATCH_MIN_LENGTH = 3
+
+# Characters with a meaning in XPath regular expressions, as used by SPARQL REGEX
+_XPATH_REGEX_SPECIAL_RE = re.compile(r"([\\.?*+(){}\[\]^$|-])")
+
+# Streamed rows are mapped to SearchResults off the event loop in slices of this many rows
+THREADED_ROW_THRESHOLD = 64
+ROW_WORKERS = 4
+_ROW_POOL = ThreadPoolExecutor(max_workers=ROW_WORKERS, thread_name_prefix="search-rows")
+
+_SPARQL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
+def _sparql_literal(value: str) -> str:
+    """Quote a string as a SPARQL literal, escaping characters that would end or break it"""
+    return '"' + value.translate(_SPARQL_ESCAPES) + '"'
+
+
+@lru_cache(maxsize=4096)
+def _extract_file_type(file_name: str) -> str:
+    """Extract file type from file name"""
+    _, dot, extension = file_name.rpartition('.')
+    return extension.lower() if dot else 'unknown'
+
+
+@lru_cache(maxsize=4096)
+def _extract_class_name(class_uri: str) -> str:
+    """Extract class name from URI"""
+    index = class_uri.rfind('#')
+    if index < 0:
+        index = class_uri.rfind('/')
+    return class_uri[index + 1:]
+
+
+def _split_tags(result: dict) -> List[str]:
+    """Split the grouped ?tags column of a result row into individual tags"""
+    tags_value = result.get('tags', {}).get('value', '')
+    return [tag for tag in tags_value.split(TAG_SEPARATOR) if tag] if tags_value else []
+
+
+def _match_binds(query_text: str, fields) -> str:
+    """BIND a boolean ?<field>Match per searched field for a case-insensitive substring match"""
+    if len(query_text) < REGEX_MATCH_MIN_LENGTH:
+        binds = [f"BIND(LCASE({_sparql_literal(query_text)}) AS ?qL)"]
+        binds.extend(f"BIND(CONTAINS(LCASE({expr}), ?qL) AS ?{name}Match)" for name, expr in fields)
+    else:
+        pattern = _sparql_literal(_XPATH_REGEX_SPECIAL_RE.sub(r"\\\1", query_text))
+        binds = [f'BIND(REGEX({expr}, {pattern}, "i") AS ?{name}Match)' for name, expr in fields]
+    return "\n            ".join(binds)
+
+
 # Unified Search Request Model
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import Literal
 
 class UnifiedSearchQuery(BaseModel):
@@ -39,6 +104,24 @@ class UnifiedSearchQuery(BaseModel):
     max_file_size: Optional[int] = Field(None, ge=0, description="Maximum file size in bytes")
     has_content: Optional[bool] = Field(None, description="Filter files with/without content analysis")
     
+    @field_validator("wdo_classes")
+    @classmethod
+    def validate_wdo_classes(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """Only accept plain ontology class names"""
+        for class_name in value or ():
+            if not _CLASS_NAME_RE.match(class_name):
+                raise ValueError(f"Invalid WDO class name: {class_name!r}")
+        return value
+    
+    @field_validator("file_types")
+    @classmethod
+    def validate_file_types(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """Only accept plain file extensions"""
+        for file_type in value or ():
+            if not _FILE_TYPE_RE.match(file_type):
+                raise ValueError(f"Invalid file type: {file_type!r}")
+        return value
+    
     def has_advanced_filters(self) -> bool:
         """Check if any advanced filters are provided"""
         return any([
@@ -46,16 +129,361 @@ class UnifiedSearchQuery(BaseModel):
             self.date_from, self.date_to, self.min_file_size, 
             self.max_file_size, self.has_content is not None
         ])
+    
+    def cache_key(self) -> str:
+        """Canonical key for this query, independent of field and list ordering"""
+        canonical = self.model_dump(mode="json", exclude_none=True)
+        for field in ("file_types", "wdo_classes", "tags"):
+            if field in canonical:
+                canonical[field] = sorted(canonical[field])
+        encoded = orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+WDO_NS = "http://purl.example.org/web_dev_km_bfo#"
+SBEKMS_NS = "http://sbekms.example.org/instances/"
+
+# SPARQL skeletons are built once at import; each searched field is matched once per row via BIND
+SEARCH_QUERY_PREFIXES = f"""
+        PREFIX wdo: <{WDO_NS}>
+        PREFIX sbekms: <{SBEKMS_NS}>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        PREFIX dcterms: <http://purl.org/dc/terms/>
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+"""
+
+# One row per asset and type: tags are folded into a single "|"-separated ?tags column
+SEARCH_GROUP_VARIABLES = "?asset ?fileName ?title ?description ?fileSize ?mimeType ?author ?created ?type"
+TAG_SEPARATOR = "|"
+
+SEARCH_SELECT_CLAUSE = f"""
+        SELECT {SEARCH_GROUP_VARIABLES} (GROUP_CONCAT(DISTINCT STR(?tag); SEPARATOR="{TAG_SEPARATOR}") AS ?tags)"""
+RANKED_SEARCH_SELECT_CLAUSE = SEARCH_SELECT_CLAUSE + " (MAX(?score) AS ?rank)"
+SEARCH_GROUP_BY = f"""
+        GROUP BY {SEARCH_GROUP_VARIABLES}"""
+
+# Searched fields per query shape: match variable prefix -> text expression
+SEMANTIC_MATCH_FIELDS = (
+    ("fileName", "?fileName"),
+    ("title", "STR(?title)"),
+    ("description", "STR(?description)"),
+    ("tag", "STR(?tag)"),
+    ("type", "STR(?type)"),
+    ("mimeType", "STR(?mimeType)"),
+)
+TEXTUAL_MATCH_FIELDS = SEMANTIC_MATCH_FIELDS[:3]
+ADVANCED_SEMANTIC_MATCH_FIELDS = SEMANTIC_MATCH_FIELDS[:4]
+
+SEMANTIC_SEARCH_QUERY_TEMPLATE = SEARCH_QUERY_PREFIXES + RANKED_SEARCH_SELECT_CLAUSE + """
+        WHERE {{
+            ?asset a wdo:DigitalInformationCarrier .
+            ?asset rdfs:label ?fileName .
+            
+            OPTIONAL {{ ?asset rdf:type ?type }}
+            OPTIONAL {{ ?asset dcterms:title ?title }}
+            OPTIONAL {{ ?asset dcterms:description ?description }}
+            OPTIONAL {{ ?asset wdo:hasFileSize ?fileSize }}
+            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
+            OPTIONAL {{ ?asset dcterms:creator ?author }}
+            OPTIONAL {{ ?asset dcterms:created ?created }}
+            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
+            
+            # Match each field once; FILTER and ORDER BY reuse the results (unbound for missing fields)
+            {match_binds}
+            
+            # More flexible text matching across multiple fields
+            FILTER (
+                ?fileNameMatch ||
+                COALESCE(?titleMatch, false) ||
+                COALESCE(?descriptionMatch, false) ||
+                COALESCE(?tagMatch, false) ||
+                COALESCE(?typeMatch, false) ||
+                COALESCE(?mimeTypeMatch, false)
+            )
+            
+            # Rank on a precomputed score column instead of an expression in ORDER BY
+            BIND(
+                (IF(?fileNameMatch, 4, 0)) +
+                (IF(COALESCE(?titleMatch, false), 3, 0)) +
+                (IF(COALESCE(?descriptionMatch, false), 2, 0)) +
+                (IF(COALESCE(?tagMatch, false), 1, 0))
+                AS ?score
+            )
+        }}""" + SEARCH_GROUP_BY + """
+        ORDER BY DESC(?rank) ?fileName
+        LIMIT {limit} OFFSET {offset}
+        """
+
+TEXTUAL_SEARCH_QUERY_TEMPLATE = SEARCH_QUERY_PREFIXES + SEARCH_SELECT_CLAUSE + """
+        WHERE {{
+            ?asset a wdo:DigitalInformationCarrier .
+            ?asset rdfs:label ?fileName .
+            
+            OPTIONAL {{ ?asset rdf:type ?type }}
+            OPTIONAL {{ ?asset dcterms:title ?title }}
+            OPTIONAL {{ ?asset dcterms:description ?description }}
+            OPTIONAL {{ ?asset wdo:hasFileSize ?fileSize }}
+            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
+            OPTIONAL {{ ?asset dcterms:creator ?author }}
+            OPTIONAL {{ ?asset dcterms:created ?created }}
+            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
+            
+            {match_binds}
+            
+            # Simple text matching with proper bounds checking
+            FILTER (
+                ?fileNameMatch ||
+                COALESCE(?titleMatch, false) ||
+                COALESCE(?descriptionMatch, false)
+            )
+        }}""" + SEARCH_GROUP_BY + """
+        ORDER BY ?fileName
+        LIMIT {limit} OFFSET {offset}
+        """
+
+# Advanced queries select and paginate candidate (asset, type) pairs in a sub-SELECT that joins only
+# the OPTIONALs its filters read; the outer query then fetches the remaining metadata for that page
+ADVANCED_OPTIONAL_PATTERNS = (
+    ("title", "OPTIONAL { ?asset dcterms:title ?title }"),
+    ("description", "OPTIONAL { ?asset dcterms:description ?description }"),
+    ("fileSize", "OPTIONAL { ?asset wdo:hasFileSize ?fileSize }"),
+    ("mimeType", "OPTIONAL { ?asset wdo:hasMimeType ?mimeType }"),
+    ("author", "OPTIONAL { ?asset dcterms:creator ?author }"),
+    ("created", "OPTIONAL { ?asset dcterms:created ?created }"),
+    ("tag", "OPTIONAL { ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }"),
+)
+
+ADVANCED_CANDIDATES_HEAD = """
+        WHERE {{
+            {{
+                SELECT DISTINCT ?asset ?fileName ?type{rank_projection}
+                WHERE {{
+                    ?asset a wdo:DigitalInformationCarrier .
+                    ?asset rdfs:label ?fileName .
+                    ?asset rdf:type ?type .
+                    """
+
+ADVANCED_SEMANTIC_TEXT_FILTER = """
+                    (?fileNameMatch ||
+                     COALESCE(?titleMatch, false) ||
+                     COALESCE(?descriptionMatch, false) ||
+                     COALESCE(?tagMatch, false))
+                """
+
+ADVANCED_TEXTUAL_TEXT_FILTER = """
+                    (?fileNameMatch ||
+                     COALESCE(?titleMatch, false) ||
+                     COALESCE(?descriptionMatch, false))
+                """
+
+ADVANCED_RANKED_CANDIDATES_TAIL = """
+                    BIND(
+                        (IF(?fileNameMatch, 4, 0)) +
+                        (IF(COALESCE(?titleMatch, false), 3, 0)) +
+                        (IF(COALESCE(?descriptionMatch, false), 2, 0))
+                        AS ?rank
+                    )
+                }}
+                ORDER BY DESC(?rank) ?fileName
+                LIMIT {limit} OFFSET {offset}
+            }}
+            """
+
+ADVANCED_ORDERED_CANDIDATES_TAIL = """
+                }}
+                ORDER BY ?fileName
+                LIMIT {limit} OFFSET {offset}
+            }}
+            """
+
+ADVANCED_RANKED_ENRICHMENT_TAIL = """
+        }}""" + SEARCH_GROUP_BY + """ ?rank
+        ORDER BY DESC(?rank) ?fileName
+        """
+
+ADVANCED_ORDERED_ENRICHMENT_TAIL = """
+        }}""" + SEARCH_GROUP_BY + """
+        ORDER BY ?fileName
+        """
+
+# Structured filters in the order they are ANDed; list-valued ones are expanded per call
+ADVANCED_FILTER_FRAGMENTS = (
+    ("wdo_classes", "{wdo_filter}"),
+    ("file_types", "{file_type_filter}"),
+    ("author", "CONTAINS(LCASE(STR(?author)), LCASE({author}))"),
+    ("min_file_size", "?fileSize >= {min_file_size}"),
+    ("max_file_size", "?fileSize <= {max_file_size}"),
+    ("date_from", '?created >= "{date_from}T00:00:00"^^xsd:dateTime'),
+    ("date_to", '?created <= "{date_to}T23:59:59"^^xsd:dateTime'),
+    ("tags", "{tag_filter}"),
+)
+
+# Optional metadata each structured filter reads inside the candidate sub-SELECT
+ADVANCED_FILTER_VARIABLES = {
+    "author": "author",
+    "min_file_size": "fileSize",
+    "max_file_size": "fileSize",
+    "date_from": "created",
+    "date_to": "created",
+    "tags": "tag",
+}
+
+
+@lru_cache(maxsize=128)
+def _advanced_query_template(search_type: Optional[str], filter_fields: Tuple[str, ...]) -> str:
+    """Assemble the advanced query skeleton once per filter shape (search_type is None without text)"""
+    ranked = search_type == "semantic"
+    filters = []
+    candidate_variables = set()
+    
+    if search_type is not None:
+        match_fields = ADVANCED_SEMANTIC_MATCH_FIELDS if ranked else TEXTUAL_MATCH_FIELDS
+        candidate_variables.update(name for name, _ in match_fields)
+        filters.append(ADVANCED_SEMANTIC_TEXT_FILTER if ranked else ADVANCED_TEXTUAL_TEXT_FILTER)
+    
+    fragments = dict(ADVANCED_FILTER_FRAGMENTS)
+    for field in filter_fields:
+        filters.append(fragments[field])
+        candidate_variables.add(ADVANCED_FILTER_VARIABLES.get(field))
+    
+    template = SEARCH_QUERY_PREFIXES + SEARCH_SELECT_CLAUSE + (" ?rank" if ranked else "")
+    template += ADVANCED_CANDIDATES_HEAD.replace(
+        "{rank_projection}", " ?rank" if ranked else ""
+    )
+    template += "\n                    ".join(
+        pattern.replace("{", "{{").replace("}", "}}")
+        for name, pattern in ADVANCED_OPTIONAL_PATTERNS if name in candidate_variables
+    )
+    
+    if search_type is not None:
+        template += "\n                    {match_binds}"
+    if filters:
+        template += "\n                    FILTER (" + " && ".join(filters) + ")"
+    
+    template += ADVANCED_RANKED_CANDIDATES_TAIL if ranked else ADVANCED_ORDERED_CANDIDATES_TAIL
+    template += "\n            ".join(
+        pattern.replace("{", "{{").replace("}", "}}") for _, pattern in ADVANCED_OPTIONAL_PATTERNS
+    )
+    template += ADVANCED_RANKED_ENRICHMENT_TAIL if ranked else ADVANCED_ORDERED_ENRICHMENT_TAIL
+    return template
+
+
+SUGGESTION_LABELS_QUERY = SEARCH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?label
+        WHERE {
+            { ?asset rdfs:label ?label }
+            UNION { ?asset dcterms:title ?label }
+            UNION { ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?label }
+        }
+        """
+
+FACETS_QUERY = SEARCH_QUERY_PREFIXES + """
+        SELECT DISTINCT ?type ?author ?mimeType ?tag
+        WHERE {
+            ?asset a wdo:DigitalInformationCarrier .
+            OPTIONAL { ?asset rdf:type ?type }
+            OPTIONAL { ?asset dcterms:creator ?author }
+            OPTIONAL { ?asset wdo:hasMimeType ?mimeType }
+            OPTIONAL { ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }
+        }
+        """
+
+
+class SearchWarmCache:
+    """Autocomplete labels and facet values pinned in memory until the store is modified"""
+    
+    def __init__(self):
+        self.generation: Optional[int] = None
+        self.labels: Tuple[str, ...] = ()
+        self.trigrams: Dict[str, Tuple[str, ...]] = {}
+        self.facets: Dict[str, Tuple[str, ...]] = {}
+        self._lock = asyncio.Lock()
+    
+    async def ensure_loaded(self, triplestore: TriplestoreClient):
+        """Load labels and facets if missing or built before the last store modification"""
+        if self.generation == query_cache_generation():
+            return
+        
+        async with self._lock:
+            generation = query_cache_generation()
+            if self.generation == generation:
+                return
+            
+            label_results, facet_results = await asyncio.gather(
+                triplestore.query(SUGGESTION_LABELS_QUERY),
+                triplestore.query(FACETS_QUERY)
+            )
+            self._build_labels(label_results.get('results', {}).get('bindings', []))
+            self._build_facets(facet_results.get('results', {}).get('bindings', []))
+            self.generation = generation
+            logger.info(f"Search warm cache loaded: {len(self.labels)} labels, {len(self.trigrams)} trigrams")
+    
+    def _build_labels(self, bindings: List[dict]):
+        """Index every label under each lowercase 3-character substring it contains"""
+        labels = sorted({b['label']['value'] for b in bindings if b.get('label', {}).get('value')})
+        trigrams: Dict[str, List[str]] = {}
+        for label in labels:
+            label_lower = label.lower()
+            for trigram in {label_lower[i:i + 3] for i in range(len(label_lower) - 2)}:
+                trigrams.setdefault(trigram, []).append(label)
+        
+        self.labels = tuple(labels)
+        self.trigrams = {trigram: tuple(matches) for trigram, matches in trigrams.items()}
+    
+    def _build_facets(self, bindings: List[dict]):
+        """Collect distinct facet values as pre-sorted tuples"""
+        wdo_classes = set()
+        authors = set()
+        mime_types = set()
+        tags = set()
+        
+        for result in bindings:
+            if result.get('type'):
+                type_uri = result['type']['value']
+                class_name = _extract_class_name(type_uri)
+                if class_name != "DigitalInformationCarrier":  # Exclude base class
+                    wdo_classes.add(class_name)
+            
+            if result.get('author'):
+                authors.add(result['author']['value'])
+            
+            if result.get('mimeType'):
+                mime_types.add(result['mimeType']['value'])
+            
+            if result.get('tag'):
+                tags.add(result['tag']['value'])
+        
+        self.facets = {
+            "wdo_classes": tuple(sorted(wdo_classes)),
+            "authors": tuple(sorted(authors)),
+            "mime_types": tuple(sorted(mime_types)),
+            "tags": tuple(sorted(tags))
+        }
+    
+    def suggest(self, query_text: str, limit: int = 5) -> List[str]:
+        """Return labels containing the first three characters of the query"""
+        needle = query_text[:3].lower()
+        if len(needle) == 3:
+            candidates = self.trigrams.get(needle, ())
+        else:
+            candidates = [label for label in self.labels if needle in label.lower()]
+        
+        query_lower = query_text.lower()
+        return [label for label in candidates if label.lower() != query_lower][:limit]
+
+
+search_warm_cache = SearchWarmCache()
 
 
 class UnifiedSearchService:
     """Unified search service that automatically handles basic and advanced search"""
     
-    def __init__(self, triplestore: TriplestoreClient, ontology: OntologyManager):
+    WDO_NS = WDO_NS
+    SBEKMS_NS = SBEKMS_NS
+    
+    def __init__(self, triplestore: TriplestoreClient):
         self.triplestore = triplestore
-        self.ontology = ontology
-        self.WDO_NS = "http://purl.example.org/web_dev_km_bfo#"
-        self.SBEKMS_NS = "http://sbekms.example.org/instances/"
     
     async def search(self, query: UnifiedSearchQuery) -> SearchResponse:
         """Unified search that automatically detects and applies appropriate search strategy"""
@@ -64,33 +492,33 @@ class UnifiedSearchService:
         try:
             # Determine search strategy
             search_mode = "advanced" if query.has_advanced_filters() else "basic"
+            message_suffix = "with filters" if search_mode == "advanced" else ""
             
-            # Build appropriate SPARQL query
-            if search_mode == "advanced":
-                sparql_query = self._build_advanced_search_query(query)
-                message_suffix = "with filters"
+            # Read the generation before querying, so results of a search overlapping a write
+            # are filed under the pre-write generation and never served after it
+            cache_key = ("search", query_cache_generation(), query.cache_key())
+            cached = search_cache.get(cache_key)
+            if cached is not None:
+                search_results, suggestions = cached
             else:
-                sparql_query = self._build_basic_search_query(query)
-                message_suffix = ""
-            
-            # Execute query
-            query_results = await self.triplestore.query(sparql_query)
-            results = query_results.get('results', {}).get('bindings', [])
-            
-            # Process results
-            search_results = []
-            for result in results:
-                search_result = self._process_search_result(result, query.query)
-                search_results.append(search_result)
+                # Build appropriate SPARQL query and execute it; basic searches also need
+                # suggestions, whose (possibly cold) label index loads alongside the main query
+                if search_mode == "advanced":
+                    sparql_query = self._build_advanced_search_query(query)
+                    search_results = await self._run_search_query(sparql_query, query.query)
+                    suggestions = []
+                else:
+                    sparql_query = self._build_basic_search_query(query)
+                    search_results, suggestions = await asyncio.gather(
+                        self._run_search_query(sparql_query, query.query),
+                        self._generate_suggestions(query.query)
+                    )
+                
+                search_cache.set(cache_key, (search_results, suggestions))
             
             # Calculate search time
             search_time = (time.time() - start_time) * 1000
             
-            # Generate suggestions for basic searches
-            suggestions = []
-            if search_mode == "basic":
-                suggestions = await self._generate_suggestions(query.query)
-            
             return SearchResponse(
                 status=ResponseStatus.SUCCESS,
                 message=f"Found {len(search_results)} results {message_suffix}".strip(),
@@ -109,6 +537,34 @@ class UnifiedSearchService:
             logger.error(f"Unified search failed: {e}")
             raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
     
+    async def _run_search_query(self, sparql_query: str, query_text: str) -> List[SearchResult]:
+        """Execute a search query, converting its rows while they stream in"""
+        # One case-insensitive pattern serves every field of every row
+        query_pattern = re.compile(re.escape(query_text), re.IGNORECASE)
+        loop = asyncio.get_running_loop()
+        search_results: List[SearchResult] = []
+        in_flight: deque = deque()
+        batch: List[dict] = []
+        
+        async for row in self.triplestore.query_stream(sparql_query):
+            batch.append(row)
+            if len(batch) < THREADED_ROW_THRESHOLD:
+                continue
+            # Full slices are mapped on the worker pool; cap the backlog so raw rows never pile up
+            in_flight.append(loop.run_in_executor(_ROW_POOL, self._process_search_rows, batch, query_pattern))
+            batch = []
+            if len(in_flight) > ROW_WORKERS:
+                search_results.extend(await in_flight.popleft())
+        
+        while in_flight:
+            search_results.extend(await in_flight.popleft())
+        search_results.extend(self._process_search_rows(batch, query_pattern))
+        return search_results
+    
+    def _process_search_rows(self, rows: List[dict], query_pattern: re.Pattern) -> List[SearchResult]:
+        """Convert a slice of result rows to search results"""
+        return [self._process_search_result(row, query_pattern) for row in rows]
+    
     def _build_basic_search_query(self, query: UnifiedSearchQuery) -> str:
         """Build SPARQL query for basic search"""
         if query.search_type == "semantic":
@@ -120,279 +576,134 @@ class UnifiedSearchService:
     
     def _build_semantic_search_query(self, query_text: str, limit: int, offset: int) -> str:
         """Build SPARQL query for semantic search"""
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-        
-        SELECT DISTINCT ?asset ?fileName ?title ?description ?fileSize ?mimeType ?author ?created ?type ?tag
-        WHERE {{
-            ?asset a wdo:DigitalInformationCarrier .
-            ?asset rdfs:label ?fileName .
-            
-            OPTIONAL {{ ?asset rdf:type ?type }}
-            OPTIONAL {{ ?asset dcterms:title ?title }}
-            OPTIONAL {{ ?asset dcterms:description ?description }}
-            OPTIONAL {{ ?asset wdo:hasFileSize ?fileSize }}
-            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
-            OPTIONAL {{ ?asset dcterms:creator ?author }}
-            OPTIONAL {{ ?asset dcterms:created ?created }}
-            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
-            
-            # More flexible text matching across multiple fields
-            FILTER (
-                CONTAINS(LCASE(?fileName), LCASE("{query_text}")) ||
-                (BOUND(?title) && CONTAINS(LCASE(STR(?title)), LCASE("{query_text}"))) ||
-                (BOUND(?description) && CONTAINS(LCASE(STR(?description)), LCASE("{query_text}"))) ||
-                (BOUND(?tag) && CONTAINS(LCASE(STR(?tag)), LCASE("{query_text}"))) ||
-                (BOUND(?type) && CONTAINS(LCASE(STR(?type)), LCASE("{query_text}"))) ||
-                (BOUND(?mimeType) && CONTAINS(LCASE(STR(?mimeType)), LCASE("{query_text}")))
-            )
-        }}
-        ORDER BY DESC(
-            (IF(CONTAINS(LCASE(?fileName), LCASE("{query_text}")), 4, 0)) +
-            (IF(BOUND(?title) && CONTAINS(LCASE(STR(?title)), LCASE("{query_text}")), 3, 0)) +
-            (IF(BOUND(?description) && CONTAINS(LCASE(STR(?description)), LCASE("{query_text}")), 2, 0)) +
-            (IF(BOUND(?tag) && CONTAINS(LCASE(STR(?tag)), LCASE("{query_text}")), 1, 0))
-        ) ?fileName
-        LIMIT {limit} OFFSET {offset}
-        """
+        return SEMANTIC_SEARCH_QUERY_TEMPLATE.format(
+            match_binds=_match_binds(query_text, SEMANTIC_MATCH_FIELDS),
+            limit=limit,
+            offset=offset
+        )
     
     def _build_textual_search_query(self, query_text: str, limit: int, offset: int) -> str:
         """Build SPARQL query for textual search"""
-        return f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-        
-        SELECT DISTINCT ?asset ?fileName ?title ?description ?fileSize ?mimeType ?author ?created ?type ?tag
-        WHERE {{
-            ?asset a wdo:DigitalInformationCarrier .
-            ?asset rdfs:label ?fileName .
-            
-            OPTIONAL {{ ?asset rdf:type ?type }}
-            OPTIONAL {{ ?asset dcterms:title ?title }}
-            OPTIONAL {{ ?asset dcterms:description ?description }}
-            OPTIONAL {{ ?asset wdo:hasFileSize ?fileSize }}
-            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
-            OPTIONAL {{ ?asset dcterms:creator ?author }}
-            OPTIONAL {{ ?asset dcterms:created ?created }}
-            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
-            
-            # Simple text matching with proper bounds checking
-            FILTER (
-                CONTAINS(LCASE(?fileName), LCASE("{query_text}")) ||
-                (BOUND(?title) && CONTAINS(LCASE(STR(?title)), LCASE("{query_text}"))) ||
-                (BOUND(?description) && CONTAINS(LCASE(STR(?description)), LCASE("{query_text}")))
-            )
-        }}
-        ORDER BY ?fileName
-        LIMIT {limit} OFFSET {offset}
-        """
+        return TEXTUAL_SEARCH_QUERY_TEMPLATE.format(
+            match_binds=_match_binds(query_text, TEXTUAL_MATCH_FIELDS),
+            limit=limit,
+            offset=offset
+        )
     
     def _build_advanced_search_query(self, query: UnifiedSearchQuery) -> str:
         """Build advanced SPARQL query with all filters"""
-        base_query = f"""
-        PREFIX wdo: <{self.WDO_NS}>
-        PREFIX sbekms: <{self.SBEKMS_NS}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-        
-        SELECT DISTINCT ?asset ?fileName ?title ?description ?fileSize ?mimeType ?author ?created ?type ?tag
-        WHERE {{
-            ?asset a wdo:DigitalInformationCarrier .
-            ?asset rdfs:label ?fileName .
-            ?asset rdf:type ?type .
-            
-            OPTIONAL {{ ?asset dcterms:title ?title }}
-            OPTIONAL {{ ?asset dcterms:description ?description }}
-            OPTIONAL {{ ?asset wdo:hasFileSize ?fileSize }}
-            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
-            OPTIONAL {{ ?asset dcterms:creator ?author }}
-            OPTIONAL {{ ?asset dcterms:created ?created }}
-            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
-        """
-        
-        # Build filters
-        filters = []
-        
-        # Text search filter
-        if query.query:
-            if query.search_type == "semantic":
-                filters.append(f"""
-                    (CONTAINS(LCASE(?fileName), LCASE("{query.query}")) ||
-                     CONTAINS(LCASE(STR(?title)), LCASE("{query.query}")) ||
-                     CONTAINS(LCASE(STR(?description)), LCASE("{query.query}")) ||
-                     CONTAINS(LCASE(STR(?tag)), LCASE("{query.query}")))
-                """)
-            else:  # textual or hybrid
-                filters.append(f"""
-                    (CONTAINS(LCASE(?fileName), LCASE("{query.query}")) ||
-                     CONTAINS(LCASE(STR(?title)), LCASE("{query.query}")) ||
-                     CONTAINS(LCASE(STR(?description)), LCASE("{query.query}")))
-                """)
-        
-        # WDO classes filter
-        if query.wdo_classes:
-            wdo_filter = " || ".join([f"?type = wdo:{cls}" for cls in query.wdo_classes])
-            filters.append(f"({wdo_filter})")
-        
-        # File types filter
-        if query.file_types:
-            file_type_filters = []
-            for file_type in query.file_types:
-                file_type_filters.append(f'REGEX(?fileName, "\\.{file_type}$", "i")')
-            filters.append(f"({' || '.join(file_type_filters)})")
-        
-        # Author filter
-        if query.author:
-            filters.append(f'CONTAINS(LCASE(STR(?author)), LCASE("{query.author}"))')
-        
-        # File size filters
-        if query.min_file_size:
-            filters.append(f"?fileSize >= {query.min_file_size}")
-        if query.max_file_size:
-            filters.append(f"?fileSize <= {query.max_file_size}")
-        
-        # Date filters
-        if query.date_from:
-            filters.append(f'?created >= "{query.date_from}T00:00:00"^^xsd:dateTime')
-        if query.date_to:
-            filters.append(f'?created <= "{query.date_to}T23:59:59"^^xsd:dateTime')
-        
-        # Tags filter
-        if query.tags:
-            tag_filters = []
-            for tag in query.tags:
-                tag_filters.append(f'CONTAINS(LCASE(STR(?tag)), LCASE("{tag}"))')
-            filters.append(f"({' || '.join(tag_filters)})")
-        
-        # Add all filters to query
-        if filters:
-            base_query += "\n            FILTER (" + " && ".join(filters) + ")"
-        
-        # Add ordering and pagination
-        if query.query and query.search_type == "semantic":
-            base_query += f"""
-        }}
-        ORDER BY DESC(
-            (IF(CONTAINS(LCASE(?fileName), LCASE("{query.query}")), 4, 0)) +
-            (IF(CONTAINS(LCASE(STR(?title)), LCASE("{query.query}")), 3, 0)) +
-            (IF(CONTAINS(LCASE(STR(?description)), LCASE("{query.query}")), 2, 0))
-        ) ?fileName
-        LIMIT {query.limit} OFFSET {query.offset}
-        """
-        else:
-            base_query += f"""
-        }}
-        ORDER BY ?fileName
-        LIMIT {query.limit} OFFSET {query.offset}
-        """
-        
-        return base_query
+        filter_fields = tuple(field for field, _ in ADVANCED_FILTER_FRAGMENTS if getattr(query, field))
+        template = _advanced_query_template(query.search_type if query.query else None, filter_fields)
+        
+        match_fields = ADVANCED_SEMANTIC_MATCH_FIELDS if query.search_type == "semantic" else TEXTUAL_MATCH_FIELDS
+        return template.format(
+            match_binds=_match_binds(query.query, match_fields) if query.query else "",
+            wdo_filter="(" + " || ".join(f"?type = wdo:{cls}" for cls in query.wdo_classes or ()) + ")",
+            file_type_filter="(" + " || ".join(
+                f'REGEX(?fileName, "\\.{file_type}$", "i")' for file_type in query.file_types or ()
+            ) + ")",
+            author=_sparql_literal(query.author or ""),
+            min_file_size=query.min_file_size,
+            max_file_size=query.max_file_size,
+            date_from=query.date_from,
+            date_to=query.date_to,
+            tag_filter="(" + " || ".join(
+                f'CONTAINS(LCASE(STR(?tag)), LCASE({_sparql_literal(tag)}))' for tag in query.tags or ()
+            ) + ")",
+            limit=query.limit,
+            offset=query.offset
+        )
     
-    def _process_search_result(self, result: dict, query_text: str) -> SearchResult:
+    def _process_search_result(self, result: dict, query_pattern: re.Pattern) -> SearchResult:
         """Process SPARQL result into SearchResult model"""
         # Calculate relevance score
-        relevance_score = self._calculate_relevance(result, query_text)
+        relevance_score = self._calculate_relevance(result, query_pattern)
         
         # Extract highlights
-        highlights = self._extract_highlights(result, query_text)
+        highlights = self._extract_highlights(result, query_pattern)
         
         # Extract asset ID from URI
         asset_uri = result.get('asset', {}).get('value', '')
         asset_id = asset_uri.split('/')[-1] if asset_uri else 'unknown'
         
-        # Extract tags (may be multiple)
-        tags = []
-        if result.get('tag'):
-            tag_value = result['tag']['value']
-            if tag_value:
-                tags.append(tag_value)
+        # Tags arrive grouped into one column
+        tags = _split_tags(result)
         
         # Parse creation date
         created_str = result.get('created', {}).get('value', '2024-01-01T00:00:00')
         try:
-            if 'T' in created_str:
-                created_at = datetime.fromisoformat(created_str.replace('Z', '+00:00'))
-            else:
-                created_at = datetime.fromisoformat(f"{created_str}T00:00:00")
-        except:
+            # Python 3.11+ parses the 'Z' suffix and date-only values (as midnight) directly
+            created_at = datetime.fromisoformat(created_str)
+        except ValueError:
             created_at = datetime(2024, 1, 1)
         
-        return SearchResult(
+        # Every field is already of its declared type, so skip per-row validation;
+        # the response model is still validated once when the endpoint returns
+        file_name = result.get('fileName', {}).get('value', '')
+        return SearchResult.model_construct(
             asset_id=asset_id,
-            file_name=result.get('fileName', {}).get('value', ''),
+            file_name=file_name,
             title=result.get('title', {}).get('value') if result.get('title') else None,
             description=result.get('description', {}).get('value') if result.get('description') else None,
-            file_type=self._extract_file_type(result.get('fileName', {}).get('value', '')),
+            file_type=_extract_file_type(file_name),
             mime_type=result.get('mimeType', {}).get('value', ''),
             file_size=int(result.get('fileSize', {}).get('value', 0)),
             author=result.get('author', {}).get('value') if result.get('author') else None,
             tags=tags,
-            wdo_classes=[self._extract_class_name(result.get('type', {}).get('value', ''))],
+            wdo_classes=[_extract_class_name(result.get('type', {}).get('value', ''))],
             created_at=created_at,
             relevance_score=relevance_score,
             highlights=highlights
         )
     
-    def _calculate_relevance(self, result: dict, query_text: str) -> float:
+    def _calculate_relevance(self, result: dict, query_pattern: re.Pattern) -> float:
         """Calculate relevance score for search result"""
         score = 0.0
-        query_lower = query_text.lower()
         
         # File name matching (highest weight)
-        file_name = result.get('fileName', {}).get('value', '').lower()
-        if query_lower in file_name:
+        file_name = result.get('fileName', {}).get('value', '')
+        match = query_pattern.search(file_name)
+        if match:
             score += 0.4
-            if file_name.startswith(query_lower):
+            if match.start() == 0:
                 score += 0.1  # Bonus for prefix match
         
         # Title matching
         title = result.get('title', {}).get('value', '')
-        if title and query_lower in title.lower():
+        if title and query_pattern.search(title):
             score += 0.3
         
         # Description matching
         description = result.get('description', {}).get('value', '')
-        if description and query_lower in description.lower():
+        if description and query_pattern.search(description):
             score += 0.2
         
         # Tag matching
-        tag = result.get('tag', {}).get('value', '')
-        if tag and query_lower in tag.lower():
+        if any(query_pattern.search(tag) for tag in _split_tags(result)):
             score += 0.1
         
         return min(score, 1.0)
     
-    def _extract_highlights(self, result: dict, query_text: str) -> List[str]:
+    def _extract_highlights(self, result: dict, query_pattern: re.Pattern) -> List[str]:
         """Extract highlighted text snippets"""
         highlights = []
-        query_lower = query_text.lower()
         
         # Check file name
         file_name = result.get('fileName', {}).get('value', '')
-        if query_lower in file_name.lower():
+        if query_pattern.search(file_name):
             highlights.append(f"📄 {file_name}")
         
         # Check title
         title = result.get('title', {}).get('value', '')
-        if title and query_lower in title.lower():
+        if title and query_pattern.search(title):
             highlights.append(f"📋 {title}")
         
         # Check description with context
         description = result.get('description', {}).get('value', '')
-        if description and query_lower in description.lower():
-            start = max(0, description.lower().find(query_lower) - 30)
-            end = min(len(description), start + 100)
+        match = query_pattern.search(description) if description else None
+        if match:
+            start = max(0, match.start() - 30)
+            end = min(len(description), match.end() + 70)
             snippet = description[start:end]
             if start > 0:
                 snippet = "..." + snippet
@@ -401,67 +712,56 @@ class UnifiedSearchService:
             highlights.append(f"📝 {snippet}")
         
         # Check tags
-        tag = result.get('tag', {}).get('value', '')
-        if tag and query_lower in tag.lower():
-            highlights.append(f"🏷️ {tag}")
+        highlights.extend(f"🏷️ {tag}" for tag in _split_tags(result) if query_pattern.search(tag))
         
         return highlights
     
-    def _extract_file_type(self, file_name: str) -> str:
-        """Extract file type from file name"""
-        if '.' in file_name:
-            return file_name.split('.')[-1].lower()
-        return 'unknown'
-    
-    def _extract_class_name(self, class_uri: str) -> str:
-        """Extract class name from URI"""
-        if '#' in class_uri:
-            return class_uri.split('#')[-1]
-        elif '/' in class_uri:
-            return class_uri.split('/')[-1]
-        return class_uri
-    
     async def _generate_suggestions(self, query_text: str) -> List[str]:
         """Generate search suggestions based on existing data"""
         suggestions = []
         
         try:
-            # Query for similar terms
-            sparql_query = f"""
-            PREFIX wdo: <{self.WDO_NS}>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            PREFIX dcterms: <http://purl.org/dc/terms/>
-            
-            SELECT DISTINCT ?label
-            WHERE {{
-                {{
-                    ?asset rdfs:label ?label .
-                    FILTER CONTAINS(LCASE(?label), LCASE("{query_text[:3]}"))
-                }} UNION {{
-                    ?asset dcterms:title ?label .
-                    FILTER CONTAINS(LCASE(STR(?label)), LCASE("{query_text[:3]}"))
-                }} UNION {{
-                    ?asset wdo:hasTag ?tagURI .
-                    ?tagURI rdfs:label ?label .
-                    FILTER CONTAINS(LCASE(?label), LCASE("{query_text[:3]}"))
-                }}
-            }}
-            LIMIT 5
-            """
-            
-            query_results = await self.triplestore.query(sparql_query)
-            results = query_results.get('results', {}).get('bindings', [])
-            for result in results:
-                label = result.get('label', {}).get('value', '')
-                if label and label.lower() != query_text.lower():
-                    suggestions.append(label)
+            await search_warm_cache.ensure_loaded(self.triplestore)
+            suggestions = search_warm_cache.suggest(query_text)
         
         except Exception as e:
             logger.warning(f"Failed to generate suggestions: {e}")
         
-        return list(set(suggestions))[:5]  # Remove duplicates and limit
+        return suggestions
+
+
+@lru_cache()
+def get_search_service() -> UnifiedSearchService:
+    """Get unified search service singleton"""
+    return UnifiedSearchService(get_triplestore_client())
+
+# Bumped whenever the search response shape changes, so cached ETags stop validating
+SEARCH_API_VERSION = "2.0.0"
+
+# The data generation is a per-process counter, so tags are only meaningful to the worker that issued
+# them; keep them out of shared caches and salt them with a per-boot epoch
+SEARCH_CACHE_CONTROL = "private, max-age=30"
+FACETS_CACHE_CONTROL = "private, max-age=300"
+_ETAG_EPOCH = secrets.token_hex(8)
 
 
+def _etag(*parts) -> str:
+    """Weak ETag over the API version, this process's boot epoch, the data generation and the given parts"""
+    key = "|".join(map(str, (SEARCH_API_VERSION, _ETAG_EPOCH, query_cache_generation(), *parts)))
+    return 'W/"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the representation with this ETag"""
+    return not_modified(request.headers.get("if-none-match"), etag)
+
+async def warm_search_cache():
+    """Pin suggestion labels and facets before the first request; awaited by the app lifespan"""
+    try:
+        await search_warm_cache.ensure_loaded(get_triplestore_client())
+    except Exception as e:
+        logger.warning(f"Search warm cache not loaded at startup: {e}")
+
 # API Endpoints
 @router.get("/health")
 async def search_health():
@@ -469,15 +769,14 @@ async def search_health():
     return {
         "status": "healthy", 
         "service": "search", 
-        "version": "2.0.0",
+        "version": SEARCH_API_VERSION,
         "features": ["unified_search", "semantic_search", "advanced_filters", "suggestions"]
     }
 
-@router.post("/", response_model=SearchResponse)
+@router.post("/", response_model=SearchResponse, response_class=ORJSONResponse)
 async def unified_search(
     query: UnifiedSearchQuery,
-    triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology: OntologyManager = Depends(get_ontology_manager)
+    search_service: UnifiedSearchService = Depends(get_search_service)
 ):
     """
     Unified search endpoint that automatically handles both basic and advanced search.
@@ -488,18 +787,53 @@ async def unified_search(
     - **Textual Search**: Set search_type to 'textual' for simple text matching
     - **Hybrid Search**: Default mode that combines semantic and textual approaches
     """
-    search_service = UnifiedSearchService(triplestore, ontology)
+    return await search_service.search(query)
+
+@router.get("/", response_model=SearchResponse, response_class=ORJSONResponse)
+async def unified_search_get(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=500, description="Search query string"),
+    search_type: Literal["semantic", "textual", "hybrid"] = Query("hybrid", description="Type of search to perform"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    file_types: Optional[List[str]] = Query(None, description="Filter by file types (py, md, json, etc.)"),
+    wdo_classes: Optional[List[str]] = Query(None, description="Filter by WDO ontology classes"),
+    tags: Optional[List[str]] = Query(None, description="Filter by tags"),
+    author: Optional[str] = Query(None, description="Filter by author"),
+    date_from: Optional[date] = Query(None, description="Filter by creation date from"),
+    date_to: Optional[date] = Query(None, description="Filter by creation date to"),
+    min_file_size: Optional[int] = Query(None, ge=0, description="Minimum file size in bytes"),
+    max_file_size: Optional[int] = Query(None, ge=0, description="Maximum file size in bytes"),
+    has_content: Optional[bool] = Query(None, description="Filter files with/without content analysis"),
+    search_service: UnifiedSearchService = Depends(get_search_service)
+):
+    """Cacheable GET form of the unified search, validated with ETag / If-None-Match"""
+    try:
+        query = UnifiedSearchQuery(
+            query=q, search_type=search_type, limit=limit, offset=offset,
+            file_types=file_types, wdo_classes=wdo_classes, tags=tags, author=author,
+            date_from=date_from, date_to=date_to, min_file_size=min_file_size,
+            max_file_size=max_file_size, has_content=has_content
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    etag = _etag("search", query.cache_key())
+    headers = {"ETag": etag, "Cache-Control": SEARCH_CACHE_CONTROL, "Vary": "Accept"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
     return await search_service.search(query)
 
 @router.get("/suggestions")
 async def get_search_suggestions(
     q: str = Query(..., min_length=1, description="Partial query for suggestions"),
     limit: int = Query(10, ge=1, le=20, description="Number of suggestions"),
-    triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology: OntologyManager = Depends(get_ontology_manager)
+    search_service: UnifiedSearchService = Depends(get_search_service)
 ):
     """Get search suggestions based on partial query"""
-    search_service = UnifiedSearchService(triplestore, ontology)
     suggestions = await search_service._generate_suggestions(q)
     
     return SuccessResponse(
@@ -509,59 +843,28 @@ async def get_search_suggestions(
 
 @router.get("/facets")
 async def get_search_facets(
-    triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology: OntologyManager = Depends(get_ontology_manager)
+    request: Request,
+    response: Response,
+    search_service: UnifiedSearchService = Depends(get_search_service)
 ):
     """Get available search facets (file types, authors, tags, etc.)"""
+    etag = _etag("facets")
+    headers = {"ETag": etag, "Cache-Control": FACETS_CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    
     try:
-        # Query for available facets
-        facets_query = f"""
-        PREFIX wdo: <http://purl.example.org/web_dev_km_bfo#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT DISTINCT ?type ?author ?mimeType ?tag
-        WHERE {{
-            ?asset a wdo:DigitalInformationCarrier .
-            OPTIONAL {{ ?asset rdf:type ?type }}
-            OPTIONAL {{ ?asset dcterms:creator ?author }}
-            OPTIONAL {{ ?asset wdo:hasMimeType ?mimeType }}
-            OPTIONAL {{ ?asset wdo:hasTag ?tagURI . ?tagURI rdfs:label ?tag }}
-        }}
-        """
-        
-        query_results = await triplestore.query(facets_query)
-        results = query_results.get('results', {}).get('bindings', [])
-        
-        # Process facets
-        wdo_classes = set()
-        authors = set()
-        mime_types = set()
-        tags = set()
-        
-        for result in results:
-            if result.get('type'):
-                class_name = result['type']['value'].split('#')[-1] if '#' in result['type']['value'] else result['type']['value'].split('/')[-1]
-                if class_name != "DigitalInformationCarrier":  # Exclude base class
-                    wdo_classes.add(class_name)
-            
-            if result.get('author'):
-                authors.add(result['author']['value'])
-            
-            if result.get('mimeType'):
-                mime_types.add(result['mimeType']['value'])
-            
-            if result.get('tag'):
-                tags.add(result['tag']['value'])
+        await search_warm_cache.ensure_loaded(search_service.triplestore)
+        response.headers.update(headers)
+        facets = search_warm_cache.facets
         
         return SuccessResponse(
             message="Retrieved search facets",
             data={
-                "wdo_classes": sorted(list(wdo_classes)),
-                "authors": sorted(list(authors)),
-                "mime_types": sorted(list(mime_types)),
-                "tags": sorted(list(tags)),
+                "wdo_classes": list(facets["wdo_classes"]),
+                "authors": list(facets["authors"]),
+                "mime_types": list(facets["mime_types"]),
+                "tags": list(facets["tags"]),
                 "file_types": ["py", "md", "json", "txt", "yml", "yaml", "js", "ts", "html", "css", "xml", "sql"],
                 "search_types": ["semantic", "textual", "hybrid"]
             }
@@ -5,7 +5,8 @@ from pydantic import BaseModel, Field
 
 from app.models.common import SuccessResponse
 from app.core.triplestore_client import TriplestoreClient
-from app.dependencies import get_triplestore_client
+from app.core.update_buffer import SPARQLUpdateBuffer
+from app.dependencies import get_triplestore_client, get_update_buffer
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -29,8 +30,8 @@ async def execute_sparql_query(
     try:
         logger.info(f"Executing SPARQL query: {sparql_request.query[:100]}...")
         
-        # Execute the query
-        results = await triplestore.query(sparql_request.query)
+        # Execute the query; user queries may use NOW()/RAND() or follow writes made elsewhere, so never cache them
+        results = await triplestore.query(sparql_request.query, use_cache=False)
         
         return SuccessResponse(
             message="SPARQL query executed successfully",
@@ -49,14 +50,16 @@ async def execute_sparql_query(
 @router.post("/update", response_model=SuccessResponse)
 async def execute_sparql_update(
     sparql_request: SPARQLQuery,
-    triplestore: TriplestoreClient = Depends(get_triplestore_client)
+    update_buffer: SPARQLUpdateBuffer = Depends(get_update_buffer)
 ):
     """Execute a SPARQL UPDATE query against the triplestore"""
     try:
         logger.info(f"Executing SPARQL update: {sparql_request.query[:100]}...")
         
-        # Execute the update
-        result = await triplestore.update(sparql_request.query)
+        # Execute the update; concurrent updates are sent to the store as one request
+        result = await update_buffer.submit(sparql_request.query)
+        if not result:
+            raise Exception("triplestore rejected the update")
         
         return SuccessResponse(
             message="SPARQL update executed successfully",
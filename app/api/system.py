@@ -1,15 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
-from app.models.common import SuccessResponse, ErrorResponse
+from datetime import datetime, timezone
+import asyncio
+import uuid
+from app.models.common import SuccessResponse, ErrorResponse, ResponseStatus
 from app.dependencies import get_triplestore_client, get_ontology_manager
 from app.core.triplestore_client import TriplestoreClient
 from app.core.ontology_manager import OntologyManager
-from app.config import settings
+from app.config import Settings, get_settings, settings
+from app.utils.cache import graph_cache, not_modified, search_cache, sparql_cache, system_cache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Seconds a polled response is served from system_cache
+STATUS_CACHE_TTL = 10.0
+ONTOLOGY_CACHE_TTL = 60.0
+
+# Ontology listings only change when the ontology is reloaded; clients revalidate by ETag
+ONTOLOGY_CACHE_CONTROL = "private, max-age=60"
+
+def _cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the in-process response caches"""
+    return {
+        "graph": graph_cache.stats(),
+        "search": search_cache.stats(),
+        "sparql": sparql_cache.stats(),
+        "system": system_cache.stats()
+    }
+
+def _internal_error(message: str) -> HTTPException:
+    """Log the active exception under a new error id; the client only gets the id, not the error text"""
+    error_id = uuid.uuid4().hex
+    logger.exception("%s [error_id=%s]", message, error_id, extra={"error_id": error_id})
+    return HTTPException(status_code=500, detail=f"Internal server error (error id {error_id})")
+
+def _ontology_headers(ontology_manager: OntologyManager) -> Dict[str, str]:
+    """ETag and Cache-Control for ontology listings, or none before an ontology is loaded"""
+    if not ontology_manager.version_hash:
+        return {}
+    return {"ETag": f'"{ontology_manager.version_hash}"', "Cache-Control": ONTOLOGY_CACHE_CONTROL}
+
+def _ontology_response(message: str, data: Dict[str, Any], headers: Dict[str, str]) -> ORJSONResponse:
+    """SuccessResponse-shaped body handed straight to orjson, skipping pydantic for large ontology listings"""
+    return ORJSONResponse({
+        "status": ResponseStatus.SUCCESS.value,
+        "message": message,
+        "timestamp": datetime.now(timezone.utc),
+        "data": data
+    }, headers=headers)
+
 @router.get("/health")
 async def system_health():
     """System API health check"""
@@ -22,23 +64,23 @@ async def system_health():
 @router.get("/status", response_model=SuccessResponse)
 async def get_system_status(
     triplestore: TriplestoreClient = Depends(get_triplestore_client),
-    ontology_manager: OntologyManager = Depends(get_ontology_manager)
+    ontology_manager: OntologyManager = Depends(get_ontology_manager),
+    settings: Settings = Depends(get_settings)
 ):
     """Get comprehensive system status"""
     try:
-        # Test triplestore connection
-        triplestore_connected = await triplestore.test_connection()
-        
-        # Get repository status
-        repository_exists = False
-        repository_stats = None
-        if triplestore_connected:
-            repository_exists = await triplestore.repository_exists()
-            if repository_exists:
-                repository_stats = await triplestore.get_repository_stats()
+        status_data = system_cache.get("status")
+        if status_data is not None:
+            return SuccessResponse(
+                message="System status retrieved successfully",
+                data={**status_data, "caches": _cache_stats()}
+            )
         
-        # Get ontology status
-        ontology_stats = await ontology_manager.get_ontology_stats()
+        # One triplestore round-trip for connectivity, existence and stats, alongside the ontology status
+        triplestore_status, ontology_stats = await asyncio.gather(
+            triplestore.get_status_bundle(),
+            ontology_manager.get_ontology_stats()
+        )
         
         status_data = {
             "system": {
@@ -49,26 +91,26 @@ async def get_system_status(
             "triplestore": {
                 "url": settings.TRIPLESTORE_URL,
                 "repository": settings.TRIPLESTORE_REPOSITORY,
-                "connected": triplestore_connected,
-                "repository_exists": repository_exists,
-                "stats": repository_stats
+                "connected": triplestore_status["connected"],
+                "repository_exists": triplestore_status["repository_exists"],
+                "stats": triplestore_status["stats"]
             },
             "ontology": ontology_stats,
             "configuration": {
                 "upload_dir": settings.UPLOAD_DIR,
                 "max_file_size": settings.MAX_FILE_SIZE,
-                "allowed_extensions": settings.ALLOWED_EXTENSIONS[:5]  # Show first 5
+                "allowed_extensions": sorted(settings.ALLOWED_EXTENSIONS)[:5]  # Show first 5
             }
         }
+        system_cache.set("status", status_data, ttl=STATUS_CACHE_TTL)
         
         return SuccessResponse(
             message="System status retrieved successfully",
-            data=status_data
+            data={**status_data, "caches": _cache_stats()}
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get system status: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get system status: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get system status")
 
 @router.post("/initialize", response_model=SuccessResponse)
 async def initialize_system(
@@ -79,18 +121,19 @@ async def initialize_system(
     try:
         initialization_results = {}
         
-        # Initialize triplestore
-        logger.info("Initializing triplestore...")
-        triplestore_success = await triplestore.initialize()
+        # Initialize triplestore and load ontology concurrently; they do not depend on each other
+        logger.info("Initializing triplestore and loading ontology...")
+        triplestore_success, ontology_success = await asyncio.gather(
+            triplestore.initialize(),
+            ontology_manager.load_ontology()
+        )
+        
         initialization_results["triplestore"] = {
             "success": triplestore_success,
             "message": "Triplestore initialized successfully" if triplestore_success 
                       else "Triplestore initialization failed"
         }
         
-        # Load ontology
-        logger.info("Loading ontology...")
-        ontology_success = await ontology_manager.load_ontology()
         initialization_results["ontology"] = {
             "success": ontology_success,
             "message": "Ontology loaded successfully" if ontology_success 
@@ -99,16 +142,17 @@ async def initialize_system(
         
         # Overall success
         overall_success = triplestore_success and ontology_success
+        system_cache.clear()
         
         if not overall_success:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"System initialization failed: {initialization_results}"
-            )
+            logger.error("System initialization failed: %s", initialization_results)
+            raise HTTPException(status_code=500, detail="System initialization failed")
         
         # Get updated stats after initialization
-        ontology_stats = await ontology_manager.get_ontology_stats()
-        repository_stats = await triplestore.get_repository_stats()
+        ontology_stats, repository_stats = await asyncio.gather(
+            ontology_manager.get_ontology_stats(),
+            triplestore.get_repository_stats()
+        )
         
         return SuccessResponse(
             message="System initialized successfully",
@@ -121,9 +165,8 @@ async def initialize_system(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"System initialization failed: {e}")
-        raise HTTPException(status_code=500, detail=f"System initialization failed: {str(e)}")
+    except Exception:
+        raise _internal_error("System initialization failed")
 
 @router.get("/triplestore/stats", response_model=SuccessResponse)
 async def get_triplestore_stats(
@@ -132,13 +175,13 @@ async def get_triplestore_stats(
     """Get detailed triplestore statistics"""
     try:
         stats = await triplestore.get_repository_stats()
+        stats["query_caches"] = _cache_stats()
         return SuccessResponse(
             message="Triplestore statistics retrieved successfully",
             data=stats
         )
-    except Exception as e:
-        logger.error(f"Failed to get triplestore stats: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get triplestore stats: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get triplestore stats")
 
 @router.get("/ontology/stats", response_model=SuccessResponse)
 async def get_ontology_stats(
@@ -146,78 +189,90 @@ async def get_ontology_stats(
 ):
     """Get detailed ontology statistics"""
     try:
-        stats = await ontology_manager.get_ontology_stats()
+        stats = system_cache.get("ontology_stats")
+        if stats is None:
+            stats = await ontology_manager.get_ontology_stats()
+            system_cache.set("ontology_stats", stats, ttl=ONTOLOGY_CACHE_TTL)
         return SuccessResponse(
             message="Ontology statistics retrieved successfully",
             data=stats
         )
-    except Exception as e:
-        logger.error(f"Failed to get ontology stats: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology stats: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get ontology stats")
 
 @router.get("/ontology/classes", response_model=SuccessResponse)
 async def get_ontology_classes(
+    request: Request,
     ontology_manager: OntologyManager = Depends(get_ontology_manager)
 ):
     """Get all ontology classes"""
     try:
-        if not ontology_manager.loaded:
-            raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+        headers = _ontology_headers(ontology_manager)
+        if headers and not_modified(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
         
-        classes = ontology_manager.get_classes()
-        return SuccessResponse(
-            message=f"Retrieved {len(classes)} ontology classes",
-            data={"classes": classes}
-        )
+        classes = system_cache.get("ontology_classes")
+        if classes is None:
+            if not ontology_manager.loaded:
+                raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+            classes = ontology_manager.get_classes()
+            system_cache.set("ontology_classes", classes, ttl=ONTOLOGY_CACHE_TTL)
+        return _ontology_response(f"Retrieved {len(classes)} ontology classes", {"classes": classes}, headers)
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to get ontology classes: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology classes: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get ontology classes")
 
 @router.get("/ontology/properties", response_model=SuccessResponse)
 async def get_ontology_properties(
+    request: Request,
     ontology_manager: OntologyManager = Depends(get_ontology_manager)
 ):
     """Get all ontology properties"""
     try:
-        if not ontology_manager.loaded:
-            raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+        headers = _ontology_headers(ontology_manager)
+        if headers and not_modified(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
         
-        properties = ontology_manager.get_properties()
-        return SuccessResponse(
-            message=f"Retrieved {len(properties)} ontology properties",
-            data={"properties": properties}
-        )
+        properties = system_cache.get("ontology_properties")
+        if properties is None:
+            if not ontology_manager.loaded:
+                raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+            properties = ontology_manager.get_properties()
+            system_cache.set("ontology_properties", properties, ttl=ONTOLOGY_CACHE_TTL)
+        return _ontology_response(f"Retrieved {len(properties)} ontology properties", {"properties": properties}, headers)
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to get ontology properties: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology properties: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get ontology properties")
 
 @router.get("/ontology/hierarchy", response_model=SuccessResponse)
 async def get_ontology_hierarchy(
+    request: Request,
     ontology_manager: OntologyManager = Depends(get_ontology_manager)
 ):
     """Get ontology class hierarchy"""
     try:
-        if not ontology_manager.loaded:
-            raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+        headers = _ontology_headers(ontology_manager)
+        if headers and not_modified(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
         
-        hierarchy = ontology_manager.get_class_hierarchy()
-        return SuccessResponse(
-            message="Ontology hierarchy retrieved successfully",
-            data=hierarchy
-        )
+        hierarchy = system_cache.get("ontology_hierarchy")
+        if hierarchy is None:
+            if not ontology_manager.loaded:
+                raise HTTPException(status_code=400, detail="Ontology not loaded. Please initialize the system first.")
+            hierarchy = ontology_manager.get_class_hierarchy()
+            system_cache.set("ontology_hierarchy", hierarchy, ttl=ONTOLOGY_CACHE_TTL)
+        return _ontology_response("Ontology hierarchy retrieved successfully", hierarchy, headers)
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to get ontology hierarchy: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology hierarchy: {str(e)}")
+    except Exception:
+        raise _internal_error("Failed to get ontology hierarchy")
 
 @router.delete("/triplestore/clear", response_model=SuccessResponse)
 async def clear_triplestore(
-    triplestore: TriplestoreClient = Depends(get_triplestore_client)
+    triplestore: TriplestoreClient = Depends(get_triplestore_client),
+    settings: Settings = Depends(get_settings)
 ):
     """Clear all data from triplestore (development/testing only)"""
     try:
@@ -234,6 +289,5 @@ async def clear_triplestore(
         )
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to clear triplestore: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to clear triplestore: {str(e)}") 
\ No newline at end of file
+    except Exception:
+        raise _internal_error("Failed to clear triplestore") 
\ No newline at end of file
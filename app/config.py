@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
 import os
 
 class Settings(BaseSettings):
@@ -15,9 +16,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     
     # CORS
-    CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001"]
+    CORS_ORIGINS: Tuple[str, ...] = ("http://localhost:3000", "http://localhost:3001")
+    CORS_MAX_AGE: int = 86400  # Seconds browsers may cache a preflight response
     
     # Triplestore Settings
+    TRIPLESTORE_MODE: str = "remote"  # "remote" (GraphDB) or "local" (in-process pyoxigraph)
+    TRIPLESTORE_LOCAL_PATH: Optional[str] = None  # On-disk store for local mode; in-memory if unset
     TRIPLESTORE_URL: str = "http://localhost:7200"
     TRIPLESTORE_REPOSITORY: str = "sbekms"
     TRIPLESTORE_USERNAME: Optional[str] = None
@@ -26,11 +30,11 @@ class Settings(BaseSettings):
     # File Upload Settings
     UPLOAD_DIR: str = "data/uploads"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
-    ALLOWED_EXTENSIONS: List[str] = [
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset({
         ".py", ".js", ".ts", ".java", ".cpp", ".c", ".jsx", ".tsx",
         ".md", ".txt", ".rst", ".json", ".yml", ".yaml", ".toml",
         ".css", ".scss", ".svg", ".png", ".jpg", ".jpeg"
-    ]
+    })
     
     # Ontology Settings
     ONTOLOGY_PATH: str = "data/ontologies/skms_ontology.owl"
@@ -44,8 +48,10 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings; the upload directory is created by the app lifespan"""
+    return Settings()
 
-# Ensure upload directory exists
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True) 
\ No newline at end of file
+# Global settings instance
+settings = get_settings()
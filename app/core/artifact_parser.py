@@ -1,17 +1,149 @@
 import os
+import codecs
+import asyncio
+import multiprocessing
 import logging
 import hashlib
 import mimetypes
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import ast
-import re
+import io
 import json
-import yaml
+import re
+import tokenize
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Files read from disk are hashed and decoded together, this many bytes at a time
+READ_CHUNK_SIZE = 1 << 16
+
+# Parser processes, created on first large parse and shut down by the app lifespan
+PARSER_POOL_WORKERS = min(4, os.cpu_count() or 1)
+_parser_pool: Optional[ProcessPoolExecutor] = None
+
+# Below this size the pickling round trip to a worker costs more than parsing on a thread
+PROCESS_PARSE_THRESHOLD = 256 * 1024
+
+# Languages whose files are binary: only the checksum is computed for them
+_BINARY_LANGUAGES = frozenset({'image', 'icon'})
+
+# UTF-16/32 are only recognised by their byte-order mark (UTF-32 LE first: its BOM starts with UTF-16 LE's)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Tried after UTF-8; cp1252 leaves five bytes undefined, and latin-1 accepts anything
+_FALLBACK_ENCODINGS = ('cp1252', 'latin-1')
+
+# Patterns are compiled once at import and shared by every parse
+# \b keeps the engine from retrying (\w+) at every character inside an identifier;
+# a match can never start mid-word, so results are unchanged
+_JS_FUNCTION_RE = re.compile(r'(?:function\s+(\w+)|\b(\w+)\s*:\s*function|\b(\w+)\s*=\s*(?:function|\(.*?\)\s*=>))')
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)(?:\s+extends\s+(\w+))?')
+_JS_IMPORT_RES = (
+    re.compile(r'import\s+.*?\s+from\s+[\'"](.+?)[\'"]'),
+    re.compile(r'require\([\'"](.+?)[\'"]\)'),
+    re.compile(r'import\s+[\'"](.+?)[\'"]'),
+)
+_LINE_COMMENT_RE = re.compile(r'//\s*(.+)')
+_BLOCK_COMMENT_RE = re.compile(r'/\*\s*(.+?)\s*\*/', re.DOTALL)
+
+_MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)', re.MULTILINE)
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_MD_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+_CSS_SELECTOR_RE = re.compile(r'([^{]+)\s*{')
+
+_HTML_IMAGE_RE = re.compile(r'<img[^>]+src=[\'"]([^"\']+)[\'"][^>]*>')
+_HTML_LINK_RE = re.compile(r'<a[^>]+href=[\'"]([^"\']+)[\'"][^>]*>([^<]*)</a>')
+
+_GENERIC_FUNCTION_RES = (
+    re.compile(r'def\s+(\w+)'),  # Python-style
+    re.compile(r'function\s+(\w+)'),  # JS-style
+    re.compile(r'\b(\w+)\s*\([^)]*\)\s*{'),  # C-style
+)
+_GENERIC_COMMENT_RES = (
+    re.compile(r'//\s*(.+)', re.DOTALL),  # C-style
+    re.compile(r'#\s*(.+)', re.DOTALL),   # Python-style
+    _BLOCK_COMMENT_RE,  # Block comments
+)
+
+# Matches exactly the characters str.split() separates on
+_WHITESPACE_RE = re.compile(r'\s')
+
+def _count_words(content: str) -> int:
+    """Count whitespace-separated words like len(content.split()), one bounded slice at a time"""
+    word_count = 0
+    start, length = 0, len(content)
+    while start < length:
+        # Extend each slice to the next whitespace so no word straddles two slices
+        boundary = _WHITESPACE_RE.search(content, min(start + READ_CHUNK_SIZE, length))
+        end = boundary.start() if boundary else length
+        word_count += len(content[start:end].split())
+        start = end
+    return word_count
+
+@lru_cache(maxsize=1)
+def _import_yaml():
+    """Import PyYAML on first use, since most uploads are not YAML; returns (module, safe loader)"""
+    import yaml
+    # libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+    return yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Map file types to WDO classes
+_LANGUAGE_WDO_CLASSES = {
+    'python': 'PythonSourceCodeFile',
+    'javascript': 'JavaScriptSourceCodeFile', 
+    'typescript': 'TypeScriptSourceCodeFile',
+    'react': 'ReactSourceCodeFile',
+    'java': 'JavaSourceCodeFile',
+    'cpp': 'CppSourceCodeFile',
+    'c': 'CSourceCodeFile',
+    'css': 'CSSFile',
+    'scss': 'SCSSFile', 
+    'html': 'HTMLFile',
+    'markdown': 'DocumentationFile',
+    'json': 'ConfigurationFile',
+    'yaml': 'ConfigurationFile',
+    'image': 'AssetFile'
+}
+
+@lru_cache(maxsize=64)
+def _suggestions_for(language: Optional[str], has_functions: bool, has_classes: bool,
+                     has_config: bool) -> Tuple[str, ...]:
+    """WDO classes for a parse signature; only these four inputs affect the suggestions"""
+    suggestions = []
+    
+    # Primary class based on language
+    if language in _LANGUAGE_WDO_CLASSES:
+        suggestions.append(_LANGUAGE_WDO_CLASSES[language])
+    
+    # Always include generic classes
+    suggestions.extend([
+        'DigitalInformationCarrier',
+        'InformationContentEntity'
+    ])
+    
+    # Add specific classes based on content analysis
+    if has_functions:
+        suggestions.append('FunctionDefinitionContent')
+    
+    if has_classes:
+        suggestions.append('ClassDefinitionContent')
+    
+    if has_config:
+        suggestions.append('ConfigurationContent')
+    
+    # Order-preserving dedup
+    return tuple(dict.fromkeys(suggestions))
+
 class FileMetadata:
     """Container for file metadata"""
     def __init__(self, file_path: str):
@@ -47,86 +179,166 @@ class FileMetadata:
         self.config_keys = []
         self.config_values = {}
 
+class _PythonMetadataVisitor(ast.NodeVisitor):
+    """Collect functions, classes and imports from a Python AST into FileMetadata"""
+    
+    def __init__(self, metadata: FileMetadata):
+        self.metadata = metadata
+        self.dependencies = set()
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.metadata.functions.append({
+            'name': node.name,
+            'line': node.lineno,
+            'args': [arg.arg for arg in node.args.args],
+            'docstring': ast.get_docstring(node)
+        })
+        self.generic_visit(node)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.metadata.classes.append({
+            'name': node.name,
+            'line': node.lineno,
+            'bases': [base.id if isinstance(base, ast.Name) else str(base) 
+                    for base in node.bases],
+            'docstring': ast.get_docstring(node)
+        })
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._add_import(alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        module = node.module or ''
+        for alias in node.names:
+            self._add_import(f"{module}.{alias.name}")
+    
+    def _add_import(self, name: str):
+        self.metadata.imports.append(name)
+        self.dependencies.add(name)
+
 class ArtifactParser:
     """Parses uploaded files and extracts semantic metadata"""
     
+    # Shared by every instance; built once per process
+    SUPPORTED_EXTENSIONS = {
+        # Programming languages
+        '.py': 'python',
+        '.js': 'javascript', 
+        '.ts': 'typescript',
+        '.jsx': 'react',
+        '.tsx': 'react-typescript',
+        '.java': 'java',
+        '.cpp': 'cpp',
+        '.c': 'c',
+        '.php': 'php',
+        '.rb': 'ruby',
+        '.go': 'go',
+        '.rs': 'rust',
+        
+        # Web technologies
+        '.html': 'html',
+        '.htm': 'html',
+        '.css': 'css',
+        '.scss': 'scss',
+        '.sass': 'sass',
+        '.less': 'less',
+        
+        # Documentation
+        '.md': 'markdown',
+        '.txt': 'text',
+        '.rst': 'restructuredtext',
+        '.adoc': 'asciidoc',
+        
+        # Configuration
+        '.json': 'json',
+        '.yaml': 'yaml',
+        '.yml': 'yaml',
+        '.toml': 'toml',
+        '.ini': 'ini',
+        '.env': 'environment',
+        '.config': 'config',
+        
+        # Assets
+        '.svg': 'svg',
+        '.png': 'image',
+        '.jpg': 'image',
+        '.jpeg': 'image',
+        '.gif': 'image',
+        '.ico': 'icon'
+    }
+    
     def __init__(self):
-        self.supported_extensions = {
-            # Programming languages
-            '.py': 'python',
-            '.js': 'javascript', 
-            '.ts': 'typescript',
-            '.jsx': 'react',
-            '.tsx': 'react-typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust',
-            
-            # Web technologies
-            '.html': 'html',
-            '.htm': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.sass': 'sass',
-            '.less': 'less',
-            
-            # Documentation
-            '.md': 'markdown',
-            '.txt': 'text',
-            '.rst': 'restructuredtext',
-            '.adoc': 'asciidoc',
-            
-            # Configuration
-            '.json': 'json',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.toml': 'toml',
-            '.ini': 'ini',
-            '.env': 'environment',
-            '.config': 'config',
-            
-            # Assets
-            '.svg': 'svg',
-            '.png': 'image',
-            '.jpg': 'image',
-            '.jpeg': 'image',
-            '.gif': 'image',
-            '.ico': 'icon'
+        # Language -> parser, dispatched with one dict lookup
+        self._language_parsers = {
+            'python': self._parse_python,
+            'javascript': self._parse_javascript,
+            'typescript': self._parse_javascript,
+            'markdown': self._parse_markdown,
+            'json': self._parse_json,
+            'yaml': self._parse_yaml,
+            'css': self._parse_css,
+            'scss': self._parse_css,
+            'html': self._parse_html
         }
     
     async def parse_file(self, file_path: str, content: bytes = None) -> FileMetadata:
         """Parse a file and extract all available metadata"""
+        try:
+            size = len(content) if content is not None else os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        
+        # Hashing, decoding and parsing are CPU-bound: small files go to a thread, large ones to a worker process
+        if size < PROCESS_PARSE_THRESHOLD:
+            return await asyncio.to_thread(self._parse_file_sync, file_path, content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_parser_pool(), _sync_parse, file_path, content)
+    
+    def _parse_file_sync(self, file_path: str, content: bytes = None) -> FileMetadata:
+        """Parse a file synchronously, on a thread or inside a parser pool worker"""
         try:
             metadata = FileMetadata(file_path)
             
             # Get basic file information
-            await self._extract_basic_metadata(metadata)
+            self._extract_basic_metadata(metadata)
             
-            # Read file content if not provided
-            if content is None:
+            if metadata.programming_language in _BINARY_LANGUAGES:
+                # Decoding an image would only produce noise text, so just checksum it
                 try:
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
+                    if content is None:
+                        with open(file_path, 'rb') as f:
+                            metadata.checksum = hashlib.file_digest(f, 'sha256').hexdigest()
+                    else:
+                        metadata.checksum = hashlib.sha256(content).hexdigest()
                 except Exception as e:
                     logger.error(f"Failed to read file {file_path}: {e}")
                     return metadata
+                
+                logger.info(f"Parsed binary file: {metadata.file_name} ({metadata.file_size} bytes, {metadata.programming_language})")
+                return metadata
             
-            # Calculate checksum
-            metadata.checksum = hashlib.sha256(content).hexdigest()
-            
-            # Detect encoding and decode content
-            text_content = await self._decode_content(content, metadata)
+            if content is None:
+                # Read, hash and decode the file in one pass
+                try:
+                    text_content = self._read_file(file_path, metadata)
+                except Exception as e:
+                    logger.error(f"Failed to read file {file_path}: {e}")
+                    return metadata
+            else:
+                # Calculate checksum
+                metadata.checksum = hashlib.sha256(content).hexdigest()
+                
+                # Detect encoding and decode content
+                text_content = self._decode_content(content, metadata)
             
             if text_content:
                 # Extract text statistics
-                await self._extract_text_statistics(metadata, text_content)
+                self._extract_text_statistics(metadata, text_content)
                 
                 # Language-specific parsing
-                await self._parse_by_language(metadata, text_content)
+                self._parse_by_language(metadata, text_content)
             
             logger.info(f"Parsed file: {metadata.file_name} ({metadata.file_size} bytes, {metadata.programming_language})")
             return metadata
@@ -135,7 +347,7 @@ class ArtifactParser:
             logger.error(f"Failed to parse file {file_path}: {e}")
             raise Exception(f"File parsing failed: {e}")
     
-    async def _extract_basic_metadata(self, metadata: FileMetadata):
+    def _extract_basic_metadata(self, metadata: FileMetadata):
         """Extract basic file system metadata"""
         try:
             if metadata.file_path.exists():
@@ -150,18 +362,50 @@ class ArtifactParser:
                 metadata.mime_type = "application/octet-stream"
             
             # Determine programming language
-            metadata.programming_language = self.supported_extensions.get(
+            metadata.programming_language = self.SUPPORTED_EXTENSIONS.get(
                 metadata.file_extension, 'unknown'
             )
             
         except Exception as e:
             logger.error(f"Failed to extract basic metadata: {e}")
     
-    async def _decode_content(self, content: bytes, metadata: FileMetadata) -> Optional[str]:
+    def _read_file(self, file_path: str, metadata: FileMetadata) -> Optional[str]:
+        """Hash a file and decode it as UTF-8 from the same chunks, without buffering its bytes"""
+        hasher = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = []
+        
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(READ_CHUNK_SIZE):
+                hasher.update(chunk)
+                if decoder is not None:
+                    try:
+                        parts.append(decoder.decode(chunk))
+                    except UnicodeDecodeError:
+                        decoder, parts = None, []
+            
+            if decoder is not None:
+                try:
+                    parts.append(decoder.decode(b'', final=True))
+                except UnicodeDecodeError:
+                    decoder, parts = None, []
+            
+            metadata.checksum = hasher.hexdigest()
+            if decoder is not None:
+                metadata.encoding = 'utf-8'
+                return ''.join(parts)
+            
+            # Not UTF-8: try the remaining encodings on the whole file
+            f.seek(0)
+            return self._decode_content(f.read(), metadata)
+    
+    def _decode_content(self, content: bytes, metadata: FileMetadata) -> Optional[str]:
         """Decode file content to text"""
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
+            # A byte-order mark names the encoding; otherwise try UTF-8, then single-byte encodings
+            encodings = [encoding for bom, encoding in _BOM_ENCODINGS if content.startswith(bom)][:1]
+            encodings.append('utf-8')
+            encodings.extend(_FALLBACK_ENCODINGS)
             
             for encoding in encodings:
                 try:
@@ -179,142 +423,106 @@ class ArtifactParser:
             logger.error(f"Failed to decode content: {e}")
             return None
     
-    async def _extract_text_statistics(self, metadata: FileMetadata, content: str):
+    def _extract_text_statistics(self, metadata: FileMetadata, content: str):
         """Extract basic text statistics"""
         try:
             metadata.character_count = len(content)
             metadata.line_count = content.count('\n') + 1
-            metadata.word_count = len(content.split())
+            metadata.word_count = _count_words(content)
             
         except Exception as e:
             logger.error(f"Failed to extract text statistics: {e}")
     
-    async def _parse_by_language(self, metadata: FileMetadata, content: str):
+    def _parse_by_language(self, metadata: FileMetadata, content: str):
         """Parse content based on detected language"""
         try:
-            if metadata.programming_language == 'python':
-                await self._parse_python(metadata, content)
-            elif metadata.programming_language in ['javascript', 'typescript']:
-                await self._parse_javascript(metadata, content)
-            elif metadata.programming_language == 'markdown':
-                await self._parse_markdown(metadata, content)
-            elif metadata.programming_language == 'json':
-                await self._parse_json(metadata, content)
-            elif metadata.programming_language == 'yaml':
-                await self._parse_yaml(metadata, content)
-            elif metadata.programming_language in ['css', 'scss']:
-                await self._parse_css(metadata, content)
-            elif metadata.programming_language == 'html':
-                await self._parse_html(metadata, content)
-            else:
-                # Generic text parsing
-                await self._parse_generic_code(metadata, content)
+            # Unlisted languages get generic text parsing
+            parse = self._language_parsers.get(metadata.programming_language, self._parse_generic_code)
+            parse(metadata, content)
                 
         except Exception as e:
             logger.error(f"Failed to parse {metadata.programming_language} content: {e}")
     
-    async def _parse_python(self, metadata: FileMetadata, content: str):
+    def _parse_python(self, metadata: FileMetadata, content: str):
         """Parse Python source code"""
         try:
             # Parse AST
             tree = ast.parse(content)
             
-            # Extract functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    func_info = {
-                        'name': node.name,
-                        'line': node.lineno,
-                        'args': [arg.arg for arg in node.args.args],
-                        'docstring': ast.get_docstring(node)
-                    }
-                    metadata.functions.append(func_info)
-                
-                elif isinstance(node, ast.ClassDef):
-                    class_info = {
-                        'name': node.name,
-                        'line': node.lineno,
-                        'bases': [base.id if isinstance(base, ast.Name) else str(base) 
-                                for base in node.bases],
-                        'docstring': ast.get_docstring(node)
-                    }
-                    metadata.classes.append(class_info)
-                
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            metadata.imports.append(alias.name)
-                    else:
-                        module = node.module or ''
-                        for alias in node.names:
-                            metadata.imports.append(f"{module}.{alias.name}")
-            
-            # Extract comments
-            metadata.comments = re.findall(r'#\s*(.+)', content)
+            # One traversal; NodeVisitor dispatches each node type to its visit_* method
+            visitor = _PythonMetadataVisitor(metadata)
+            visitor.visit(tree)
+            
+            # Extract comments from the tokenizer rather than regex, so '#' inside strings is skipped;
+            # a source without any '#' has no comments and needs no second pass
+            if '#' in content:
+                metadata.comments = [
+                    text for text in (
+                        token.string[1:].strip()
+                        for token in tokenize.generate_tokens(io.StringIO(content).readline)
+                        if token.type == tokenize.COMMENT
+                    )
+                    if text
+                ]
             
             # Extract dependencies from common patterns
-            metadata.dependencies = list(set(metadata.imports))
+            metadata.dependencies = list(visitor.dependencies)
             
         except SyntaxError as e:
             logger.warning(f"Python syntax error in {metadata.file_name}: {e}")
         except Exception as e:
             logger.error(f"Failed to parse Python code: {e}")
     
-    async def _parse_javascript(self, metadata: FileMetadata, content: str):
+    def _parse_javascript(self, metadata: FileMetadata, content: str):
         """Parse JavaScript/TypeScript source code"""
         try:
             # Extract function declarations
-            func_pattern = r'(?:function\s+(\w+)|(\w+)\s*:\s*function|(\w+)\s*=\s*(?:function|\(.*?\)\s*=>))'
-            functions = re.findall(func_pattern, content)
+            functions = _JS_FUNCTION_RE.findall(content)
             metadata.functions = [{'name': f[0] or f[1] or f[2]} for f in functions if any(f)]
             
             # Extract class declarations
-            class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?'
-            classes = re.findall(class_pattern, content)
+            classes = _JS_CLASS_RE.findall(content)
             metadata.classes = [{'name': c[0], 'extends': c[1]} for c in classes]
             
             # Extract imports/requires
-            import_patterns = [
-                r'import\s+.*?\s+from\s+[\'"](.+?)[\'"]',
-                r'require\([\'"](.+?)[\'"]\)',
-                r'import\s+[\'"](.+?)[\'"]'
-            ]
-            
-            for pattern in import_patterns:
-                imports = re.findall(pattern, content)
-                metadata.imports.extend(imports)
+            for pattern in _JS_IMPORT_RES:
+                metadata.imports.extend(pattern.findall(content))
             
             # Extract comments
-            metadata.comments = re.findall(r'//\s*(.+)', content)
-            metadata.comments.extend(re.findall(r'/\*\s*(.+?)\s*\*/', content, re.DOTALL))
+            metadata.comments = _LINE_COMMENT_RE.findall(content)
+            metadata.comments.extend(_BLOCK_COMMENT_RE.findall(content))
             
             metadata.dependencies = list(set(metadata.imports))
             
         except Exception as e:
             logger.error(f"Failed to parse JavaScript code: {e}")
     
-    async def _parse_markdown(self, metadata: FileMetadata, content: str):
+    def _parse_markdown(self, metadata: FileMetadata, content: str):
         """Parse Markdown documentation"""
         try:
             # Extract headings
-            headings = re.findall(r'^(#{1,6})\s+(.+)', content, re.MULTILINE)
+            headings = _MD_HEADING_RE.findall(content)
             metadata.headings = [{'level': len(h[0]), 'text': h[1]} for h in headings]
             
             # Extract links
-            links = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content)
+            links = _MD_LINK_RE.findall(content)
             metadata.links = [{'text': l[0], 'url': l[1]} for l in links]
             
             # Extract images
-            images = re.findall(r'!\[([^\]]*)\]\(([^)]+)\)', content)
+            images = _MD_IMAGE_RE.findall(content)
             metadata.images = [{'alt': i[0], 'src': i[1]} for i in images]
             
         except Exception as e:
             logger.error(f"Failed to parse Markdown: {e}")
     
-    async def _parse_json(self, metadata: FileMetadata, content: str):
+    def _parse_json(self, metadata: FileMetadata, content: str):
         """Parse JSON configuration files"""
         try:
-            data = json.loads(content)
+            try:
+                data = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # orjson rejects the NaN/Infinity literals and integers wider than 64 bits that the stdlib parser accepts
+                data = json.loads(content)
             metadata.config_values = data
             metadata.config_keys = list(self._flatten_json_keys(data))
             
@@ -323,10 +531,11 @@ class ArtifactParser:
         except Exception as e:
             logger.error(f"Failed to parse JSON: {e}")
     
-    async def _parse_yaml(self, metadata: FileMetadata, content: str):
+    def _parse_yaml(self, metadata: FileMetadata, content: str):
         """Parse YAML configuration files"""
+        yaml, loader = _import_yaml()
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=loader)
             if isinstance(data, dict):
                 metadata.config_values = data
                 metadata.config_keys = list(self._flatten_json_keys(data))
@@ -336,116 +545,101 @@ class ArtifactParser:
         except Exception as e:
             logger.error(f"Failed to parse YAML: {e}")
     
-    async def _parse_css(self, metadata: FileMetadata, content: str):
+    def _parse_css(self, metadata: FileMetadata, content: str):
         """Parse CSS/SCSS stylesheets"""
         try:
             # Extract CSS rules
-            selectors = re.findall(r'([^{]+)\s*{', content)
+            selectors = _CSS_SELECTOR_RE.findall(content)
             metadata.config_keys = [s.strip() for s in selectors]
             
             # Extract comments
-            metadata.comments = re.findall(r'/\*\s*(.+?)\s*\*/', content, re.DOTALL)
+            metadata.comments = _BLOCK_COMMENT_RE.findall(content)
             
         except Exception as e:
             logger.error(f"Failed to parse CSS: {e}")
     
-    async def _parse_html(self, metadata: FileMetadata, content: str):
+    def _parse_html(self, metadata: FileMetadata, content: str):
         """Parse HTML files"""
         try:
             # Extract images
-            images = re.findall(r'<img[^>]+src=[\'"]([^"\']+)[\'"][^>]*>', content)
+            images = _HTML_IMAGE_RE.findall(content)
             metadata.images = [{'src': img} for img in images]
             
             # Extract links
-            links = re.findall(r'<a[^>]+href=[\'"]([^"\']+)[\'"][^>]*>([^<]*)</a>', content)
+            links = _HTML_LINK_RE.findall(content)
             metadata.links = [{'url': l[0], 'text': l[1]} for l in links]
             
         except Exception as e:
             logger.error(f"Failed to parse HTML: {e}")
     
-    async def _parse_generic_code(self, metadata: FileMetadata, content: str):
+    def _parse_generic_code(self, metadata: FileMetadata, content: str):
         """Generic parsing for unknown file types"""
         try:
             # Extract simple patterns that might indicate structure
             lines = content.split('\n')
             
             # Look for function-like patterns
-            func_patterns = [
-                r'def\s+(\w+)',  # Python-style
-                r'function\s+(\w+)',  # JS-style
-                r'(\w+)\s*\([^)]*\)\s*{',  # C-style
-            ]
-            
-            for pattern in func_patterns:
-                functions = re.findall(pattern, content)
+            for pattern in _GENERIC_FUNCTION_RES:
+                functions = pattern.findall(content)
                 metadata.functions.extend([{'name': f} for f in functions])
             
             # Extract comment-like patterns
-            comment_patterns = [
-                r'//\s*(.+)',  # C-style
-                r'#\s*(.+)',   # Python-style
-                r'/\*\s*(.+?)\s*\*/',  # Block comments
-            ]
-            
-            for pattern in comment_patterns:
-                comments = re.findall(pattern, content, re.DOTALL)
-                metadata.comments.extend(comments)
+            for pattern in _GENERIC_COMMENT_RES:
+                metadata.comments.extend(pattern.findall(content))
             
         except Exception as e:
             logger.error(f"Failed to parse generic code: {e}")
     
-    def _flatten_json_keys(self, data: Dict, prefix: str = '') -> List[str]:
-        """Flatten nested JSON keys"""
-        keys = []
-        for key, value in data.items():
-            full_key = f"{prefix}.{key}" if prefix else key
-            keys.append(full_key)
-            
-            if isinstance(value, dict):
-                keys.extend(self._flatten_json_keys(value, full_key))
-        
-        return keys
+    def _flatten_json_keys(self, data: Dict, prefix: str = '') -> Iterator[str]:
+        """Yield nested JSON keys depth-first, using an explicit stack instead of recursion"""
+        # Each frame holds a live iterator, so keys come out in document order
+        stack = [(iter(data.items()), prefix)]
+        while stack:
+            items, prefix = stack[-1]
+            for key, value in items:
+                full_key = f"{prefix}.{key}" if prefix else key
+                yield full_key
+                
+                if isinstance(value, dict):
+                    stack.append((iter(value.items()), full_key))
+                    break
+            else:
+                stack.pop()
     
     def get_suggested_wdo_classes(self, metadata: FileMetadata) -> List[str]:
         """Suggest appropriate WDO classes for the parsed file"""
-        suggestions = []
-        
-        # Map file types to WDO classes
-        language_mapping = {
-            'python': 'PythonSourceCodeFile',
-            'javascript': 'JavaScriptSourceCodeFile', 
-            'typescript': 'TypeScriptSourceCodeFile',
-            'react': 'ReactSourceCodeFile',
-            'java': 'JavaSourceCodeFile',
-            'cpp': 'CppSourceCodeFile',
-            'c': 'CSourceCodeFile',
-            'css': 'CSSFile',
-            'scss': 'SCSSFile', 
-            'html': 'HTMLFile',
-            'markdown': 'DocumentationFile',
-            'json': 'ConfigurationFile',
-            'yaml': 'ConfigurationFile',
-            'image': 'AssetFile'
-        }
-        
-        # Primary class based on language
-        if metadata.programming_language in language_mapping:
-            suggestions.append(language_mapping[metadata.programming_language])
-        
-        # Always include generic classes
-        suggestions.extend([
-            'DigitalInformationCarrier',
-            'InformationContentEntity'
-        ])
-        
-        # Add specific classes based on content analysis
-        if metadata.functions:
-            suggestions.append('FunctionDefinitionContent')
-        
-        if metadata.classes:
-            suggestions.append('ClassDefinitionContent')
-        
-        if metadata.config_keys:
-            suggestions.append('ConfigurationContent')
-        
-        return list(set(suggestions)) 
\ No newline at end of file
+        return list(_suggestions_for(
+            metadata.programming_language,
+            bool(metadata.functions),
+            bool(metadata.classes),
+            bool(metadata.config_keys)
+        ))
+
+
+def _sync_parse(file_path: str, content: Optional[bytes]) -> FileMetadata:
+    """Top-level (picklable) entry point for parsing a file in the parser pool"""
+    return ArtifactParser()._parse_file_sync(file_path, content)
+
+def _init_parser_worker(log_level: int):
+    """Give spawned workers the app's log level, since they do not run its logging setup"""
+    logging.basicConfig(level=log_level)
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    """Create the parser pool on first use"""
+    global _parser_pool
+    if _parser_pool is None:
+        # Workers are spawned rather than forked, so they never inherit the event loop or its threads
+        _parser_pool = ProcessPoolExecutor(
+            max_workers=PARSER_POOL_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_parser_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(),)
+        )
+    return _parser_pool
+
+def shutdown_parser_pool():
+    """Stop the parser pool's worker processes, if it was ever started"""
+    global _parser_pool
+    if _parser_pool is not None:
+        _parser_pool.shutdown(wait=True, cancel_futures=True)
+        _parser_pool = None
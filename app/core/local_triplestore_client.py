@@ -0,0 +1,174 @@
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Any, Tuple
+from rdflib import Graph
+import pyoxigraph as ox
+from app.config import settings
+from app.utils.cache import clear_query_caches
+from app.utils.rdf_terms import to_json_term, to_oxigraph, to_rdflib
+
+logger = logging.getLogger(__name__)
+
+class LocalTriplestoreClient:
+    """In-process pyoxigraph store exposing the same interface as TriplestoreClient"""
+    
+    def __init__(self):
+        self.repository = settings.TRIPLESTORE_REPOSITORY
+        self.sparql_endpoint = f"local:{settings.TRIPLESTORE_LOCAL_PATH or 'memory'}"
+        self.store = ox.Store(settings.TRIPLESTORE_LOCAL_PATH) if settings.TRIPLESTORE_LOCAL_PATH else ox.Store()
+    
+    async def startup(self):
+        """No connections to open for the in-process store"""
+    
+    async def aclose(self):
+        """No connections to close for the in-process store"""
+    
+    async def warm_pool(self, connections: int = 8) -> int:
+        """No connection pool to warm for the in-process store"""
+        return 0
+    
+    async def test_connection(self) -> bool:
+        """The in-process store is always reachable"""
+        return True
+    
+    async def repository_exists(self) -> bool:
+        """The in-process store is its own repository"""
+        return True
+    
+    async def create_repository(self) -> bool:
+        """Nothing to create for the in-process store"""
+        return True
+    
+    async def initialize(self) -> bool:
+        """Initialize the in-process store"""
+        logger.info(f"Using local pyoxigraph triplestore ({self.sparql_endpoint})")
+        return True
+    
+    async def add_triples(self, triples: List[Tuple]) -> bool:
+        """Add RDF triples to the store"""
+        return await self.add_triples_bulk([triples])
+    
+    async def add_triples_bulk(self, triple_lists: Iterable[List[Tuple]]) -> bool:
+        """Add several lists of RDF triples to the store in one call"""
+        try:
+            triples = [triple for triple_list in triple_lists for triple in triple_list]
+            self.store.extend(
+                ox.Quad(to_oxigraph(s), to_oxigraph(p), to_oxigraph(o), ox.DefaultGraph())
+                for s, p, o in triples
+            )
+            clear_query_caches()
+            logger.info(f"Added {len(triples)} triples successfully")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error adding triples: {e}")
+            return False
+    
+    async def add_triples_stream(self, triples: Iterable[Tuple]) -> bool:
+        """Add RDF triples from an iterable without collecting them into a list first"""
+        try:
+            triple_count = 0
+            
+            def quads():
+                nonlocal triple_count
+                for s, p, o in triples:
+                    triple_count += 1
+                    yield ox.Quad(to_oxigraph(s), to_oxigraph(p), to_oxigraph(o), ox.DefaultGraph())
+            
+            self.store.extend(quads())
+            clear_query_caches()
+            logger.info(f"Added {triple_count} triples successfully")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error adding triples: {e}")
+            return False
+    
+    async def update(self, sparql_update: str) -> bool:
+        """Execute a SPARQL UPDATE request (one or more ';'-separated operations)"""
+        try:
+            self.store.update(sparql_update)
+            clear_query_caches()
+            logger.info("SPARQL update executed successfully")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error executing SPARQL update: {e}")
+            return False
+    
+    async def query(self, sparql_query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Execute SPARQL SELECT/ASK query, returning SPARQL JSON results (the embedded store is never cached)"""
+        try:
+            solutions = self.store.query(sparql_query)
+            
+            if isinstance(solutions, bool):
+                return {'head': {}, 'boolean': solutions}
+            
+            variables = [variable.value for variable in solutions.variables]
+            bindings = []
+            for solution in solutions:
+                binding = {}
+                for index, name in enumerate(variables):
+                    term = solution[index]
+                    if term is not None:
+                        binding[name] = to_json_term(term)
+                bindings.append(binding)
+            
+            logger.info(f"SPARQL query executed successfully, {len(bindings)} results")
+            return {'head': {'vars': variables}, 'results': {'bindings': bindings}}
+        
+        except Exception as e:
+            logger.error(f"SPARQL query failed: {e}")
+            raise Exception(f"SPARQL query failed: {e}")
+    
+    async def query_stream(self, sparql_query: str) -> AsyncIterator[Dict[str, Dict[str, str]]]:
+        """Execute SPARQL SELECT query, yielding result bindings one row at a time"""
+        try:
+            solutions = self.store.query(sparql_query)
+            variables = [variable.value for variable in solutions.variables]
+        except Exception as e:
+            logger.error(f"SPARQL query failed: {e}")
+            raise Exception(f"SPARQL query failed: {e}")
+        
+        for solution in solutions:
+            binding = {}
+            for index, name in enumerate(variables):
+                term = solution[index]
+                if term is not None:
+                    binding[name] = to_json_term(term)
+            yield binding
+    
+    async def construct_query(self, sparql_query: str) -> Graph:
+        """Execute SPARQL CONSTRUCT query"""
+        try:
+            graph = Graph()
+            for triple in self.store.query(sparql_query):
+                graph.add((to_rdflib(triple.subject), to_rdflib(triple.predicate), to_rdflib(triple.object)))
+            
+            logger.info(f"SPARQL CONSTRUCT query executed successfully, {len(graph)} triples")
+            return graph
+        
+        except Exception as e:
+            logger.error(f"SPARQL CONSTRUCT query failed: {e}")
+            raise Exception(f"SPARQL CONSTRUCT query failed: {e}")
+    
+    async def clear_repository(self) -> bool:
+        """Clear all data from the store"""
+        self.store.clear()
+        clear_query_caches()
+        logger.info("Repository cleared successfully")
+        return True
+    
+    async def get_repository_stats(self) -> Dict[str, Any]:
+        """Get repository statistics"""
+        return {
+            'repository': self.repository,
+            'endpoint': self.sparql_endpoint,
+            'triple_count': len(self.store),
+            'status': 'connected'
+        }
+    
+    async def get_status_bundle(self) -> Dict[str, Any]:
+        """Get connectivity, repository existence and statistics in one call"""
+        stats = await self.get_repository_stats()
+        stats['graph_count'] = sum(1 for _ in self.store.named_graphs())
+        return {'connected': True, 'repository_exists': True, 'stats': stats}
@@ -1,33 +1,121 @@
+import asyncio
+import gzip
+import hashlib
 import logging
-from typing import Dict, List, Set, Tuple, Optional
+import mmap
+import orjson
+import os
+from typing import Dict, FrozenSet, List, Set, Tuple, Optional
 from pathlib import Path
 from rdflib import Graph, Namespace, URIRef, Literal, BNode
-from rdflib.namespace import RDF, RDFS, OWL
+from rdflib.namespace import RDF, RDFS, OWL, XSD
 import owlrl
+import pyoxigraph as ox
 from app.config import settings
+from app.utils.rdf_terms import to_rdflib
 
 logger = logging.getLogger(__name__)
 
+# Map file extensions to likely WDO classes (local names)
+_EXTENSION_CLASSES: Dict[str, Tuple[str, ...]] = {
+    '.py': ('PythonSourceCodeFile',),
+    '.js': ('JavaScriptSourceCodeFile',),
+    '.ts': ('TypeScriptSourceCodeFile',),
+    '.jsx': ('ReactSourceCodeFile',),
+    '.tsx': ('ReactSourceCodeFile',),
+    '.java': ('JavaSourceCodeFile',),
+    '.cpp': ('CppSourceCodeFile',),
+    '.c': ('CSourceCodeFile',),
+    '.css': ('CSSFile',),
+    '.scss': ('SCSSFile',),
+    '.html': ('HTMLFile',),
+    '.md': ('DocumentationFile',),
+    '.txt': ('DocumentationFile',),
+    '.json': ('ConfigurationFile',),
+    '.yml': ('ConfigurationFile',),
+    '.yaml': ('ConfigurationFile',),
+    '.svg': ('AssetFile',),
+    '.png': ('AssetFile',),
+    '.jpg': ('AssetFile',),
+    '.jpeg': ('AssetFile',)
+}
+
+# Extensions that also get the generic SourceCodeFile class
+_CODE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c'})
+
+def _encode_term(term) -> List[Optional[str]]:
+    """Encode an rdflib term as a plain JSON list for the closure cache"""
+    if isinstance(term, Literal):
+        return ["l", str(term), str(term.datatype) if term.datatype else None, term.language]
+    if isinstance(term, BNode):
+        return ["b", str(term)]
+    return ["u", str(term)]
+
+def _decode_term(data: List[Optional[str]]):
+    """Rebuild an rdflib term written by _encode_term"""
+    kind = data[0]
+    if kind == "u":
+        return URIRef(data[1])
+    if kind == "b":
+        return BNode(data[1])
+    if kind == "l":
+        return Literal(data[1], datatype=data[2], lang=data[3])
+    raise ValueError(f"Unknown term kind in closure cache: {kind!r}")
+
 class OntologyManager:
     """Manages the Web Development Ontology (WDO) and related operations"""
     
     def __init__(self):
-        self.graph = Graph()
         self.WDO = Namespace(settings.WDO_NAMESPACE)
         self.SBEKMS = Namespace(settings.INSTANCE_NAMESPACE)
+        self.graph = self._new_graph()
         
-        # Bind common namespaces
-        self.graph.bind("wdo", self.WDO)
-        self.graph.bind("sbekms", self.SBEKMS)
-        self.graph.bind("rdf", RDF)
-        self.graph.bind("rdfs", RDFS)
-        self.graph.bind("owl", OWL)
+        # Serializes loads; the graph is built off the loop and only swapped in while holding it
+        self._load_lock = asyncio.Lock()
         
         self.loaded = False
-        self.classes = set()
-        self.properties = set()
-        self.object_properties = set()
-        self.datatype_properties = set()
+        # Frozen once extracted; the ontology does not change after load
+        self.classes: FrozenSet[URIRef] = frozenset()
+        self.properties: FrozenSet[URIRef] = frozenset()
+        self.object_properties: FrozenSet[URIRef] = frozenset()
+        self.datatype_properties: FrozenSet[URIRef] = frozenset()
+        
+        # Direct subclasses per class and the class tree, precomputed at load time
+        self._subclasses: Dict[URIRef, List[URIRef]] = {}
+        self._class_hierarchy: Optional[Dict] = None
+        
+        # Sorted class/property listings, built on first request after each extraction
+        self._class_list: Optional[List[Dict]] = None
+        self._property_list: Optional[List[Dict]] = None
+        
+        # Label/comment/superclass/domain/range per resource, filled by _build_metadata_index
+        self._labels: Dict[URIRef, str] = {}
+        self._comments: Dict[URIRef, str] = {}
+        self._superclasses: Dict[URIRef, List[str]] = {}
+        # Classes with at least one WDO-namespace superclass, i.e. not hierarchy roots
+        self._wdo_subclasses: FrozenSet[URIRef] = frozenset()
+        self._domains: Dict[URIRef, List[str]] = {}
+        self._ranges: Dict[URIRef, List[str]] = {}
+        
+        # The same domains/ranges as URIRef sets, for hashed intersection in validate_triple
+        self._domain_index: Dict[URIRef, FrozenSet[URIRef]] = {}
+        self._range_index: Dict[URIRef, FrozenSet[URIRef]] = {}
+        
+        # rdf:type closure per resource, filled by _extract_ontology_structure so validation never pattern-matches the graph
+        self._types: Dict[URIRef, FrozenSet[URIRef]] = {}
+        
+        # Digest of the loaded ontology file, used as the ETag of ontology listings
+        self.version_hash: Optional[str] = None
+        
+        # Full suggestion list per extension, as URI strings, for suggest_classes_for_file
+        carrier = str(self.WDO.DigitalInformationCarrier)
+        self._default_suggestions: Tuple[str, ...] = (carrier,)
+        self._extension_suggestions: Dict[str, Tuple[str, ...]] = {
+            extension: tuple(str(self.WDO[name]) for name in names)
+                + ((str(self.WDO.SourceCodeFile),) if extension in _CODE_EXTENSIONS else ())
+                + (carrier,)
+            for extension, names in _EXTENSION_CLASSES.items()
+        }
     
     async def load_ontology(self) -> bool:
         """Load the WDO ontology from file"""
@@ -38,17 +126,21 @@ class OntologyManager:
                 logger.error(f"Ontology file not found: {ontology_path}")
                 return False
             
-            logger.info(f"Loading ontology from: {ontology_path}")
-            self.graph.parse(str(ontology_path), format="xml")
-            
-            # Apply OWL reasoning
-            logger.info("Applying OWL reasoning...")
-            owlrl.DeductiveClosure(owlrl.OWLRL_Semantics).expand(self.graph)
-            
-            # Extract ontology structure
-            await self._extract_ontology_structure()
-            
-            self.loaded = True
+            async with self._load_lock:
+                logger.info(f"Loading ontology from: {ontology_path}")
+                # Parsing and OWL-RL reasoning are CPU-bound; build a fresh graph off the event loop
+                # so requests keep reading the current one until it is replaced
+                graph, version_hash = await asyncio.to_thread(self._load_graph, ontology_path)
+                self.graph = graph
+                self.version_hash = version_hash
+                
+                # Extract ontology structure
+                await self._extract_ontology_structure()
+                
+                # Build the class tree once instead of traversing the graph per request
+                self._class_hierarchy = self._build_class_hierarchy()
+                
+                self.loaded = True
             logger.info(f"Ontology loaded successfully: {len(self.graph)} triples, "
                        f"{len(self.classes)} classes, {len(self.properties)} properties")
             return True
@@ -57,25 +149,113 @@ class OntologyManager:
             logger.error(f"Failed to load ontology: {e}")
             return False
     
+    def _new_graph(self) -> Graph:
+        """Create an empty graph with the common namespaces bound"""
+        graph = Graph()
+        graph.bind("wdo", self.WDO)
+        graph.bind("sbekms", self.SBEKMS)
+        graph.bind("rdf", RDF)
+        graph.bind("rdfs", RDFS)
+        graph.bind("owl", OWL)
+        return graph
+    
+    def _load_graph(self, ontology_path: Path) -> Tuple[Graph, str]:
+        """Build a new graph holding the ontology's OWL-RL closure, from the closure cache when possible, and the file's digest"""
+        graph = self._new_graph()
+        
+        # Map the file once: hashing and the Rust parser both read the mapped pages without a Python-side copy
+        with open(ontology_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as ontology_data:
+            version_hash = hashlib.blake2b(ontology_data, digest_size=8).hexdigest()
+            
+            # The closure depends only on the ontology file and the owlrl version
+            closure_hash = hashlib.sha256(ontology_data)
+            closure_hash.update(owlrl.__version__.encode())
+            closure_path = ontology_path.with_name(f"{ontology_path.stem}.closure.{closure_hash.hexdigest()[:16]}.json.gz")
+            
+            if not self._load_closure(graph, closure_path):
+                self._parse_rdf_xml(graph, ontology_path, ontology_data)
+                
+                # Apply OWL reasoning
+                logger.info("Applying OWL reasoning...")
+                owlrl.DeductiveClosure(owlrl.OWLRL_Semantics).expand(graph)
+                self._save_closure(graph, closure_path)
+        
+        return graph, version_hash
+    
+    def _parse_rdf_xml(self, graph: Graph, ontology_path: Path, source=None):
+        """Parse RDF/XML (from source if given, else the path) into graph with pyoxigraph's Rust parser, falling back to rdflib's pure-Python one"""
+        try:
+            triples = []
+            for triple in ox.parse(str(ontology_path) if source is None else source, "application/rdf+xml", base_iri=ontology_path.resolve().as_uri()):
+                obj = to_rdflib(triple.object)
+                # rdflib keeps plain literals untyped; pyoxigraph reports them as xsd:string
+                if isinstance(obj, Literal) and obj.datatype == XSD.string:
+                    obj = Literal(str(obj))
+                triples.append((to_rdflib(triple.subject), to_rdflib(triple.predicate), obj))
+        except Exception as e:
+            logger.warning(f"Fast RDF/XML parse failed, using rdflib parser: {e}")
+            graph.parse(str(ontology_path), format="xml")
+            return
+        
+        for triple in triples:
+            graph.add(triple)
+    
+    def _load_closure(self, graph: Graph, closure_path: Path) -> bool:
+        """Load a previously materialized OWL-RL closure into graph, if one is cached"""
+        if not closure_path.exists():
+            return False
+        
+        try:
+            with gzip.open(closure_path, 'rb') as f:
+                triples = [tuple(map(_decode_term, triple)) for triple in orjson.loads(f.read())]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ontology closure cache {closure_path}: {e}")
+            return False
+        
+        for triple in triples:
+            graph.add(triple)
+        logger.info(f"Loaded cached OWL-RL closure from: {closure_path}")
+        return True
+    
+    def _save_closure(self, graph: Graph, closure_path: Path):
+        """Write the materialized closure atomically, as JSON terms since OWL-RL adds literal-subject triples N-Triples cannot hold"""
+        tmp_path = closure_path.with_name(f"{closure_path.name}.{os.getpid()}.tmp")
+        try:
+            data = orjson.dumps([[_encode_term(term) for term in triple] for triple in graph])
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, closure_path)
+        except Exception as e:
+            logger.warning(f"Could not cache ontology closure at {closure_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
     async def _extract_ontology_structure(self):
         """Extract classes and properties from the ontology"""
         try:
-            # Extract classes
-            for cls in self.graph.subjects(RDF.type, OWL.Class):
-                if isinstance(cls, URIRef):
-                    self.classes.add(cls)
+            # One pass over rdf:type collects classes, properties and the type index used by validate_triple
+            classes, object_properties, datatype_properties = set(), set(), set()
+            types: Dict[URIRef, Set[URIRef]] = {}
+            for resource, rdf_type in self.graph.subject_objects(RDF.type):
+                types.setdefault(resource, set()).add(rdf_type)
+                if not isinstance(resource, URIRef):
+                    continue
+                
+                if rdf_type == OWL.Class:
+                    classes.add(resource)
+                elif rdf_type == OWL.ObjectProperty:
+                    object_properties.add(resource)
+                elif rdf_type == OWL.DatatypeProperty:
+                    datatype_properties.add(resource)
             
-            # Extract object properties
-            for prop in self.graph.subjects(RDF.type, OWL.ObjectProperty):
-                if isinstance(prop, URIRef):
-                    self.object_properties.add(prop)
-                    self.properties.add(prop)
+            self.classes = frozenset(classes)
+            self.object_properties = frozenset(object_properties)
+            self.datatype_properties = frozenset(datatype_properties)
+            self.properties = self.object_properties | self.datatype_properties
+            self._class_list = None
+            self._property_list = None
+            self._types = {resource: frozenset(values) for resource, values in types.items()}
             
-            # Extract datatype properties
-            for prop in self.graph.subjects(RDF.type, OWL.DatatypeProperty):
-                if isinstance(prop, URIRef):
-                    self.datatype_properties.add(prop)
-                    self.properties.add(prop)
+            self._build_metadata_index()
             
             logger.info(f"Extracted {len(self.classes)} classes and {len(self.properties)} properties")
             
@@ -87,6 +267,9 @@ class OntologyManager:
         if not self.loaded:
             return []
         
+        if self._class_list is not None:
+            return self._class_list
+        
         classes_info = []
         for cls in self.classes:
             class_info = {
@@ -98,13 +281,17 @@ class OntologyManager:
             }
             classes_info.append(class_info)
         
-        return sorted(classes_info, key=lambda x: x['local_name'])
+        self._class_list = sorted(classes_info, key=lambda x: x['local_name'])
+        return self._class_list
     
     def get_properties(self) -> List[Dict]:
         """Get all ontology properties with their metadata"""
         if not self.loaded:
             return []
         
+        if self._property_list is not None:
+            return self._property_list
+        
         properties_info = []
         for prop in self.properties:
             prop_info = {
@@ -118,41 +305,67 @@ class OntologyManager:
             }
             properties_info.append(prop_info)
         
-        return sorted(properties_info, key=lambda x: x['local_name'])
+        self._property_list = sorted(properties_info, key=lambda x: x['local_name'])
+        return self._property_list
+    
+    def _build_metadata_index(self):
+        """Index labels, comments, subclass edges, domains and ranges in one scan per predicate"""
+        self._labels = {}
+        for resource, label in self.graph.subject_objects(RDFS.label):
+            self._labels.setdefault(resource, str(label))
+        
+        self._comments = {}
+        for resource, comment in self.graph.subject_objects(RDFS.comment):
+            self._comments.setdefault(resource, str(comment))
+        
+        self._subclasses = {}
+        self._superclasses = {}
+        wdo_subclasses = set()
+        for subclass, superclass in self.graph.subject_objects(RDFS.subClassOf):
+            if isinstance(superclass, URIRef):
+                self._superclasses.setdefault(subclass, []).append(str(superclass))
+                if superclass.startswith(settings.WDO_NAMESPACE):
+                    wdo_subclasses.add(subclass)
+            if isinstance(subclass, URIRef) and subclass != superclass:
+                self._subclasses.setdefault(superclass, []).append(subclass)
+        self._wdo_subclasses = frozenset(wdo_subclasses)
+        
+        self._domains = {}
+        for prop, domain in self.graph.subject_objects(RDFS.domain):
+            if isinstance(domain, URIRef):
+                self._domains.setdefault(prop, []).append(str(domain))
+        
+        self._ranges = {}
+        for prop, range_val in self.graph.subject_objects(RDFS.range):
+            if isinstance(range_val, URIRef):
+                self._ranges.setdefault(prop, []).append(str(range_val))
+        
+        self._domain_index = {prop: frozenset(map(URIRef, domains)) for prop, domains in self._domains.items()}
+        self._range_index = {prop: frozenset(map(URIRef, ranges)) for prop, ranges in self._ranges.items()}
     
     def _get_label(self, resource: URIRef) -> Optional[str]:
         """Get rdfs:label for a resource"""
-        labels = list(self.graph.objects(resource, RDFS.label))
-        return str(labels[0]) if labels else None
+        return self._labels.get(resource)
     
     def _get_comment(self, resource: URIRef) -> Optional[str]:
         """Get rdfs:comment for a resource"""
-        comments = list(self.graph.objects(resource, RDFS.comment))
-        return str(comments[0]) if comments else None
+        return self._comments.get(resource)
     
     def _get_subclass_relations(self, cls: URIRef) -> List[str]:
         """Get superclasses for a class"""
-        superclasses = []
-        for superclass in self.graph.objects(cls, RDFS.subClassOf):
-            if isinstance(superclass, URIRef):
-                superclasses.append(str(superclass))
-        return superclasses
+        return self._superclasses.get(cls, [])
     
     def _get_domain(self, prop: URIRef) -> List[str]:
         """Get domain classes for a property"""
-        domains = []
-        for domain in self.graph.objects(prop, RDFS.domain):
-            if isinstance(domain, URIRef):
-                domains.append(str(domain))
-        return domains
+        return self._domains.get(prop, [])
     
     def _get_range(self, prop: URIRef) -> List[str]:
         """Get range classes/datatypes for a property"""
-        ranges = []
-        for range_val in self.graph.objects(prop, RDFS.range):
-            if isinstance(range_val, URIRef):
-                ranges.append(str(range_val))
-        return ranges
+        return self._ranges.get(prop, [])
+    
+    def is_valid_predicate(self, predicate: URIRef) -> bool:
+        """Check whether a predicate is an object or datatype property of the ontology"""
+        return predicate in self.properties
     
     def validate_triple(self, subject: URIRef, predicate: URIRef, obj) -> bool:
         """Validate if a triple conforms to the ontology"""
@@ -161,25 +374,23 @@ class OntologyManager:
         
         try:
             # Check if predicate exists in ontology
-            if predicate not in self.properties:
+            if not self.is_valid_predicate(predicate):
                 logger.warning(f"Unknown property: {predicate}")
                 return False
             
             # Check domain restrictions
-            domains = self._get_domain(predicate)
+            domains = self._domain_index.get(predicate)
             if domains:
-                subject_types = list(self.graph.objects(subject, RDF.type))
-                if not any(str(domain) in [str(t) for t in subject_types] for domain in domains):
-                    logger.warning(f"Domain violation for {predicate}: subject {subject} not in domain {domains}")
+                if domains.isdisjoint(self._types.get(subject, ())):
+                    logger.warning(f"Domain violation for {predicate}: subject {subject} not in domain {self._get_domain(predicate)}")
                     return False
             
             # Check range restrictions for object properties
             if predicate in self.object_properties:
-                ranges = self._get_range(predicate)
+                ranges = self._range_index.get(predicate)
                 if ranges and isinstance(obj, URIRef):
-                    obj_types = list(self.graph.objects(obj, RDF.type))
-                    if not any(str(range_val) in [str(t) for t in obj_types] for range_val in ranges):
-                        logger.warning(f"Range violation for {predicate}: object {obj} not in range {ranges}")
+                    if ranges.isdisjoint(self._types.get(obj, ())):
+                        logger.warning(f"Range violation for {predicate}: object {obj} not in range {self._get_range(predicate)}")
                         return False
             
             return True
@@ -193,41 +404,47 @@ class OntologyManager:
         if not self.loaded:
             return {}
         
-        hierarchy = {}
+        if self._class_hierarchy is None:
+            self._class_hierarchy = self._build_class_hierarchy()
+        return self._class_hierarchy
+    
+    def _build_class_hierarchy(self) -> Dict:
+        """Build the class tree from the precomputed subclass index"""
+        # Subtrees are shared between parents; one cut short by a cycle depends on the path, so only complete ones are memoized
+        built: Dict[URIRef, Dict] = {}
+        visiting: Set[URIRef] = set()
         
-        def build_hierarchy(cls, visited=None):
-            if visited is None:
-                visited = set()
+        def build_hierarchy(cls) -> Tuple[Dict, bool]:
+            if cls in built:
+                return built[cls], False
+            if cls in visiting:
+                return {}, True
             
-            if cls in visited:
-                return {}
-            
-            visited.add(cls)
+            visiting.add(cls)
             
             class_name = cls.split('#')[-1] if '#' in str(cls) else cls.split('/')[-1]
             
             # Find subclasses
             subclasses = []
-            for subclass in self.graph.subjects(RDFS.subClassOf, cls):
-                if isinstance(subclass, URIRef) and subclass != cls:
-                    subclasses.append(build_hierarchy(subclass, visited.copy()))
+            truncated = False
+            for subclass in self._subclasses.get(cls, ()):
+                node, cut = build_hierarchy(subclass)
+                subclasses.append(node)
+                truncated = truncated or cut
             
-            return {
+            visiting.discard(cls)
+            node = {
                 'uri': str(cls),
                 'name': class_name,
                 'label': self._get_label(cls),
                 'subclasses': subclasses
             }
+            if not truncated:
+                built[cls] = node
+            return node, truncated
         
         # Find root classes (classes without superclasses in WDO namespace)
-        root_classes = []
-        for cls in self.classes:
-            superclasses = list(self.graph.objects(cls, RDFS.subClassOf))
-            wdo_superclasses = [sc for sc in superclasses 
-                              if isinstance(sc, URIRef) and str(sc).startswith(settings.WDO_NAMESPACE)]
-            
-            if not wdo_superclasses:
-                root_classes.append(build_hierarchy(cls))
+        root_classes = [build_hierarchy(cls)[0] for cls in self.classes if cls not in self._wdo_subclasses]
         
         return {
             'root_classes': root_classes,
@@ -235,46 +452,8 @@ class OntologyManager:
         }
     
     def suggest_classes_for_file(self, file_extension: str, file_name: str) -> List[str]:
-        """Suggest appropriate WDO classes for a given file"""
-        suggestions = []
-        
-        # Map file extensions to likely WDO classes
-        extension_mapping = {
-            '.py': [self.WDO.PythonSourceCodeFile],
-            '.js': [self.WDO.JavaScriptSourceCodeFile],
-            '.ts': [self.WDO.TypeScriptSourceCodeFile],
-            '.jsx': [self.WDO.ReactSourceCodeFile],
-            '.tsx': [self.WDO.ReactSourceCodeFile],
-            '.java': [self.WDO.JavaSourceCodeFile],
-            '.cpp': [self.WDO.CppSourceCodeFile],
-            '.c': [self.WDO.CSourceCodeFile],
-            '.css': [self.WDO.CSSFile],
-            '.scss': [self.WDO.SCSSFile],
-            '.html': [self.WDO.HTMLFile],
-            '.md': [self.WDO.DocumentationFile],
-            '.txt': [self.WDO.DocumentationFile],
-            '.json': [self.WDO.ConfigurationFile],
-            '.yml': [self.WDO.ConfigurationFile],
-            '.yaml': [self.WDO.ConfigurationFile],
-            '.svg': [self.WDO.AssetFile],
-            '.png': [self.WDO.AssetFile],
-            '.jpg': [self.WDO.AssetFile],
-            '.jpeg': [self.WDO.AssetFile]
-        }
-        
-        # Get suggestions based on file extension
-        if file_extension.lower() in extension_mapping:
-            suggestions.extend([str(cls) for cls in extension_mapping[file_extension.lower()]])
-        
-        # Add generic SourceCodeFile if it's a code file
-        code_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c']
-        if file_extension.lower() in code_extensions:
-            suggestions.append(str(self.WDO.SourceCodeFile))
-        
-        # Always add generic DigitalInformationCarrier
-        suggestions.append(str(self.WDO.DigitalInformationCarrier))
-        
-        return list(set(suggestions))  # Remove duplicates
+        """Suggest appropriate WDO classes for a given file, most specific first"""
+        return list(self._extension_suggestions.get(file_extension.lower(), self._default_suggestions))
     
     async def get_ontology_stats(self) -> Dict:
         """Get comprehensive ontology statistics"""
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from rdflib import  Literal, Namespace
 from rdflib.namespace import RDF, RDFS, XSD, DCTERMS
 
@@ -14,61 +14,106 @@ class SemanticAnnotator:
         self.WDO = Namespace(settings.WDO_NAMESPACE)
         self.SBEKMS = Namespace(settings.INSTANCE_NAMESPACE)
         
-    async def annotate_asset(self, metadata: Dict[str, Any], triplestore) -> int:
-        """Generate and store RDF triples for an asset"""
+    async def annotate_asset(self, metadata: Dict[str, Any], triplestore, batch_size: int = 500) -> int:
+        """Generate and store RDF triples for an asset, posting at most batch_size triples per request; all or nothing"""
+        committed = 0
         try:
-            triples = []
+            triples = self.build_asset_triples(metadata)
             
-            # Create asset URI
-            asset_uri = self.SBEKMS[f"asset_{metadata.get('id', 'unknown')}"]
+            # Store triples in bulk batches
+            for start in range(0, len(triples), batch_size):
+                batch = triples[start:start + batch_size]
+                if not await triplestore.add_triples(batch):
+                    logger.error(f"Failed to annotate asset: triplestore rejected batch at triple {start}")
+                    break
+                committed += len(batch)
+            else:
+                return len(triples)
             
-            # Basic asset triples
-            triples.append((asset_uri, RDF.type, self.WDO.DigitalInformationCarrier))
-            triples.append((asset_uri, RDFS.label, Literal(metadata.get("file_name", ""))))
-            
-            # File properties
-            if metadata.get("file_size"):
-                triples.append((asset_uri, self.WDO.hasFileSize, Literal(metadata["file_size"], datatype=XSD.integer)))
-            
-            if metadata.get("mime_type"):
-                triples.append((asset_uri, self.WDO.hasMimeType, Literal(metadata["mime_type"])))
-            
-            # Enhanced WDO types
-            wdo_classes = metadata.get("wdo_classes", [])
-            for wdo_class in wdo_classes:
-                if wdo_class != "DigitalInformationCarrier":  # Already added
-                    class_uri = self.WDO[wdo_class]
-                    triples.append((asset_uri, RDF.type, class_uri))
-            
-            # Content properties
-            if metadata.get("line_count"):
-                triples.append((asset_uri, self.WDO.hasLineCount, Literal(metadata["line_count"], datatype=XSD.integer)))
-            
-            # User metadata
-            if metadata.get("title"):
-                triples.append((asset_uri, DCTERMS.title, Literal(metadata["title"])))
-            
-            if metadata.get("description"):
-                triples.append((asset_uri, DCTERMS.description, Literal(metadata["description"])))
-            
-            if metadata.get("author"):
-                triples.append((asset_uri, DCTERMS.creator, Literal(metadata["author"])))
-            
-            # Tags
-            for tag in metadata.get("tags", []):
-                tag_uri = self.SBEKMS[f"tag_{tag.replace(' ', '_')}"]
-                triples.append((asset_uri, self.WDO.hasTag, tag_uri))
-                triples.append((tag_uri, RDF.type, self.WDO.Tag))
-                triples.append((tag_uri, RDFS.label, Literal(tag)))
+        except Exception as e:
+            logger.error(f"Failed to annotate asset: {e}")
+        
+        # Earlier batches are already stored; remove them so the asset is not left half-annotated
+        if committed:
+            await self._remove_asset_triples(metadata, triplestore)
+        return 0
+    
+    async def _remove_asset_triples(self, metadata: Dict[str, Any], triplestore):
+        """Delete every triple whose subject is the asset"""
+        asset_uri = self.SBEKMS[f"asset_{metadata.get('id', 'unknown')}"]
+        try:
+            if not await triplestore.update(f"DELETE WHERE {{ <{asset_uri}> ?p ?o }}"):
+                raise Exception("triplestore rejected the delete")
+            logger.info(f"Rolled back partial annotation of {asset_uri}")
+        except Exception as e:
+            logger.error(f"Failed to roll back partial annotation of {asset_uri}: {e}")
+    
+    async def annotate_assets_bulk(self, metadata_list: Iterable[Dict[str, Any]], triplestore) -> int:
+        """Generate and store RDF triples for many assets as one stream, without building per-asset lists"""
+        try:
+            triple_count = 0
             
-            # Temporal properties
-            if metadata.get("created_at"):
-                triples.append((asset_uri, DCTERMS.created, Literal(metadata["created_at"], datatype=XSD.dateTime)))
+            def counted_triples() -> Iterator[Tuple]:
+                nonlocal triple_count
+                for metadata in metadata_list:
+                    for triple in self.iter_asset_triples(metadata):
+                        triple_count += 1
+                        yield triple
             
-            # Store triples
-            success = await triplestore.add_triples(triples)
-            return len(triples) if success else 0
+            if not await triplestore.add_triples_stream(counted_triples()):
+                return 0
+            return triple_count
             
         except Exception as e:
-            logger.error(f"Failed to annotate asset: {e}")
-            return 0
\ No newline at end of file
+            logger.error(f"Failed to annotate assets: {e}")
+            return 0
+    
+    def build_asset_triples(self, metadata: Dict[str, Any]) -> List[Tuple]:
+        """Build the RDF triples describing one asset"""
+        return list(self.iter_asset_triples(metadata))
+    
+    def iter_asset_triples(self, metadata: Dict[str, Any]) -> Iterator[Tuple]:
+        """Yield the RDF triples describing one asset"""
+        # Create asset URI
+        asset_uri = self.SBEKMS[f"asset_{metadata.get('id', 'unknown')}"]
+        
+        # Basic asset triples
+        yield (asset_uri, RDF.type, self.WDO.DigitalInformationCarrier)
+        yield (asset_uri, RDFS.label, Literal(metadata.get("file_name", "")))
+        
+        # File properties
+        if metadata.get("file_size"):
+            yield (asset_uri, self.WDO.hasFileSize, Literal(metadata["file_size"], datatype=XSD.integer))
+        
+        if metadata.get("mime_type"):
+            yield (asset_uri, self.WDO.hasMimeType, Literal(metadata["mime_type"]))
+        
+        # Enhanced WDO types
+        for wdo_class in metadata.get("wdo_classes", []):
+            if wdo_class != "DigitalInformationCarrier":  # Already added
+                yield (asset_uri, RDF.type, self.WDO[wdo_class])
+        
+        # Content properties
+        if metadata.get("line_count"):
+            yield (asset_uri, self.WDO.hasLineCount, Literal(metadata["line_count"], datatype=XSD.integer))
+        
+        # User metadata
+        if metadata.get("title"):
+            yield (asset_uri, DCTERMS.title, Literal(metadata["title"]))
+        
+        if metadata.get("description"):
+            yield (asset_uri, DCTERMS.description, Literal(metadata["description"]))
+        
+        if metadata.get("author"):
+            yield (asset_uri, DCTERMS.creator, Literal(metadata["author"]))
+        
+        # Tags
+        for tag in metadata.get("tags", []):
+            tag_uri = self.SBEKMS[f"tag_{tag.replace(' ', '_')}"]
+            yield (asset_uri, self.WDO.hasTag, tag_uri)
+            yield (tag_uri, RDF.type, self.WDO.Tag)
+            yield (tag_uri, RDFS.label, Literal(tag))
+        
+        # Temporal properties
+        if metadata.get("created_at"):
+            yield (asset_uri, DCTERMS.created, Literal(metadata["created_at"], datatype=XSD.dateTime))
@@ -1,12 +1,38 @@
+import asyncio
+import hashlib
 import httpx
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from rdflib import Graph, Namespace
-from SPARQLWrapper import SPARQLWrapper, JSON, POST, DIGEST, TURTLE
+import orjson
+import re
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, List, Any, Optional, Tuple
+from rdflib import Graph, Literal, Namespace
 from app.config import settings
+from app.utils.cache import clear_query_caches, query_cache_generation, sparql_cache
 
 logger = logging.getLogger(__name__)
 
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+
+# Terms in SPARQL TSV results are written in Turtle syntax
+_TSV_LITERAL_RE = re.compile(r'^"((?:[^"\\]|\\.)*)"(?:@([A-Za-z0-9-]+)|\^\^<([^>]*)>)?$')
+_TSV_ESCAPE_RE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+_TSV_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', 'b': '\b', 'f': '\f'}
+_TSV_INTEGER_RE = re.compile(r'^[+-]?[0-9]+$')
+_TSV_DECIMAL_RE = re.compile(r'^[+-]?[0-9]*\.[0-9]+$')
+_TSV_DOUBLE_RE = re.compile(r'^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)[eE][+-]?[0-9]+$')
+
+# N-Triples literals are single-line; Literal.n3() would emit Turtle """long strings""" for multi-line text
+_NT_LITERAL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+# Triple and named-graph counts in a single query, for get_status_bundle
+STATUS_BUNDLE_QUERY = """
+SELECT ?triples ?graphs WHERE {
+    { SELECT (COUNT(*) AS ?triples) WHERE { ?s ?p ?o } }
+    { SELECT (COUNT(DISTINCT ?g) AS ?graphs) WHERE { GRAPH ?g { } } }
+}
+"""
+
 class TriplestoreClient:
     """Client for interacting with GraphDB triplestore"""
     
@@ -18,25 +44,55 @@ class TriplestoreClient:
         self.WDO = Namespace(settings.WDO_NAMESPACE)
         self.SBEKMS = Namespace(settings.INSTANCE_NAMESPACE)
         
-        # Initialize SPARQL wrapper
-        self.query_wrapper = SPARQLWrapper(f"{self.sparql_endpoint}")
-        self.query_wrapper.setReturnFormat(JSON)
-        
-        # Configure authentication if provided
-        if settings.TRIPLESTORE_USERNAME and settings.TRIPLESTORE_PASSWORD:
-            self.query_wrapper.setHTTPAuth(DIGEST)
-            self.query_wrapper.setCredentials(
-                settings.TRIPLESTORE_USERNAME, 
-                settings.TRIPLESTORE_PASSWORD
+        # One pooled HTTP client for every GraphDB request, created by startup() or on first use
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def _client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, so requests reuse pooled TCP/TLS connections"""
+        if self._http is None or self._http.is_closed:
+            auth = None
+            if settings.TRIPLESTORE_USERNAME and settings.TRIPLESTORE_PASSWORD:
+                auth = httpx.DigestAuth(settings.TRIPLESTORE_USERNAME, settings.TRIPLESTORE_PASSWORD)
+            
+            self._http = httpx.AsyncClient(
+                timeout=30.0,
+                auth=auth,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
             )
+        return self._http
+    
+    async def startup(self):
+        """Open the shared HTTP client"""
+        self._client()
+    
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def warm_pool(self, connections: int = 8) -> int:
+        """Open several keep-alive connections concurrently so the first requests skip the TCP/TLS handshake"""
+        client = self._client()
+        
+        async def ping() -> bool:
+            try:
+                # The protocol version is the smallest resource the server exposes
+                response = await client.get(f"{self.base_url}/protocol", timeout=5.0)
+                return response.status_code == 200
+            except Exception:
+                return False
+        
+        warmed = sum(await asyncio.gather(*(ping() for _ in range(connections))))
+        logger.info(f"Warmed {warmed}/{connections} triplestore connections")
+        return warmed
     
     async def test_connection(self) -> bool:
         """Test connection to GraphDB"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/rest/repositories")
-                logger.info(f"GraphDB connection test: {response.status_code}")
-                return response.status_code == 200
+            response = await self._client().get(f"{self.base_url}/rest/repositories", timeout=10.0)
+            logger.info(f"GraphDB connection test: {response.status_code}")
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to connect to GraphDB: {e}")
             return False
@@ -44,9 +100,8 @@ class TriplestoreClient:
     async def repository_exists(self) -> bool:
         """Check if the SBEKMS repository exists"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/rest/repositories/{self.repository}")
-                return response.status_code == 200
+            response = await self._client().get(f"{self.base_url}/rest/repositories/{self.repository}", timeout=10.0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to check repository existence: {e}")
             return False
@@ -78,15 +133,14 @@ class TriplestoreClient:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/rest/repositories",
-                    json=repository_config,
-                    headers={'Content-Type': 'application/json'}
-                )
-                logger.info(f"Repository creation response: {response.status_code}")
-                return response.status_code in [200, 201]
-                
+            response = await self._client().post(
+                f"{self.base_url}/rest/repositories",
+                json=repository_config,
+                headers={'Content-Type': 'application/json'}
+            )
+            logger.info(f"Repository creation response: {response.status_code}")
+            return response.status_code in [200, 201]
+            
         except Exception as e:
             logger.error(f"Failed to create repository: {e}")
             return False
@@ -119,62 +173,181 @@ class TriplestoreClient:
     
     async def add_triples(self, triples: List[Tuple]) -> bool:
         """Add RDF triples to the triplestore"""
+        return await self.add_triples_bulk([triples])
+    
+    async def add_triples_bulk(self, triple_lists: Iterable[List[Tuple]]) -> bool:
+        """Add several lists of RDF triples to the triplestore in a single request"""
         try:
-            if not triples:
+            chunks = []
+            triple_count = 0
+            for triples in triple_lists:
+                chunks.append(self._serialize_triples(triples))
+                triple_count += len(triples)
+            
+            if not triple_count:
                 return True
-                
-            # Convert triples to Turtle format
-            graph = Graph()
-            graph.bind("wdo", self.WDO)
-            graph.bind("sbekms", self.SBEKMS)
             
-            for triple in triples:
-                graph.add(triple)
+            response = await self._client().post(
+                self.update_endpoint,
+                headers={'Content-Type': 'application/n-triples'},
+                content=''.join(chunks).encode('utf-8')
+            )
             
-            turtle_data = graph.serialize(format='turtle')
+            success = response.status_code in [200, 204]
+            if success:
+                clear_query_caches()
+                logger.info(f"Added {triple_count} triples successfully")
+            else:
+                logger.error(f"Failed to add triples: {response.status_code} - {response.text}")
+            
+            return success
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.update_endpoint,
-                    headers={'Content-Type': 'text/turtle'},
-                    content=turtle_data
-                )
-                
-                success = response.status_code in [200, 204]
-                if success:
-                    logger.info(f"Added {len(triples)} triples successfully")
-                else:
-                    logger.error(f"Failed to add triples: {response.status_code} - {response.text}")
-                
-                return success
-                
         except Exception as e:
             logger.error(f"Error adding triples: {e}")
             return False
     
-    async def query(self, sparql_query: str) -> Dict[str, Any]:
-        """Execute SPARQL SELECT query"""
+    async def add_triples_stream(self, triples: Iterable[Tuple], chunk_size: int = 1000) -> bool:
+        """Add RDF triples from an iterable, uploading N-Triples in chunks while they are still being generated"""
+        triples = iter(triples)
+        first = next(triples, None)
+        if first is None:
+            return True
+        
+        triple_count = 0
+        
+        async def body() -> AsyncIterator[bytes]:
+            nonlocal triple_count
+            chunk = [first]
+            chunk.extend(islice(triples, chunk_size - 1))
+            while chunk:
+                triple_count += len(chunk)
+                yield self._serialize_triples(chunk).encode('utf-8')
+                chunk = list(islice(triples, chunk_size))
+        
+        try:
+            response = await self._client().post(
+                self.update_endpoint,
+                headers={'Content-Type': 'application/n-triples'},
+                content=body()
+            )
+            
+            success = response.status_code in [200, 204]
+            if success:
+                clear_query_caches()
+                logger.info(f"Added {triple_count} triples successfully")
+            else:
+                logger.error(f"Failed to add triples: {response.status_code} - {response.text}")
+            
+            return success
+            
+        except Exception as e:
+            logger.error(f"Error adding triples: {e}")
+            return False
+    
+    def _serialize_triples(self, triples: List[Tuple]) -> str:
+        """Write triples as N-Triples: no graph, prefix compaction or pretty-printing"""
+        return ''.join(f"{_nt_term(s)} {_nt_term(p)} {_nt_term(o)} .\n" for s, p, o in triples)
+    
+    async def update(self, sparql_update: str) -> bool:
+        """Execute a SPARQL UPDATE request (one or more ';'-separated operations)"""
+        try:
+            response = await self._client().post(
+                self.update_endpoint,
+                headers={'Content-Type': 'application/sparql-update'},
+                content=sparql_update
+            )
+            
+            success = response.status_code in [200, 204]
+            if success:
+                clear_query_caches()
+                logger.info("SPARQL update executed successfully")
+            else:
+                logger.error(f"SPARQL update failed: {response.status_code} - {response.text}")
+            
+            return success
+            
+        except Exception as e:
+            logger.error(f"Error executing SPARQL update: {e}")
+            return False
+    
+    async def query(self, sparql_query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Execute SPARQL SELECT query; cached results are shared between callers and must not be mutated"""
+        # The generation is part of the key, so results from before a write in this process are never served after it
+        cache_key = (query_cache_generation(), hashlib.blake2b(sparql_query.strip().encode('utf-8'), digest_size=16).digest())
+        if use_cache:
+            results = sparql_cache.get(cache_key)
+            if results is not None:
+                return results
+        
         try:
-            self.query_wrapper.setQuery(sparql_query)
-            self.query_wrapper.setReturnFormat(JSON)
+            response = await self._client().post(
+                self.sparql_endpoint,
+                data={'query': sparql_query},
+                headers={'Accept': 'application/sparql-results+json'}
+            )
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
             
-            results = self.query_wrapper.query().convert()
+            results = orjson.loads(response.content)
             logger.info(f"SPARQL query executed successfully, {len(results.get('results', {}).get('bindings', []))} results")
+            if use_cache:
+                sparql_cache.set(cache_key, results)
             return results
             
         except Exception as e:
             logger.error(f"SPARQL query failed: {e}")
             raise Exception(f"SPARQL query failed: {e}")
     
+    async def query_stream(self, sparql_query: str) -> AsyncIterator[Dict[str, Dict[str, str]]]:
+        """Execute SPARQL SELECT query, yielding result bindings one row at a time"""
+        row_count = 0
+        try:
+            # TSV rows are self-contained lines, so they can be decoded as they arrive
+            async with self._client().stream(
+                "POST",
+                self.sparql_endpoint,
+                data={'query': sparql_query},
+                headers={'Accept': 'text/tab-separated-values'}
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(f"{response.status_code} - {response.text}")
+                
+                lines = _aiter_tsv_lines(response)
+                header = await anext(lines, "")
+                variables = [name.lstrip('?$') for name in header.split('\t')]
+                
+                async for line in lines:
+                    if not line:
+                        continue
+                    
+                    binding = {}
+                    for name, text in zip(variables, line.split('\t')):
+                        term = _parse_tsv_term(text)
+                        if term is not None:
+                            binding[name] = term
+                    row_count += 1
+                    yield binding
+        
+        except Exception as e:
+            logger.error(f"SPARQL query failed: {e}")
+            raise Exception(f"SPARQL query failed: {e}")
+        
+        logger.info(f"SPARQL query streamed successfully, {row_count} results")
+    
     async def construct_query(self, sparql_query: str) -> Graph:
         """Execute SPARQL CONSTRUCT query"""
         try:
-            self.query_wrapper.setQuery(sparql_query)
-            self.query_wrapper.setReturnFormat(TURTLE)
+            response = await self._client().post(
+                self.sparql_endpoint,
+                data={'query': sparql_query},
+                headers={'Accept': 'text/turtle'}
+            )
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
             
-            results = self.query_wrapper.query()
             graph = Graph()
-            graph.parse(data=results.serialize(), format='turtle')
+            graph.parse(data=response.content, format='turtle')
             
             logger.info(f"SPARQL CONSTRUCT query executed successfully, {len(graph)} triples")
             return graph
@@ -186,15 +359,15 @@ class TriplestoreClient:
     async def clear_repository(self) -> bool:
         """Clear all data from the repository (for testing)"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.delete(self.update_endpoint)
-                success = response.status_code in [200, 204]
-                if success:
-                    logger.info("Repository cleared successfully")
-                else:
-                    logger.error(f"Failed to clear repository: {response.status_code}")
-                return success
-                
+            response = await self._client().delete(self.update_endpoint)
+            success = response.status_code in [200, 204]
+            if success:
+                clear_query_caches()
+                logger.info("Repository cleared successfully")
+            else:
+                logger.error(f"Failed to clear repository: {response.status_code}")
+            return success
+            
         except Exception as e:
             logger.error(f"Error clearing repository: {e}")
             return False
@@ -229,4 +402,117 @@ class TriplestoreClient:
                 'endpoint': self.sparql_endpoint,
                 'status': 'error',
                 'error': str(e)
-            } 
\ No newline at end of file
+            }
+    
+    async def get_status_bundle(self) -> Dict[str, Any]:
+        """Get connectivity, repository existence and statistics in one SPARQL round-trip"""
+        bundle = {'connected': False, 'repository_exists': False, 'stats': None}
+        try:
+            response = await self._client().post(
+                self.sparql_endpoint,
+                data={'query': STATUS_BUNDLE_QUERY},
+                headers={'Accept': 'application/sparql-results+json'},
+                timeout=5.0
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to GraphDB: {e}")
+            return bundle
+        
+        # Any HTTP answer means GraphDB is reachable; 404 means the repository is missing
+        bundle['connected'] = True
+        if response.status_code == 404:
+            return bundle
+        
+        bundle['repository_exists'] = True
+        try:
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
+            
+            bindings = orjson.loads(response.content).get('results', {}).get('bindings', [])
+            row = bindings[0] if bindings else {}
+            bundle['stats'] = {
+                'repository': self.repository,
+                'endpoint': self.sparql_endpoint,
+                'triple_count': int(row.get('triples', {}).get('value', 0)),
+                'graph_count': int(row.get('graphs', {}).get('value', 0)),
+                'status': 'connected'
+            }
+        except Exception as e:
+            logger.error(f"Failed to get repository stats: {e}")
+            bundle['stats'] = {
+                'repository': self.repository,
+                'endpoint': self.sparql_endpoint,
+                'status': 'error',
+                'error': str(e)
+            }
+        
+        return bundle
+
+def _nt_term(term) -> str:
+    """Write an rdflib term in N-Triples syntax"""
+    if isinstance(term, Literal):
+        lexical = str(term).translate(_NT_LITERAL_ESCAPES)
+        if term.language:
+            return f'"{lexical}"@{term.language}'
+        if term.datatype:
+            return f'"{lexical}"^^<{term.datatype}>'
+        return f'"{lexical}"'
+    return term.n3()
+
+
+def _parse_tsv_term(text: str) -> Optional[Dict[str, str]]:
+    """Convert a term from SPARQL TSV results to a SPARQL JSON results binding"""
+    if not text:
+        return None
+    if text[0] == '<':
+        return {'type': 'uri', 'value': text[1:-1]}
+    if text.startswith('_:'):
+        return {'type': 'bnode', 'value': text[2:]}
+    
+    match = _TSV_LITERAL_RE.match(text)
+    if match:
+        term = {'type': 'literal', 'value': _TSV_ESCAPE_RE.sub(_unescape_tsv, match.group(1))}
+        if match.group(2):
+            term['xml:lang'] = match.group(2)
+        elif match.group(3):
+            term['datatype'] = match.group(3)
+        return term
+    
+    # Numbers and booleans may be written unquoted
+    if text in ('true', 'false'):
+        datatype = 'boolean'
+    elif _TSV_INTEGER_RE.match(text):
+        datatype = 'integer'
+    elif _TSV_DECIMAL_RE.match(text):
+        datatype = 'decimal'
+    elif _TSV_DOUBLE_RE.match(text):
+        datatype = 'double'
+    else:
+        # Keep the row rather than failing the whole result set over one odd term
+        logger.warning(f"Unrecognized term in SPARQL TSV results, treating it as a plain literal: {text[:100]!r}")
+        return {'type': 'literal', 'value': text}
+    return {'type': 'literal', 'value': text, 'datatype': XSD_NS + datatype}
+
+async def _aiter_tsv_lines(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield the lines of a TSV response body, splitting on LF only"""
+    # aiter_lines() also breaks on U+2028, U+0085, \x0c etc., which literals may contain unescaped
+    # Only the newly arrived bytes are scanned, so a row spanning many chunks stays linear
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        scanned = len(buffer)
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", scanned)) >= 0:
+            yield buffer[start:end].rstrip(b"\r").decode("utf-8")
+            start = scanned = end + 1
+        if start:
+            del buffer[:start]
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8")
+
+def _unescape_tsv(match: re.Match) -> str:
+    """Resolve one backslash escape inside a TSV literal"""
+    escape = match.group(1)
+    if escape[0] in 'uU' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return _TSV_ESCAPES.get(escape, escape)
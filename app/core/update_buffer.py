@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# One PREFIX or BASE declaration at the start of an update request
+_PROLOGUE_DECLARATION_RE = re.compile(
+    r'\s*(?:PREFIX\s+[A-Za-z0-9_.-]*:\s*<[^<>"\s]*>|BASE\s*<[^<>"\s]*>)', re.IGNORECASE
+)
+_PROLOGUE_KEYWORD_RE = re.compile(r'\b(?:PREFIX|BASE)\b', re.IGNORECASE)
+
+def _split_prologue(sparql_update: str) -> Optional[Tuple[str, str]]:
+    """Split an update into its leading PREFIX/BASE declarations and its operations, or None if it declares them anywhere else"""
+    declarations = []
+    position = 0
+    while match := _PROLOGUE_DECLARATION_RE.match(sparql_update, position):
+        declarations.append(match.group().strip())
+        position = match.end()
+    
+    operations = sparql_update[position:]
+    if _PROLOGUE_KEYWORD_RE.search(operations):
+        return None
+    return "\n".join(declarations), operations.lstrip() if declarations else operations
+
+class SPARQLUpdateBuffer:
+    """Coalesces SPARQL updates submitted close together into one multi-operation request"""
+    
+    def __init__(self, triplestore, max_delay: float = 0.05, max_batch: int = 64):
+        self.triplestore = triplestore
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer = None
+        self._flushes: Set[asyncio.Task] = set()
+    
+    async def submit(self, sparql_update: str) -> bool:
+        """Queue an update and wait for the result of the batch that carries it"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((sparql_update, future))
+        
+        if len(self._pending) >= self.max_batch:
+            # The timer's batch is being sent now; flush in its own task so cancelling this
+            # caller cannot strand the rest of the batch
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            flush = asyncio.create_task(self._flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_delay())
+        
+        return await future
+    
+    async def _flush_after_delay(self):
+        """Flush whatever has accumulated once the batching window closes"""
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        await self._flush()
+    
+    async def _flush(self):
+        """Send pending updates, one request per group of updates with the same prologue"""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        # Prologue declarations apply to every later operation in a request, so only updates
+        # declaring exactly the same prefixes and base share one; the rest are sent alone
+        groups: Dict[object, List[Tuple[str, str, asyncio.Future]]] = {}
+        for sparql_update, future in batch:
+            split = _split_prologue(sparql_update)
+            if split is None:
+                groups[future] = [(sparql_update, sparql_update, future)]
+            else:
+                prologue, operations = split
+                groups.setdefault(prologue, []).append((sparql_update, operations, future))
+        
+        try:
+            for prologue, group in groups.items():
+                await self._send(prologue if isinstance(prologue, str) else "", group)
+        finally:
+            # Groups never reached (the flush was cancelled) report failure rather than hang
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(False)
+    
+    async def _send(self, prologue: str, group: List[Tuple[str, str, asyncio.Future]]):
+        """Send updates sharing one prologue as a single request, isolating failures"""
+        updates = [sparql_update for sparql_update, _, _ in group]
+        if len(group) == 1:
+            request = updates[0]
+        else:
+            operations = ";\n".join(operations for _, operations, _ in group)
+            request = f"{prologue}\n{operations}" if prologue else operations
+        results: Optional[List[bool]] = None
+        error: Optional[Exception] = None
+        try:
+            success = await self.triplestore.update(request)
+            
+            if success:
+                results = [True] * len(group)
+                logger.info(f"Applied {len(group)} SPARQL updates in one request")
+            elif len(group) > 1:
+                # A batch is applied atomically, so retry individually to isolate the failing update
+                logger.warning(f"Batched SPARQL update of {len(group)} operations failed, retrying individually")
+                results = [await self.triplestore.update(sparql_update) for sparql_update in updates]
+            else:
+                results = [False]
+        except Exception as e:
+            logger.error(f"Batched SPARQL update of {len(group)} operations raised: {e}")
+            error = e
+        finally:
+            for index, (_, _, future) in enumerate(group):
+                if future.done():
+                    continue
+                if results is not None:
+                    future.set_result(results[index])
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(False)
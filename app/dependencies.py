@@ -1,23 +1,31 @@
 from functools import lru_cache
+from app.config import settings
 from app.core.triplestore_client import TriplestoreClient
 from app.core.ontology_manager import OntologyManager
+from app.core.semantic_annotator import SemanticAnnotator
+from app.core.update_buffer import SPARQLUpdateBuffer
 
-# Singleton instances
-_triplestore_client = None
-_ontology_manager = None
+# Each provider is memoized, so the first call creates the singleton instance
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_triplestore_client() -> TriplestoreClient:
     """Get triplestore client singleton"""
-    global _triplestore_client
-    if _triplestore_client is None:
-        _triplestore_client = TriplestoreClient()
-    return _triplestore_client
+    if settings.TRIPLESTORE_MODE == "local":
+        from app.core.local_triplestore_client import LocalTriplestoreClient
+        return LocalTriplestoreClient()
+    return TriplestoreClient()
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_ontology_manager() -> OntologyManager:
     """Get ontology manager singleton"""
-    global _ontology_manager
-    if _ontology_manager is None:
-        _ontology_manager = OntologyManager()
-    return _ontology_manager 
\ No newline at end of file
+    return OntologyManager()
+
+@lru_cache(maxsize=1)
+def get_semantic_annotator() -> SemanticAnnotator:
+    """Get semantic annotator singleton"""
+    return SemanticAnnotator()
+
+@lru_cache(maxsize=1)
+def get_update_buffer() -> SPARQLUpdateBuffer:
+    """Get SPARQL update buffer singleton"""
+    return SPARQLUpdateBuffer(get_triplestore_client())
@@ -1,10 +1,13 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+import asyncio
 import time
 import logging
+import orjson
 import os
 from pathlib import Path
 
@@ -15,6 +18,13 @@ from app.api import users, assets, search, graph, ontology, sparql, system
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup before serving requests and shutdown after the last one"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -22,6 +32,8 @@ app = FastAPI(
     description="Semantic-Based Explicit Knowledge Management System Backend API",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Mount static files (add this after the app creation but before middleware)
@@ -40,108 +52,183 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    # If-None-Match is not CORS-safelisted; clients send it to revalidate ETag'd listings
+    allow_headers=["Authorization", "Content-Type", "X-Requested-With", "If-None-Match"],
+    max_age=settings.CORS_MAX_AGE,
 )
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-# Global exception handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal server error",
-            "detail": str(exc) if settings.DEBUG else "An unexpected error occurred"
-        }
-    )
-
-# Startup and shutdown events
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting SBEKMS Backend API...")
+class TimingMiddleware:
+    """Pure ASGI middleware adding X-Process-Time to the response start, without buffering the body"""
     
-    try:
-        # Test triplestore connection
-        from app.dependencies import get_triplestore_client
-        from app.core.triplestore_client import TriplestoreClient
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        triplestore = TriplestoreClient()
-        connection_test = await triplestore.test_connection()
+        start_time = time.perf_counter()
         
-        if connection_test:
-            logger.info("✅ GraphDB triplestore connection established")
-            
-            # Get triplestore status
-            status = await triplestore.get_status()
-            triple_count = status.get('triple_count', 0)
-            logger.info(f"📊 Current triplestore contains {triple_count} triples")
-            
-        else:
-            logger.error("❌ Failed to connect to GraphDB triplestore")
-            
-        # Initialize base ontology namespaces (ensure they exist)
-        base_prefixes = {
-            "wdo": settings.WDO_NAMESPACE,
-            "sbekms": settings.INSTANCE_NAMESPACE,
-            "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
-            "dcterms": "http://purl.org/dc/terms/",
-            "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-        }
+        async def send_with_process_time(message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                message["headers"] = [*message.get("headers", ()), (b"x-process-time", str(process_time).encode())]
+            await send(message)
         
-        # Log ontology namespaces
-        logger.info("🔗 Ontology namespaces initialized:")
-        for prefix, namespace in base_prefixes.items():
-            logger.info(f"   {prefix}: {namespace}")
-            
-        # Initialize semantic annotator
-        from app.core.semantic_annotator import SemanticAnnotator
-        annotator = SemanticAnnotator()
-        logger.info("🔬 Semantic annotator initialized")
-        
-        # Verify upload directory exists
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"📁 Upload directory verified: {upload_dir}")
+        await self.app(scope, receive, send_with_process_time)
+
+app.add_middleware(TimingMiddleware)
+
+# Global exception handler
+_INTERNAL_ERROR_BODY = orjson.dumps({"error": "Internal server error", "detail": "An unexpected error occurred"})
+
+class ErrorHandlerMiddleware:
+    """Pure ASGI middleware turning unhandled exceptions into a JSON 500 sent straight to the server"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Log system configuration
-        logger.info("⚙️  System configuration:")
-        logger.info(f"   Debug mode: {settings.DEBUG}")
-        logger.info(f"   API version: {settings.VERSION}")
-        logger.info(f"   Max file size: {settings.MAX_FILE_SIZE} bytes")
+        response_started = False
         
-    except Exception as e:
-        logger.error(f"❌ Startup initialization failed: {e}")
-        # Don't crash the app, but log the error
+        async def send_tracking_start(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
         
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as exc:
+            logger.error(f"Global exception: {exc}", exc_info=True)
+            if response_started:
+                # Too late to replace the response; let the server close the connection
+                raise
+            
+            body = _INTERNAL_ERROR_BODY
+            if settings.DEBUG:
+                body = orjson.dumps({"error": "Internal server error", "detail": str(exc)})
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+            })
+            await send({"type": "http.response.body", "body": body})
+
+# Registered last, so it is the outermost middleware and also covers the timing and CORS layers
+app.add_middleware(ErrorHandlerMiddleware)
+
+# Startup and shutdown, run by the lifespan handler
+async def _connect_triplestore(triplestore):
+    """Test the triplestore connection, warm its pool and log its size"""
+    if not await triplestore.test_connection():
+        logger.error("❌ Failed to connect to GraphDB triplestore")
+        return
+    
+    logger.info("✅ GraphDB triplestore connection established")
+    
+    # Open pooled keep-alive connections before the first user requests arrive
+    await triplestore.warm_pool()
+    
+    # Get triplestore status
+    status = await triplestore.get_repository_stats()
+    triple_count = status.get('triple_count', 0)
+    logger.info(f"📊 Current triplestore contains {triple_count} triples")
+
+async def _load_ontology(ontology_manager):
+    """Load the ontology (and its OWL-RL closure) now rather than on the first ontology request"""
+    if not await ontology_manager.load_ontology():
+        logger.error("❌ Failed to load ontology")
+        return
+    
+    ontology_manager.get_classes()
+    ontology_manager.get_properties()
+    logger.info(f"🧠 Ontology loaded: {len(ontology_manager.classes)} classes, "
+               f"{len(ontology_manager.properties)} properties")
+
+async def _init_semantic_annotator(semantic_annotator):
+    """Build one throwaway asset so namespace term lookups are warm before the first upload"""
+    semantic_annotator.build_asset_triples({"id": "warmup", "file_name": "warmup.txt", "tags": ["warmup"]})
+    logger.info("🔬 Semantic annotator initialized")
+
+async def _ensure_upload_dir():
+    """Verify upload directory exists"""
+    upload_dir = Path(settings.UPLOAD_DIR)
+    await asyncio.to_thread(upload_dir.mkdir, parents=True, exist_ok=True)
+    logger.info(f"📁 Upload directory verified: {upload_dir}")
+
+async def startup_event():
+    logger.info("Starting SBEKMS Backend API...")
+    
+    from app.dependencies import get_ontology_manager, get_semantic_annotator, get_triplestore_client
+    
+    # Open the shared triplestore client before anything queries it
+    triplestore = get_triplestore_client()
+    await triplestore.startup()
+    
+    # The initializers are independent; run them concurrently and log failures without crashing the app
+    initializers = {
+        "triplestore": _connect_triplestore(triplestore),
+        "ontology": _load_ontology(get_ontology_manager()),
+        "search cache": search.warm_search_cache(),
+        "semantic annotator": _init_semantic_annotator(get_semantic_annotator()),
+        "upload directory": _ensure_upload_dir(),
+    }
+    results = await asyncio.gather(*initializers.values(), return_exceptions=True)
+    for name, result in zip(initializers, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Startup initialization of {name} failed: {result}")
+    
+    # Initialize base ontology namespaces (ensure they exist)
+    base_prefixes = {
+        "wdo": settings.WDO_NAMESPACE,
+        "sbekms": settings.INSTANCE_NAMESPACE,
+        "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+        "dcterms": "http://purl.org/dc/terms/",
+        "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    }
+    
+    # Log ontology namespaces
+    logger.info("🔗 Ontology namespaces initialized:")
+    for prefix, namespace in base_prefixes.items():
+        logger.info(f"   {prefix}: {namespace}")
+    
+    # Log system configuration
+    logger.info("⚙️  System configuration:")
+    logger.info(f"   Debug mode: {settings.DEBUG}")
+    logger.info(f"   API version: {settings.VERSION}")
+    logger.info(f"   Max file size: {settings.MAX_FILE_SIZE} bytes")
+    
     logger.info("🚀 SBEKMS Backend API started successfully")
 
-@app.on_event("shutdown") 
 async def shutdown_event():
     logger.info("🛑 Shutting down SBEKMS Backend API...")
     
     try:
         # Log final statistics
-        from app.core.triplestore_client import TriplestoreClient
-        triplestore = TriplestoreClient()
+        from app.dependencies import get_triplestore_client
+        triplestore = get_triplestore_client()
         
         try:
-            status = await triplestore.get_status()
+            status = await triplestore.get_repository_stats()
             triple_count = status.get('triple_count', 0)
             logger.info(f"📊 Final triplestore state: {triple_count} triples")
         except:
             logger.info("📊 Could not retrieve final triplestore statistics")
             
-        # Clean up any temporary resources if needed
+        # Close pooled triplestore connections
+        await triplestore.aclose()
+        
+        # Stop parser worker processes
+        from app.core.artifact_parser import shutdown_parser_pool
+        await asyncio.to_thread(shutdown_parser_pool)
         logger.info("🧹 Cleanup completed")
         
     except Exception as e:
@@ -221,5 +308,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        # uvloop and httptools come with uvicorn[standard]; pin them rather than relying on auto-detection
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        access_log=settings.DEBUG
     ) 
\ No newline at end of file
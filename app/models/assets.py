@@ -14,7 +14,7 @@ class UploadAssetRequest(BaseModel):
     """Request model for asset upload"""
     title: Optional[str] = None
     description: Optional[str] = None
-    tags: List[str] = []
+    tags: List[str] = Field(default_factory=list)
     project_name: Optional[str] = None
     author: Optional[str] = None
 
@@ -36,7 +36,7 @@ class AssetMetadata(BaseModel):
     class_count: int = 0
     
     # Semantic annotation
-    wdo_classes: List[str] = []
+    wdo_classes: List[str] = Field(default_factory=list)
     rdf_triples_count: int = 0
     
     # Timestamps
@@ -46,7 +46,7 @@ class AssetMetadata(BaseModel):
     # User metadata
     title: Optional[str] = None
     description: Optional[str] = None
-    tags: List[str] = []
+    tags: List[str] = Field(default_factory=list)
     project_name: Optional[str] = None
     author: Optional[str] = None
 
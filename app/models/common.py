@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union, Literal
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from enum import Enum
 
 class ResponseStatus(str, Enum):
@@ -11,7 +11,7 @@ class BaseResponse(BaseModel):
     """Base response model"""
     status: ResponseStatus
     message: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class SuccessResponse(BaseResponse):
     """Success response model"""
@@ -74,20 +74,20 @@ class SearchResult(BaseModel):
     mime_type: str
     file_size: int
     author: Optional[str] = None
-    tags: List[str] = []
-    wdo_classes: List[str] = []
+    tags: List[str] = Field(default_factory=list)
+    wdo_classes: List[str] = Field(default_factory=list)
     created_at: datetime
     relevance_score: float = Field(ge=0.0, le=1.0, description="Search relevance score")
-    highlights: List[str] = Field([], description="Highlighted text snippets")
+    highlights: List[str] = Field(default_factory=list, description="Highlighted text snippets")
 
 class SearchResponse(BaseResponse):
     """Search results response"""
     status: ResponseStatus = ResponseStatus.SUCCESS
     data: Optional[Dict[str, Any]] = None
-    results: List[SearchResult] = []
+    results: List[SearchResult] = Field(default_factory=list)
     total_results: int = 0
     search_time_ms: float = 0.0
-    suggestions: List[str] = []
+    suggestions: List[str] = Field(default_factory=list)
 
 class GraphSearchQuery(BaseModel):
     """Knowledge graph search query"""
@@ -101,20 +101,20 @@ class GraphNode(BaseModel):
     id: str
     label: str
     type: str
-    properties: Dict[str, Any] = {}
+    properties: Dict[str, Any] = Field(default_factory=dict)
 
 class GraphEdge(BaseModel):
     """Knowledge graph edge"""
     source: str
     target: str
     relationship: str
-    properties: Dict[str, Any] = {}
+    properties: Dict[str, Any] = Field(default_factory=dict)
 
 class GraphSearchResponse(BaseResponse):
     """Knowledge graph search response"""
     status: ResponseStatus = ResponseStatus.SUCCESS
-    nodes: List[GraphNode] = []
-    edges: List[GraphEdge] = []
+    nodes: List[GraphNode] = Field(default_factory=list)
+    edges: List[GraphEdge] = Field(default_factory=list)
     center_node: str
     query_depth: int
 
@@ -153,7 +153,7 @@ class GraphVisualization(BaseModel):
 class KnowledgeGraphResponse(BaseResponse):
     """Complete knowledge graph response"""
     status: ResponseStatus = ResponseStatus.SUCCESS
-    graph: Dict[str, Any] = {}  # Contains nodes and edges
+    graph: Dict[str, Any] = Field(default_factory=dict)  # Contains nodes and edges
     analytics: Optional[GraphAnalytics] = None
     visualization_config: Optional[GraphVisualization] = None
-    query_info: Dict[str, Any] = {} 
\ No newline at end of file
+    query_info: Dict[str, Any] = Field(default_factory=dict) 
\ No newline at end of file
@@ -238,4 +238,36 @@ class TestAssetsAPI:
         data = response.json()
         
         assert data["data"]["checksum"] == expected_checksum
-        assert len(data["data"]["checksum"]) == 64  # SHA-256 hex length 
\ No newline at end of file
+        assert len(data["data"]["checksum"]) == 64  # SHA-256 hex length 
+    
+    @patch('app.core.semantic_annotator.SemanticAnnotator.annotate_asset')
+    def test_upload_large_file_streamed_in_chunks(self, mock_annotate, client):
+        """Test that multi-chunk uploads report correct size, line count and checksum"""
+        import hashlib
+        from app.api.assets import UPLOAD_CHUNK_SIZE
+        
+        mock_annotate.return_value = 10
+        content = b"x = 1\n" * (UPLOAD_CHUNK_SIZE // 2)
+        
+        response = client.post(
+            "/api/assets/upload",
+            files={"file": ("large.py", io.BytesIO(content), "text/x-python")}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        
+        assert data["file_size"] == len(content)
+        assert data["checksum"] == hashlib.sha256(content).hexdigest()
+        assert data["metadata"]["line_count"] == content.count(b"\n") + 1
+    
+    def test_upload_recreates_missing_upload_dir(self, tmp_path):
+        """Test the upload directory is created on demand when the lifespan has not made it"""
+        from app.api.assets import _write_and_hash
+        
+        file_path = tmp_path / "uploads" / "notes.txt"
+        
+        checksum, file_size, line_count = _write_and_hash(io.BytesIO(b"one\ntwo\n"), file_path)
+        
+        assert file_path.read_bytes() == b"one\ntwo\n"
+        assert (file_size, line_count) == (8, 3)
@@ -0,0 +1,245 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from rdflib import Graph, URIRef, Literal
+from rdflib.namespace import RDF, RDFS
+
+from app.api.graph import KnowledgeGraphService
+from app.models.common import GraphQuery, GraphNode, GraphEdge
+
+
+@pytest.fixture
+def graph_service():
+    """Create a KnowledgeGraphService with mocked backends"""
+    return KnowledgeGraphService(MagicMock(), MagicMock())
+
+
+class TestKnowledgeGraphQueries:
+    """Test cases for knowledge graph SPARQL query building"""
+    
+    def test_neighborhood_query_includes_center_filter(self, graph_service):
+        """Test neighborhood query filters on the center entity"""
+        query = GraphQuery(query_type="neighborhood", center_entity="http://example.org/a", max_nodes=50)
+        sparql = graph_service._build_neighborhood_query(query)
+        
+        assert "FILTER(?s = <http://example.org/a> || ?o = <http://example.org/a>)" in sparql
+        assert "LIMIT 100" in sparql
+        assert "PREFIX wdo:" in sparql
+    
+    def test_neighborhood_query_drops_technical_and_literal_rows(self, graph_service):
+        """Test rdf:type edges and literal-valued rows are filtered by the store"""
+        a = URIRef("http://example.org/a")
+        g = Graph()
+        g.add((a, RDF.type, URIRef("http://example.org/File")))
+        g.add((a, RDFS.label, Literal("a.py")))
+        g.add((a, RDFS.comment, Literal("ignored")))
+        g.add((a, URIRef("http://example.org/uses"), URIRef("http://example.org/b")))
+        
+        query = GraphQuery(query_type="neighborhood", center_entity=str(a))
+        predicates = {str(row.p) for row in g.query(graph_service._build_neighborhood_query(query))}
+        
+        assert predicates == {"http://example.org/uses"}
+    
+    def test_node_literals_query_returns_only_literals(self, graph_service):
+        """Test the literal-properties query fetches every literal of the listed subjects"""
+        a = URIRef("http://example.org/a")
+        g = Graph()
+        g.add((a, RDFS.label, Literal("a.py")))
+        g.add((a, URIRef("http://example.org/fileSize"), Literal(42)))
+        g.add((a, URIRef("http://example.org/uses"), URIRef("http://example.org/b")))
+        g.add((URIRef("http://example.org/c"), RDFS.label, Literal("c.py")))
+        
+        rows = {(str(row.s), str(row.p), str(row.o)) for row in g.query(graph_service._build_node_literals_query([str(a)]))}
+        
+        assert rows == {
+            (str(a), str(RDFS.label), "a.py"),
+            (str(a), "http://example.org/fileSize", "42"),
+        }
+    
+    def test_path_query_requires_both_entities(self, graph_service):
+        """Test path query validation"""
+        with pytest.raises(ValueError):
+            graph_service._build_path_query(GraphQuery(query_type="path", source_entity="http://example.org/a"))
+    
+    def test_path_query_substitutes_entities(self, graph_service):
+        """Test path query includes source and target entities"""
+        query = GraphQuery(
+            query_type="path",
+            source_entity="http://example.org/a",
+            target_entity="http://example.org/b",
+            max_nodes=20
+        )
+        sparql = graph_service._build_path_query(query)
+        
+        assert "<http://example.org/a>" in sparql
+        assert "<http://example.org/b>" in sparql
+        assert "LIMIT 20" in sparql
+    
+    def test_path_query_follows_property_paths(self, graph_service):
+        """Test path query returns the edges connecting source and target"""
+        g = Graph()
+        g.add((URIRef("http://example.org/a"), URIRef("http://example.org/uses"), URIRef("http://example.org/m")))
+        g.add((URIRef("http://example.org/b"), URIRef("http://example.org/uses"), URIRef("http://example.org/m")))
+        g.add((URIRef("http://example.org/m"), URIRef("http://example.org/uses"), URIRef("http://example.org/z")))
+        query = GraphQuery(
+            query_type="path",
+            source_entity="http://example.org/a",
+            target_entity="http://example.org/b",
+            depth=2
+        )
+        
+        edges = {(str(row.s), str(row.o)) for row in g.query(graph_service._build_path_query(query))}
+        
+        assert edges == {
+            ("http://example.org/a", "http://example.org/m"),
+            ("http://example.org/b", "http://example.org/m"),
+        }
+    
+    def test_full_graph_query_is_stable_across_requests(self, graph_service):
+        """Test identical queries produce identical SPARQL text"""
+        query = GraphQuery(query_type="full", max_nodes=30)
+        
+        assert graph_service._build_full_graph_query(query) == graph_service._build_full_graph_query(query)
+        assert "{{" not in graph_service._build_cluster_query(query)
+
+
+class TestKnowledgeGraphResults:
+    """Test cases for turning SPARQL bindings into graph structures"""
+    
+    def test_extract_names_from_uris(self, graph_service):
+        """Test local-name extraction for hash and slash URIs"""
+        assert graph_service._extract_relationship_name("http://purl.org/dc/terms/title") == "title"
+        assert graph_service._extract_label_from_uri("http://example.org/onto#Thing") == "Thing"
+        assert graph_service._extract_label_from_uri("plain") == "plain"
+        assert graph_service._extract_class_name("Unknown") == "Resource"
+        assert graph_service._extract_class_name("") == "Resource"
+    
+    def test_process_graph_results(self, graph_service):
+        """Test nodes, edges and literal properties are built from bindings"""
+        results = [
+            {
+                "s": {"value": "http://example.org/a"},
+                "p": {"value": "http://example.org/onto#linksTo"},
+                "o": {"type": "uri", "value": "http://example.org/b"},
+                "sType": {"value": "http://example.org/onto#File"},
+            },
+            {
+                "s": {"value": "http://example.org/a"},
+                "p": {"value": "http://www.w3.org/2000/01/rdf-schema#label"},
+                "o": {"type": "literal", "value": "a.py"},
+            },
+        ]
+        
+        nodes, edges = graph_service._process_graph_results(results, GraphQuery())
+        nodes_by_id = {node.id: node for node in nodes}
+        
+        assert set(nodes_by_id) == {"http://example.org/a", "http://example.org/b"}
+        assert nodes_by_id["http://example.org/a"].type == "File"
+        assert nodes_by_id["http://example.org/a"].properties["label"] == "a.py"
+        assert nodes_by_id["http://example.org/b"].label == "b"
+        assert len(edges) == 1
+        assert edges[0].relationship == "linksTo"
+    
+    def test_http_like_literal_is_not_a_node(self, graph_service):
+        """Test literals that look like URLs stay node properties"""
+        results = [
+            {
+                "s": {"type": "uri", "value": "http://example.org/a"},
+                "p": {"type": "uri", "value": "http://purl.org/dc/terms/description"},
+                "o": {"type": "literal", "value": "https://example.com docs"},
+            },
+        ]
+        
+        nodes, edges = graph_service._process_graph_results(results, GraphQuery())
+        
+        assert [node.id for node in nodes] == ["http://example.org/a"]
+        assert nodes[0].properties["description"] == "https://example.com docs"
+        assert edges == []
+    
+    def test_literal_only_subject_takes_label_and_type(self, graph_service):
+        """Test a node seen only in literal rows is labelled and typed from those rows"""
+        a = URIRef("http://example.org/asset_1")
+        g = Graph()
+        g.add((a, RDF.type, URIRef("http://purl.example.org/web_dev_km_bfo#PythonFile")))
+        g.add((a, RDFS.label, Literal("main.py")))
+        results = [
+            {name: {"type": "uri" if isinstance(value, URIRef) else "literal", "value": str(value)}
+             for name, value in row.asdict().items()}
+            for row in g.query(graph_service._build_node_literals_query([str(a)]))
+        ]
+        
+        nodes, _ = graph_service._process_graph_results(results, GraphQuery())
+        
+        assert len(nodes) == 1
+        assert nodes[0].label == "main.py"
+        assert nodes[0].type == "PythonFile"
+    
+    def test_calculate_graph_analytics(self, graph_service):
+        """Test type counts and degree statistics"""
+        nodes = [
+            GraphNode(id="a", label="a", type="File"),
+            GraphNode(id="b", label="b", type="File"),
+            GraphNode(id="c", label="c", type="Tag"),
+        ]
+        edges = [
+            GraphEdge(source="a", target="b", relationship="linksTo"),
+            GraphEdge(source="a", target="c", relationship="hasTag"),
+        ]
+        
+        analytics = graph_service._calculate_graph_analytics(nodes, edges)
+        
+        assert analytics.node_types == {"File": 2, "Tag": 1}
+        assert analytics.relationship_types == {"linksTo": 1, "hasTag": 1}
+        assert analytics.max_degree == 2
+        assert analytics.avg_degree == 1.33
+        assert analytics.density == round(2 / 3, 4)
+    
+    def test_node_properties_are_not_shared(self):
+        """Test each node gets its own properties dict from the default factory"""
+        first = GraphNode(id="a", label="a", type="File")
+        second = GraphNode.model_construct(id="b", label="b", type="File")
+        
+        first.properties["label"] = "a.py"
+        
+        assert second.properties == {}
+
+
+class TestGraphAPI:
+    """Test cases for Graph API endpoints"""
+    
+    def test_explore_returns_graph(self):
+        """Test /explore serializes nodes, edges and analytics"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.api.graph import get_knowledge_graph_service
+        
+        triplestore = AsyncMock()
+        triplestore.query.side_effect = [
+            {"results": {"bindings": [
+                {
+                    "s": {"value": "http://example.org/a"},
+                    "p": {"value": "http://example.org/onto#uses"},
+                    "o": {"type": "uri", "value": "http://example.org/b"},
+                }
+            ]}},
+            {"results": {"bindings": [
+                {
+                    "s": {"value": "http://example.org/a"},
+                    "p": {"value": "http://example.org/onto#hasFileSize"},
+                    "o": {"type": "literal", "value": "42"},
+                }
+            ]}},
+        ]
+        app.dependency_overrides[get_knowledge_graph_service] = lambda: KnowledgeGraphService(triplestore, MagicMock())
+        try:
+            response = TestClient(app).post("/api/graph/explore", json={"query_type": "full"})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert len(data["graph"]["nodes"]) == 2
+        assert data["graph"]["nodes"][0]["properties"]["hasFileSize"] == "42"
+        assert "VALUES ?s { <http://example.org/a> }" in triplestore.query.call_args_list[1].args[0]
+        assert data["graph"]["edges"][0]["relationship"] == "uses"
+        assert data["analytics"]["total_edges"] == 1
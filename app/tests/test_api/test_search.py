@@ -0,0 +1,565 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from pydantic import ValidationError
+
+from app.api.search import (
+    UnifiedSearchService, UnifiedSearchQuery, SearchWarmCache,
+    _sparql_literal, _extract_file_type, _extract_class_name
+)
+from app.utils.cache import search_cache, clear_query_caches
+
+
+SAMPLE_BINDINGS = {
+    'results': {
+        'bindings': [
+            {
+                'asset': {'type': 'uri', 'value': 'http://sbekms.example.org/instances/asset-1'},
+                'fileName': {'type': 'literal', 'value': 'main.py'},
+                'fileSize': {'type': 'literal', 'value': '42'},
+                'type': {'type': 'uri', 'value': 'http://purl.example.org/web_dev_km_bfo#PythonSourceCodeFile'}
+            }
+        ]
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Start every test with empty search caches"""
+    clear_query_caches()
+    yield
+    clear_query_caches()
+
+
+def stream_of(payload):
+    """Build a query_stream mock yielding the bindings of a SPARQL JSON payload"""
+    async def query_stream(sparql):
+        for binding in payload['results']['bindings']:
+            yield binding
+    return MagicMock(side_effect=query_stream)
+
+
+@pytest.fixture
+def triplestore():
+    """Create a mocked triplestore returning one asset"""
+    mock = MagicMock()
+    mock.query = AsyncMock(return_value=SAMPLE_BINDINGS)
+    mock.query_stream = stream_of(SAMPLE_BINDINGS)
+    return mock
+
+
+@pytest.fixture
+def search_service(triplestore):
+    """Create a UnifiedSearchService over the mocked triplestore"""
+    return UnifiedSearchService(triplestore)
+
+
+class TestSearchCache:
+    """Test cases for search result caching"""
+    
+    def test_cache_key_ignores_filter_order(self):
+        """Test equivalent queries share a cache key"""
+        first = UnifiedSearchQuery(query="main", tags=["a", "b"], wdo_classes=["X", "Y"])
+        second = UnifiedSearchQuery(query="main", tags=["b", "a"], wdo_classes=["Y", "X"])
+        
+        assert first.cache_key() == second.cache_key()
+    
+    def test_cache_key_distinguishes_pagination(self):
+        """Test different pages are cached separately"""
+        first = UnifiedSearchQuery(query="main", offset=0)
+        second = UnifiedSearchQuery(query="main", offset=20)
+        
+        assert first.cache_key() != second.cache_key()
+    
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_cache(self, search_service, triplestore):
+        """Test a repeated search does not hit the triplestore again"""
+        query = UnifiedSearchQuery(query="main", file_types=["py"])
+        
+        first = await search_service.search(query)
+        second = await search_service.search(query)
+        
+        assert triplestore.query_stream.call_count == 1
+        assert first.results == second.results
+        assert second.results[0].file_name == "main.py"
+    
+    @pytest.mark.asyncio
+    async def test_basic_search_loads_suggestions_alongside_main_query(self):
+        """Test a cold basic search does not wait for the main query before loading suggestions"""
+        import asyncio
+        
+        labels_requested = asyncio.Event()
+        
+        async def query(sparql):
+            if "SELECT DISTINCT ?label" in sparql:
+                labels_requested.set()
+                return label_bindings("main.py", "maintenance.md")
+            return {'results': {'bindings': []}}
+        
+        async def query_stream(sparql):
+            await asyncio.wait_for(labels_requested.wait(), timeout=1)
+            for binding in SAMPLE_BINDINGS['results']['bindings']:
+                yield binding
+        
+        triplestore = MagicMock()
+        triplestore.query = AsyncMock(side_effect=query)
+        triplestore.query_stream = query_stream
+        response = await UnifiedSearchService(triplestore).search(UnifiedSearchQuery(query="main"))
+        
+        assert response.results[0].file_name == "main.py"
+        assert response.suggestions == ["main.py", "maintenance.md"]
+    
+    @pytest.mark.asyncio
+    async def test_clearing_cache_forces_requery(self, search_service, triplestore):
+        """Test invalidation makes the next search query the triplestore"""
+        query = UnifiedSearchQuery(query="main", file_types=["py"])
+        
+        await search_service.search(query)
+        search_cache.clear()
+        await search_service.search(query)
+        
+        assert triplestore.query_stream.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_search_overlapping_a_write_is_not_served_after_it(self, search_service, triplestore):
+        """Test results read before a write are not cached past the invalidation that write triggers"""
+        query = UnifiedSearchQuery(query="main", file_types=["py"])
+        
+        async def query_stream_during_write(sparql):
+            # The store is modified (and caches cleared) while this search is still reading
+            clear_query_caches()
+            for binding in SAMPLE_BINDINGS['results']['bindings']:
+                yield binding
+        
+        triplestore.query_stream.side_effect = query_stream_during_write
+        await search_service.search(query)
+        triplestore.query_stream.side_effect = stream_of(SAMPLE_BINDINGS).side_effect
+        await search_service.search(query)
+        
+        assert triplestore.query_stream.call_count == 2
+
+
+def label_bindings(*labels):
+    """Build SPARQL JSON results for a list of labels"""
+    return {'results': {'bindings': [{'label': {'type': 'literal', 'value': label}} for label in labels]}}
+
+
+class TestSearchWarmCache:
+    """Test cases for pinned suggestions and facets"""
+    
+    @pytest.fixture
+    def warm_triplestore(self):
+        """Create a mocked triplestore serving labels and facets"""
+        mock = MagicMock()
+        mock.query = AsyncMock(side_effect=lambda sparql: (
+            label_bindings("main.py", "Domain model", "README.md", "main")
+            if "SELECT DISTINCT ?label" in sparql else
+            {'results': {'bindings': [
+                {'type': {'value': 'http://purl.example.org/web_dev_km_bfo#PythonSourceCodeFile'},
+                 'author': {'value': 'bob'}},
+                {'type': {'value': 'http://purl.example.org/web_dev_km_bfo#DigitalInformationCarrier'},
+                 'author': {'value': 'alice'}}
+            ]}}
+        ))
+        return mock
+    
+    @pytest.mark.asyncio
+    async def test_suggestions_match_substrings(self, warm_triplestore):
+        """Test suggestions contain the query's first three characters anywhere in the label"""
+        cache = SearchWarmCache()
+        await cache.ensure_loaded(warm_triplestore)
+        
+        assert cache.suggest("main") == ["Domain model", "main.py"]
+        assert cache.suggest("MAI") == ["Domain model", "main", "main.py"]
+        assert cache.suggest("re") == ["README.md"]
+    
+    @pytest.mark.asyncio
+    async def test_facets_are_sorted_and_exclude_base_class(self, warm_triplestore):
+        """Test facet values are pre-sorted and skip DigitalInformationCarrier"""
+        cache = SearchWarmCache()
+        await cache.ensure_loaded(warm_triplestore)
+        
+        assert cache.facets["wdo_classes"] == ("PythonSourceCodeFile",)
+        assert cache.facets["authors"] == ("alice", "bob")
+    
+    @pytest.mark.asyncio
+    async def test_loaded_once_until_store_changes(self, warm_triplestore):
+        """Test the store is only re-queried after an invalidation"""
+        cache = SearchWarmCache()
+        await cache.ensure_loaded(warm_triplestore)
+        await cache.ensure_loaded(warm_triplestore)
+        assert warm_triplestore.query.await_count == 2
+        
+        clear_query_caches()
+        await cache.ensure_loaded(warm_triplestore)
+        assert warm_triplestore.query.await_count == 4
+
+
+class TestSearchEndpoints:
+    """Test cases for search API endpoints"""
+    
+    def test_search_service_is_singleton(self):
+        """Test the dependency returns the same service for every request"""
+        from app.api.search import get_search_service
+        
+        assert get_search_service() is get_search_service()
+    
+    def test_search_uses_injected_service(self, search_service):
+        """Test /search routes through the search service dependency"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.api.search import get_search_service
+        
+        app.dependency_overrides[get_search_service] = lambda: search_service
+        try:
+            response = TestClient(app).post("/api/search/", json={"query": "main", "file_types": ["py"]})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert response.json()["results"][0]["file_name"] == "main.py"
+    
+    def test_get_search_revalidates_with_etag(self, search_service):
+        """Test the GET search sends an ETag and answers a matching If-None-Match with 304"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.api.search import get_search_service
+        
+        app.dependency_overrides[get_search_service] = lambda: search_service
+        try:
+            client = TestClient(app)
+            first = client.get("/api/search/", params={"q": "main", "file_types": ["py"]})
+            etag = first.headers["etag"]
+            repeat = client.get("/api/search/", params={"q": "main", "file_types": ["py"]},
+                                headers={"If-None-Match": etag})
+            other = client.get("/api/search/", params={"q": "notes"}, headers={"If-None-Match": etag})
+            clear_query_caches()
+            after_update = client.get("/api/search/", params={"q": "main", "file_types": ["py"]},
+                                      headers={"If-None-Match": etag})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert first.status_code == 200
+        assert first.json()["results"][0]["file_name"] == "main.py"
+        assert first.headers["cache-control"] == "private, max-age=30"
+        assert etag.startswith('W/"')
+        assert repeat.status_code == 304
+        assert other.status_code == 200
+        assert after_update.status_code == 200
+    
+    def test_etag_changes_with_process_epoch(self):
+        """Test tags from another process or an earlier boot never validate, even at the same generation"""
+        from unittest.mock import patch
+        from app.api.search import _etag
+        
+        etag = _etag("facets")
+        with patch("app.api.search._ETAG_EPOCH", "another-boot"):
+            assert _etag("facets") != etag
+    
+    def test_get_search_rejects_unsafe_filters(self, search_service):
+        """Test the GET search applies the same validation as the POST body"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.api.search import get_search_service
+        
+        app.dependency_overrides[get_search_service] = lambda: search_service
+        try:
+            response = TestClient(app).get("/api/search/", params={"q": "main", "wdo_classes": ["X } ?"]})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 422
+    
+    def test_facets_revalidate_with_etag(self, search_service):
+        """Test facets are cacheable for five minutes and revalidated by ETag"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.api.search import get_search_service, _etag
+        
+        app.dependency_overrides[get_search_service] = lambda: search_service
+        try:
+            response = TestClient(app).get("/api/search/facets", headers={"If-None-Match": _etag("facets")})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == "private, max-age=300"
+
+
+@pytest.fixture
+def asset_graph():
+    """Build a small rdflib graph with two annotated assets"""
+    from rdflib import Graph, Literal, Namespace, URIRef
+    from rdflib.namespace import DCTERMS, RDF, RDFS
+    
+    wdo = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    graph = Graph()
+    for name, title, file_type in (("main.py", "Entry point", "PythonSourceCodeFile"),
+                                   ("notes.md", "Main notes", "DocumentationFile")):
+        asset = URIRef(f"http://sbekms.example.org/instances/{name}")
+        graph.add((asset, RDF.type, wdo.DigitalInformationCarrier))
+        graph.add((asset, RDF.type, wdo[file_type]))
+        graph.add((asset, RDFS.label, Literal(name)))
+        graph.add((asset, DCTERMS.title, Literal(title)))
+    return graph
+
+
+class TestSearchQueries:
+    """Test cases for search SPARQL query building"""
+    
+    @pytest.mark.parametrize("search_type", ["semantic", "textual"])
+    @pytest.mark.parametrize("needle", ["MAIN", "MA"])
+    def test_basic_queries_match_case_insensitively(self, search_service, asset_graph, search_type, needle):
+        """Test basic queries match any text field regardless of case"""
+        sparql = search_service._build_basic_search_query(UnifiedSearchQuery(query=needle, search_type=search_type))
+        
+        assert {str(row.fileName) for row in asset_graph.query(sparql)} == {"main.py", "notes.md"}
+    
+    def test_long_needles_use_case_insensitive_regex(self, search_service):
+        """Test needles of three or more characters match with REGEX "i" instead of LCASE"""
+        sparql = search_service._build_semantic_search_query("main", 10, 0)
+        
+        assert "LCASE(" not in sparql
+        assert sparql.count('REGEX(') == 6
+        assert 'REGEX(STR(?title), "main", "i")' in sparql
+    
+    def test_short_needles_are_lowercased_once(self, search_service):
+        """Test short needles keep CONTAINS with a single bound lowercase needle"""
+        sparql = search_service._build_semantic_search_query("Ma", 10, 0)
+        
+        assert "REGEX(" not in sparql
+        assert sparql.count('"Ma"') == 1
+        assert "BIND(CONTAINS(LCASE(STR(?title)), ?qL) AS ?titleMatch)" in sparql
+    
+    def test_regex_metacharacters_are_matched_literally(self, search_service, asset_graph):
+        """Test regex syntax in the needle is escaped for the store"""
+        from rdflib import Literal, URIRef
+        from rdflib.namespace import RDF, RDFS
+        
+        asset = URIRef("http://sbekms.example.org/instances/c++")
+        asset_graph.add((asset, RDF.type, URIRef("http://purl.example.org/web_dev_km_bfo#DigitalInformationCarrier")))
+        asset_graph.add((asset, RDFS.label, Literal("notes (c++).md")))
+        
+        sparql = search_service._build_textual_search_query("(c++)", 10, 0)
+        assert [str(row.fileName) for row in asset_graph.query(sparql)] == ["notes (c++).md"]
+        
+        sparql = search_service._build_textual_search_query("n.tes", 10, 0)
+        assert list(asset_graph.query(sparql)) == []
+    
+    def test_untitled_assets_still_match_on_file_name(self, search_service, asset_graph):
+        """Test unbound optional fields do not drop rows that match elsewhere"""
+        from rdflib import Literal, URIRef
+        from rdflib.namespace import RDF, RDFS
+        
+        asset = URIRef("http://sbekms.example.org/instances/mainframe.txt")
+        asset_graph.add((asset, RDF.type, URIRef("http://purl.example.org/web_dev_km_bfo#DigitalInformationCarrier")))
+        asset_graph.add((asset, RDFS.label, Literal("mainframe.txt")))
+        
+        for search_type in ("semantic", "textual"):
+            sparql = search_service._build_basic_search_query(UnifiedSearchQuery(query="frame", search_type=search_type))
+            assert [str(row.fileName) for row in asset_graph.query(sparql)] == ["mainframe.txt"]
+    
+    def test_semantic_query_ranks_file_name_matches_first(self, search_service, asset_graph):
+        """Test file name matches outrank title matches"""
+        sparql = search_service._build_semantic_search_query("main", 10, 0)
+        
+        assert str(next(iter(asset_graph.query(sparql))).fileName) == "main.py"
+    
+    def test_tags_are_grouped_into_one_row(self, search_service, asset_graph):
+        """Test multiple tags no longer multiply the result rows"""
+        from rdflib import Literal, Namespace, URIRef
+        from rdflib.namespace import RDFS
+        
+        wdo = Namespace("http://purl.example.org/web_dev_km_bfo#")
+        asset = URIRef("http://sbekms.example.org/instances/main.py")
+        for tag in ("cli", "entry"):
+            tag_uri = URIRef(f"http://sbekms.example.org/instances/tag-{tag}")
+            asset_graph.add((asset, wdo.hasTag, tag_uri))
+            asset_graph.add((tag_uri, RDFS.label, Literal(tag)))
+        
+        sparql = search_service._build_textual_search_query("main.py", 10, 0)
+        rows = list(asset_graph.query(sparql))
+        
+        assert len(rows) == 2  # one per rdf:type
+        assert {tuple(sorted(str(row.tags).split("|"))) for row in rows} == {("cli", "entry")}
+    
+    def test_ranked_pages_follow_global_score_order(self, search_service, asset_graph):
+        """Test ranking stays in the store so pagination follows the global order"""
+        everything = search_service._build_semantic_search_query("main", 10, 0)
+        last_page = search_service._build_semantic_search_query("main", 2, 2)
+        
+        assert "ORDER BY DESC(?rank) ?fileName" in everything
+        # One row per rdf:type of each asset
+        assert [str(row.fileName) for row in asset_graph.query(everything)] == ["main.py"] * 2 + ["notes.md"] * 2
+        assert [str(row.fileName) for row in asset_graph.query(last_page)] == ["notes.md"] * 2
+    
+    def test_advanced_query_combines_text_and_class_filters(self, search_service, asset_graph):
+        """Test advanced queries apply the needle together with structured filters"""
+        query = UnifiedSearchQuery(query="main", search_type="semantic", wdo_classes=["DocumentationFile"])
+        sparql = search_service._build_advanced_search_query(query)
+        
+        assert {str(row.fileName) for row in asset_graph.query(sparql)} == {"notes.md"}
+    
+    def test_advanced_skeleton_is_reused_per_filter_shape(self, search_service):
+        """Test queries with the same populated filters share one cached skeleton"""
+        from app.api.search import _advanced_query_template
+        
+        _advanced_query_template.cache_clear()
+        first = search_service._build_advanced_search_query(UnifiedSearchQuery(query="main", tags=["a"], author="x"))
+        second = search_service._build_advanced_search_query(UnifiedSearchQuery(query="other", tags=["b", "c"], author="y"))
+        
+        assert _advanced_query_template.cache_info().misses == 1
+        assert _advanced_query_template.cache_info().hits == 1
+        assert 'LCASE("x")' in first and 'LCASE("y")' in second
+        assert 'LCASE("c")' in second
+    
+    def test_sparql_literal_escapes_quotes_and_newlines(self):
+        """Test user text cannot terminate the literal it is embedded in"""
+        assert _sparql_literal('say "hi"\\\n') == '"say \\"hi\\"\\\\\\n"'
+    
+    def test_advanced_query_paginates_before_enrichment(self, search_service, asset_graph):
+        """Test candidates are limited in a sub-SELECT and only then joined with their metadata"""
+        from rdflib import Literal, Namespace, URIRef
+        from rdflib.namespace import RDFS
+        
+        wdo = Namespace("http://purl.example.org/web_dev_km_bfo#")
+        asset = URIRef("http://sbekms.example.org/instances/main.py")
+        for tag in ("cli", "entry"):
+            tag_uri = URIRef(f"http://sbekms.example.org/instances/tag-{tag}")
+            asset_graph.add((asset, wdo.hasTag, tag_uri))
+            asset_graph.add((tag_uri, RDFS.label, Literal(tag)))
+        
+        class_only = search_service._build_advanced_search_query(
+            UnifiedSearchQuery(query="x", wdo_classes=["PythonSourceCodeFile"])
+        )
+        candidates = class_only[class_only.index("SELECT DISTINCT"):class_only.index("LIMIT")]
+        assert "OPTIONAL { ?asset dcterms:title ?title }" in candidates
+        assert "dcterms:creator" not in candidates and "wdo:hasTag" not in candidates
+        
+        sparql = search_service._build_advanced_search_query(
+            UnifiedSearchQuery(query="main", search_type="semantic", tags=["cli"], limit=1)
+        )
+        rows = list(asset_graph.query(sparql))
+        
+        assert [str(row.fileName) for row in rows] == ["main.py"]
+        assert sorted(str(rows[0].tags).split("|")) == ["cli", "entry"]
+    
+    def test_quoted_input_is_matched_literally(self, search_service, asset_graph):
+        """Test quotes in the search text produce a valid query instead of injected SPARQL"""
+        query = UnifiedSearchQuery(query='main") || true || ("', tags=['x"y'], author='a"b')
+        
+        assert list(asset_graph.query(search_service._build_advanced_search_query(query))) == []
+        assert list(asset_graph.query(search_service._build_semantic_search_query(query.query, 10, 0))) == []
+    
+    @pytest.mark.parametrize("field, value", [
+        ("wdo_classes", ["File } DROP"]),
+        ("file_types", ['py$", "i") || true || REGEX(?x, "']),
+    ])
+    def test_unsafe_names_are_rejected(self, field, value):
+        """Test class names and file types must be plain identifiers"""
+        with pytest.raises(ValidationError):
+            UnifiedSearchQuery(query="main", **{field: value})
+
+
+class TestSearchResultProcessing:
+    """Test cases for converting SPARQL rows into search results"""
+    
+    def test_relevance_and_highlights_are_case_insensitive(self, search_service):
+        """Test scoring and snippets use one compiled pattern across fields"""
+        import re
+        
+        description = "x" * 50 + " the MAIN loop " + "y" * 100
+        row = {
+            'asset': {'value': 'http://sbekms.example.org/instances/asset-1'},
+            'fileName': {'value': 'Main.py'},
+            'title': {'value': 'Unrelated'},
+            'description': {'value': description},
+            'tags': {'value': 'mainline|other'},
+        }
+        result = search_service._process_search_result(row, re.compile(re.escape("main"), re.IGNORECASE))
+        
+        assert result.relevance_score == pytest.approx(0.8)
+        assert result.highlights[0] == "📄 Main.py"
+        assert result.highlights[1].startswith("📝 ...") and "MAIN loop" in result.highlights[1]
+        assert result.highlights[2] == "🏷️ mainline"
+    
+    def test_description_snippet_is_anchored_on_match(self, search_service):
+        """Test the snippet spans 30 characters before and 70 after the match"""
+        import re
+        
+        description = "a" * 40 + "MAIN" + "b" * 200
+        row = {'fileName': {'value': 'x.py'}, 'description': {'value': description}}
+        result = search_service._process_search_result(row, re.compile("main", re.IGNORECASE))
+        
+        assert result.highlights == [f"📝 ...{'a' * 30}MAIN{'b' * 70}..."]
+    
+    @pytest.mark.asyncio
+    async def test_large_result_sets_keep_row_order(self, search_service):
+        """Test streamed rows mapped on the worker pool come back in query order"""
+        from app.api.search import THREADED_ROW_THRESHOLD, ROW_WORKERS
+        
+        rows = [
+            {'asset': {'value': f'http://sbekms.example.org/instances/asset-{i}'}, 'fileName': {'value': f'main{i}.py'}}
+            for i in range(THREADED_ROW_THRESHOLD * (ROW_WORKERS + 2) + 3)
+        ]
+        search_service.triplestore.query_stream = stream_of({'results': {'bindings': rows}})
+        results = await search_service._run_search_query("SELECT * WHERE { ?s ?p ?o }", "main")
+        
+        assert [result.asset_id for result in results] == [f'asset-{i}' for i in range(len(rows))]
+    
+    @pytest.mark.parametrize("created, expected", [
+        ("2024-03-05T10:20:30Z", datetime(2024, 3, 5, 10, 20, 30, tzinfo=timezone.utc)),
+        ("2024-03-05T10:20:30.123456+00:00", datetime(2024, 3, 5, 10, 20, 30, 123456, tzinfo=timezone.utc)),
+        ("2024-03-05", datetime(2024, 3, 5)),
+        ("not a date", datetime(2024, 1, 1)),
+    ])
+    def test_created_at_parsing(self, search_service, created, expected):
+        """Test creation dates parse in every stored shape and fall back when malformed"""
+        import re
+        
+        row = {'fileName': {'value': 'x.py'}, 'created': {'value': created}}
+        result = search_service._process_search_result(row, re.compile("main", re.IGNORECASE))
+        
+        assert result.created_at == expected
+    
+    def test_constructed_result_matches_validated_model(self, search_service):
+        """Test skipping per-row validation yields the same model as validating it"""
+        import re
+        from app.models.common import SearchResult
+        
+        row = SAMPLE_BINDINGS['results']['bindings'][0]
+        result = search_service._process_search_result(row, re.compile("main", re.IGNORECASE))
+        
+        assert SearchResult.model_validate(result.model_dump()) == result
+        assert result.file_size == 42
+        assert result.wdo_classes == ["PythonSourceCodeFile"]
+    
+    def test_special_characters_are_matched_literally(self, search_service):
+        """Test regex metacharacters in the query are escaped"""
+        import re
+        
+        row = {'fileName': {'value': 'a+b.txt'}}
+        result = search_service._process_search_result(row, re.compile(re.escape("a+b"), re.IGNORECASE))
+        
+        assert result.highlights == ["📄 a+b.txt"]
+    
+    @pytest.mark.parametrize("file_name, expected", [
+        ("main.PY", "py"),
+        ("archive.tar.gz", "gz"),
+        (".bashrc", "bashrc"),
+        ("Makefile", "unknown"),
+    ])
+    def test_extract_file_type(self, file_name, expected):
+        """Test file types come from the last extension"""
+        assert _extract_file_type(file_name) == expected
+    
+    @pytest.mark.parametrize("class_uri, expected", [
+        ("http://purl.example.org/web_dev_km_bfo#PythonSourceCodeFile", "PythonSourceCodeFile"),
+        ("http://example.org/classes/Documentation", "Documentation"),
+        ("Plain", "Plain"),
+    ])
+    def test_extract_class_name(self, class_uri, expected):
+        """Test class names are the local part of the URI"""
+        assert _extract_class_name(class_uri) == expected
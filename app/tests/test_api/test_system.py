@@ -168,4 +168,162 @@ class TestSystemAPI:
         assert health_response.status_code == 200
         health_data = health_response.json()
         assert "version" in health_data
-        assert health_data["version"] == "1.0.0" 
\ No newline at end of file
+        assert health_data["version"] == "1.0.0" 
+    
+    def test_responses_carry_process_time(self, client):
+        """Test the timing middleware adds X-Process-Time to every response"""
+        response = client.get("/api/system/health")
+        missing = client.get("/api/system/does-not-exist")
+        
+        assert float(response.headers["x-process-time"]) >= 0
+        assert missing.status_code == 404
+        assert "x-process-time" in missing.headers
+    
+    def test_cors_preflight_is_cacheable(self, client):
+        """Test preflight responses allow ETag revalidation and may be cached for a day"""
+        response = client.options("/api/system/health", headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "if-none-match"
+        })
+        
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == "86400"
+        assert "If-None-Match" in response.headers["access-control-allow-headers"]
+    
+    def test_startup_failure_is_isolated(self, caplog):
+        """Test the lifespan runs every initializer and a failing one does not stop the app from starting"""
+        semantic_annotator = MagicMock()
+        
+        with patch("app.main._ensure_upload_dir", AsyncMock(side_effect=OSError("read-only filesystem"))), \
+             patch("app.dependencies.get_semantic_annotator", return_value=semantic_annotator), \
+             patch("app.main._load_ontology", AsyncMock()):
+            with TestClient(app) as client:
+                response = client.get("/health")
+        
+        assert response.status_code == 200
+        semantic_annotator.build_asset_triples.assert_called_once()
+        assert any("upload directory failed: read-only filesystem" in record.getMessage() for record in caplog.records)
+    
+    def test_unhandled_exceptions_become_json_500(self):
+        """Test the error middleware answers with a generic JSON 500 instead of propagating the exception"""
+        from app.main import ErrorHandlerMiddleware
+        
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("database password leaked")
+        
+        with patch("app.main.settings.DEBUG", False):
+            response = TestClient(ErrorHandlerMiddleware(failing_app)).get("/")
+        
+        assert response.status_code == 500
+        assert response.json() == {"error": "Internal server error", "detail": "An unexpected error occurred"}
+
+
+class TestSystemResponseCache:
+    """Test cases for caching of polled system endpoints"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_caches(self):
+        """Start every test with empty response caches"""
+        from app.utils.cache import clear_query_caches
+        clear_query_caches()
+        yield
+        clear_query_caches()
+        app.dependency_overrides.clear()
+    
+    @pytest.fixture
+    def ontology_manager(self):
+        """Loaded ontology manager mock"""
+        from app.dependencies import get_ontology_manager
+        manager = MagicMock()
+        manager.loaded = True
+        manager.version_hash = "0123456789abcdef"
+        manager.get_classes.return_value = ["DigitalInformationCarrier"]
+        manager.get_ontology_stats = AsyncMock(return_value={"classes": 1})
+        app.dependency_overrides[get_ontology_manager] = lambda: manager
+        return manager
+    
+    def test_ontology_classes_are_cached(self, client, ontology_manager):
+        """Test repeated ontology listings are served from the cache"""
+        first = client.get("/api/system/ontology/classes")
+        second = client.get("/api/system/ontology/classes")
+        
+        assert first.json()["data"] == second.json()["data"]
+        assert ontology_manager.get_classes.call_count == 1
+    
+    def test_ontology_hierarchy_keeps_success_envelope(self, client, ontology_manager):
+        """Test ontology listings serialized directly by orjson keep the SuccessResponse shape"""
+        ontology_manager.get_class_hierarchy.return_value = {"Thing": ["DigitalInformationCarrier"]}
+        
+        response = client.get("/api/system/ontology/hierarchy")
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "success"
+        assert body["message"] == "Ontology hierarchy retrieved successfully"
+        assert body["data"] == {"Thing": ["DigitalInformationCarrier"]}
+        assert body["timestamp"].endswith("+00:00")
+    
+    def test_ontology_listings_revalidate_with_etag(self, client, ontology_manager):
+        """Test ontology listings carry the ontology ETag and answer 304 when it matches"""
+        ontology_manager.get_properties.return_value = ["hasFileSize"]
+        first = client.get("/api/system/ontology/properties")
+        etag = first.headers["etag"]
+        second = client.get("/api/system/ontology/properties", headers={"If-None-Match": etag})
+        
+        assert etag == '"0123456789abcdef"'
+        assert first.headers["cache-control"] == "private, max-age=60"
+        assert second.status_code == 304
+        assert second.content == b""
+        assert ontology_manager.get_properties.call_count == 1
+    
+    def test_internal_errors_hide_exception_text(self, client, ontology_manager, caplog):
+        """Test a failing endpoint returns a generic 500 with an error id that appears in the log"""
+        ontology_manager.get_ontology_stats.side_effect = Exception("secret connection string")
+        
+        response = client.get("/api/system/ontology/stats")
+        
+        assert response.status_code == 500
+        detail = response.json()["detail"]
+        assert "secret" not in detail
+        error_id = detail.rsplit(" ", 1)[-1].rstrip(")")
+        assert any(getattr(record, "error_id", None) == error_id and record.exc_info for record in caplog.records)
+    
+    def test_status_is_cached_and_reports_cache_counters(self, client, ontology_manager):
+        """Test status polling reuses the snapshot until the store changes"""
+        from app.dependencies import get_triplestore_client
+        from app.utils.cache import clear_query_caches
+        
+        triplestore = AsyncMock()
+        triplestore.get_status_bundle.return_value = {"connected": False, "repository_exists": False, "stats": None}
+        app.dependency_overrides[get_triplestore_client] = lambda: triplestore
+        
+        client.get("/api/system/status")
+        response = client.get("/api/system/status")
+        clear_query_caches()
+        client.get("/api/system/status")
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["caches"]["system"]["hits"] >= 1
+        assert triplestore.get_status_bundle.await_count == 2
+    
+    def test_status_reports_triplestore_bundle(self, client, ontology_manager):
+        """Test status takes connectivity, existence and stats from one triplestore call"""
+        from app.dependencies import get_triplestore_client
+        
+        triplestore = AsyncMock()
+        triplestore.get_status_bundle.return_value = {
+            "connected": True,
+            "repository_exists": True,
+            "stats": {"triple_count": 641, "graph_count": 1}
+        }
+        app.dependency_overrides[get_triplestore_client] = lambda: triplestore
+        
+        response = client.get("/api/system/status")
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["triplestore"]["repository_exists"] is True
+        assert response.json()["data"]["triplestore"]["stats"]["triple_count"] == 641
+        assert response.json()["data"]["ontology"] == {"classes": 1}
+        triplestore.test_connection.assert_not_awaited()
+        triplestore.repository_exists.assert_not_awaited()
@@ -0,0 +1,241 @@
+import hashlib
+import pytest
+
+from app.core.artifact_parser import ArtifactParser, FileMetadata, READ_CHUNK_SIZE, _count_words
+
+
+@pytest.fixture
+def parser():
+    """Create an ArtifactParser instance for testing"""
+    return ArtifactParser()
+
+
+class TestArtifactParser:
+    """Test cases for ArtifactParser"""
+    
+    def test_parse_javascript(self, parser):
+        """Test functions, classes, imports and comments are extracted from JavaScript"""
+        metadata = FileMetadata("app.js")
+        content = (
+            "import React from 'react'\n"
+            "const api = require('./api')\n"
+            "// entry point\n"
+            "class App extends Component {}\n"
+            "function render() {}\n"
+            "/* block\n comment */\n"
+        )
+        
+        parser._parse_javascript(metadata, content)
+        
+        assert metadata.imports == ["react", "./api"]
+        assert metadata.classes == [{'name': 'App', 'extends': 'Component'}]
+        assert {'name': 'render'} in metadata.functions
+        assert metadata.comments == ["entry point", "block\n comment"]
+    
+    def test_function_names_are_whole_identifiers(self, parser):
+        """Test function patterns capture complete identifiers"""
+        js = FileMetadata("app.js")
+        generic = FileMetadata("main.c")
+        
+        parser._parse_javascript(js, "const handleClick = () => {}\nconst api = { fetchAll: function () {} }\n")
+        parser._parse_generic_code(generic, "int compute_total(int a) {\n  return a;\n}\n")
+        
+        assert js.functions == [{'name': 'handleClick'}, {'name': 'fetchAll'}]
+        assert generic.functions == [{'name': 'compute_total'}]
+    
+    def test_parse_markdown(self, parser):
+        """Test headings, links and images are extracted from Markdown"""
+        metadata = FileMetadata("README.md")
+        
+        parser._parse_markdown(metadata, "# Title\n## Usage\nSee [docs](docs.md) ![logo](logo.png)\n")
+        
+        assert metadata.headings == [{'level': 1, 'text': 'Title'}, {'level': 2, 'text': 'Usage'}]
+        assert {'text': 'docs', 'url': 'docs.md'} in metadata.links
+        assert metadata.images == [{'alt': 'logo', 'src': 'logo.png'}]
+    
+    def test_parse_python(self, parser):
+        """Test nested definitions, imports and real comments are extracted from Python"""
+        metadata = FileMetadata("models.py")
+        content = (
+            "import os\n"
+            "from typing import List\n"
+            "import os\n"
+            "\n"
+            "class Repo(Base):\n"
+            "    # repository wrapper\n"
+            "    def load(self, path):\n"
+            "        return '#not a comment'\n"
+        )
+        
+        parser._parse_python(metadata, content)
+        
+        assert metadata.imports == ["os", "typing.List", "os"]
+        assert sorted(metadata.dependencies) == ["os", "typing.List"]
+        assert metadata.classes[0]['name'] == "Repo"
+        assert metadata.classes[0]['bases'] == ["Base"]
+        assert metadata.functions[0]['name'] == "load"
+        assert metadata.functions[0]['args'] == ["self", "path"]
+        assert metadata.comments == ["repository wrapper"]
+    
+    def test_parse_config_files(self, parser):
+        """Test JSON and YAML configuration keys are flattened"""
+        json_file = FileMetadata("package.json")
+        yaml_file = FileMetadata("config.yml")
+        
+        parser._parse_json(json_file, '{"name": "app", "scripts": {"build": "vite"}, "version": 2}')
+        parser._parse_yaml(yaml_file, "server:\n  port: 8000\ndebug: true\n")
+        
+        assert sorted(json_file.config_keys) == ["name", "scripts", "scripts.build", "version"]
+        assert json_file.config_values["version"] == 2
+        assert sorted(yaml_file.config_keys) == ["debug", "server", "server.port"]
+        assert yaml_file.config_values["server"]["port"] == 8000
+    
+    def test_parse_json_accepts_what_the_stdlib_accepts(self, parser):
+        """Test NaN/Infinity and integers wider than 64 bits still yield config keys"""
+        metadata = FileMetadata("metrics.json")
+        
+        parser._parse_json(metadata, '{"threshold": NaN, "limit": Infinity, "id": 123456789012345678901234567890}')
+        
+        assert metadata.config_keys == ["threshold", "limit", "id"]
+        assert metadata.config_values["id"] == 123456789012345678901234567890
+        
+        invalid = FileMetadata("broken.json")
+        parser._parse_json(invalid, '{"name": ')
+        assert invalid.config_keys == []
+    
+    def test_flatten_json_keys_keeps_document_order(self, parser):
+        """Test nested keys are yielded depth-first in document order"""
+        data = {"a": {"b": {"c": 1}, "d": 2}, "e": 3}
+        
+        assert list(parser._flatten_json_keys(data)) == ["a", "a.b", "a.b.c", "a.d", "e"]
+    
+    def test_suggested_wdo_classes_are_ordered(self, parser):
+        """Test suggestions keep a stable order with the language class first"""
+        metadata = FileMetadata("app.py")
+        metadata.programming_language = "python"
+        metadata.functions = [{'name': 'main'}]
+        
+        assert parser.get_suggested_wdo_classes(metadata) == [
+            'PythonSourceCodeFile',
+            'DigitalInformationCarrier',
+            'InformationContentEntity',
+            'FunctionDefinitionContent'
+        ]
+    
+    @pytest.mark.parametrize("language, content, expected_functions", [
+        ("typescript", "function render() {}\n", [{'name': 'render'}]),
+        ("go", "func main() {\n}\n", [{'name': 'main'}]),
+    ])
+    def test_parse_by_language_dispatch(self, parser, language, content, expected_functions):
+        """Test languages without a dedicated parser fall back to generic parsing"""
+        metadata = FileMetadata("source")
+        metadata.programming_language = language
+        
+        parser._parse_by_language(metadata, content)
+        
+        assert metadata.functions == expected_functions
+    
+    @pytest.mark.asyncio
+    async def test_parse_file_from_content(self, parser):
+        """Test a Python upload is hashed, measured and parsed"""
+        content = b"# helper module\nimport os\n\ndef main():\n    return os.getcwd()\n"
+        
+        metadata = await parser.parse_file("helper.py", content)
+        
+        assert metadata.programming_language == "python"
+        assert len(metadata.checksum) == 64
+        assert metadata.line_count == 6
+        assert metadata.word_count == 9
+        assert metadata.imports == ["os"]
+        assert metadata.functions[0]['name'] == "main"
+        assert metadata.comments == ["helper module"]
+    
+    @pytest.mark.asyncio
+    async def test_large_files_parse_in_the_process_pool(self, parser, monkeypatch):
+        """Test files above the threshold go to the lazily created pool, which shuts down cleanly"""
+        from app.core import artifact_parser as module
+        
+        content = b"def main():\n    pass\n"
+        assert module._parser_pool is None
+        small = await parser.parse_file("helper.py", content)
+        assert module._parser_pool is None
+        
+        monkeypatch.setattr(module, "PROCESS_PARSE_THRESHOLD", len(content))
+        try:
+            large = await parser.parse_file("helper.py", content)
+            assert module._parser_pool is not None
+        finally:
+            module.shutdown_parser_pool()
+        
+        assert module._parser_pool is None
+        assert large.functions == small.functions
+        assert large.checksum == small.checksum
+    
+    @pytest.mark.asyncio
+    async def test_parse_file_streams_from_disk(self, parser, tmp_path):
+        """Test reading from disk hashes and decodes across chunk boundaries"""
+        # A multi-byte character straddles the first chunk boundary
+        raw = ("a" * (READ_CHUNK_SIZE - 1) + "é\n" + "word " * 10).encode("utf-8")
+        path = tmp_path / "notes.txt"
+        path.write_bytes(raw)
+        
+        metadata = await parser.parse_file(str(path))
+        
+        assert metadata.checksum == hashlib.sha256(raw).hexdigest()
+        assert metadata.encoding == "utf-8"
+        assert metadata.character_count == len(raw.decode("utf-8"))
+        assert metadata.word_count == 11
+    
+    @pytest.mark.parametrize("name", ["logo.png", "favicon.ico"])
+    @pytest.mark.asyncio
+    async def test_binary_files_are_only_checksummed(self, parser, tmp_path, name):
+        """Test images skip decoding, text statistics and language parsing"""
+        raw = b"\x89PNG\r\n\x1a\n# not a comment\n" * 100
+        path = tmp_path / name
+        path.write_bytes(raw)
+        
+        from_disk = await parser.parse_file(str(path))
+        from_upload = await parser.parse_file(name, raw)
+        
+        for metadata in (from_disk, from_upload):
+            assert metadata.checksum == hashlib.sha256(raw).hexdigest()
+            assert metadata.character_count == 0 and metadata.line_count == 0
+            assert metadata.comments == []
+    
+    @pytest.mark.asyncio
+    async def test_parse_file_falls_back_for_non_utf8(self, parser, tmp_path):
+        """Test files that are not UTF-8 are decoded with the fallback encodings"""
+        raw = "café\n".encode("latin-1")
+        path = tmp_path / "legacy.txt"
+        path.write_bytes(raw)
+        
+        metadata = await parser.parse_file(str(path))
+        
+        assert metadata.checksum == hashlib.sha256(raw).hexdigest()
+        assert metadata.encoding != "utf-8"
+        assert metadata.character_count == 5
+    
+    @pytest.mark.parametrize("raw, encoding, text", [
+        ("naïve “quote” – ok".encode("cp1252"), "cp1252", "naïve “quote” – ok"),
+        ("olé!".encode("latin-1"), "cp1252", "olé!"),
+        ("hi\n".encode("utf-16"), "utf-16", "hi\n"),
+        (b"\x81\x8d", "latin-1", "\x81\x8d"),
+    ])
+    def test_decode_content_encodings(self, parser, raw, encoding, text):
+        """Test UTF-16 needs a byte-order mark and cp1252 is preferred over latin-1"""
+        metadata = FileMetadata("file.txt")
+        
+        assert parser._decode_content(raw, metadata) == text
+        assert metadata.encoding == encoding
+    
+    @pytest.mark.parametrize("content", [
+        "",
+        "   ",
+        "one",
+        "x" * (READ_CHUNK_SIZE * 2 + 5),
+        ("word\u00a0next\tthird\n" * READ_CHUNK_SIZE),
+        " lead" + "y" * READ_CHUNK_SIZE + " tail ",
+    ])
+    def test_count_words_matches_split(self, content):
+        """Test chunked counting agrees with str.split, including words longer than a chunk"""
+        assert _count_words(content) == len(content.split())
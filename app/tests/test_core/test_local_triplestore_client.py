@@ -0,0 +1,119 @@
+import pytest
+from rdflib import Literal, Namespace
+from rdflib.namespace import RDF, RDFS, XSD
+
+from app.core.local_triplestore_client import LocalTriplestoreClient
+
+
+@pytest.fixture
+def local_client():
+    """Create an in-memory LocalTriplestoreClient for testing"""
+    return LocalTriplestoreClient()
+
+
+@pytest.fixture
+def sample_triples():
+    """Sample RDF triples for testing"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    SBEKMS = Namespace("http://sbekms.example.org/instances/")
+    
+    return [
+        (SBEKMS.asset_123, RDF.type, WDO.DigitalInformationCarrier),
+        (SBEKMS.asset_123, RDFS.label, Literal("test.py")),
+        (SBEKMS.asset_123, WDO.hasFileSize, Literal(1024, datatype=XSD.integer))
+    ]
+
+
+class TestLocalTriplestoreClient:
+    """Test cases for LocalTriplestoreClient"""
+    
+    @pytest.mark.asyncio
+    async def test_query_returns_sparql_json(self, local_client, sample_triples):
+        """Test SELECT results use the SPARQL JSON results shape"""
+        assert await local_client.add_triples(sample_triples) is True
+        
+        results = await local_client.query(
+            "SELECT ?label ?size WHERE { ?s <http://www.w3.org/2000/01/rdf-schema#label> ?label . "
+            "OPTIONAL { ?s <http://purl.example.org/web_dev_km_bfo#hasFileSize> ?size } }"
+        )
+        
+        bindings = results["results"]["bindings"]
+        assert results["head"]["vars"] == ["label", "size"]
+        assert bindings[0]["label"]["value"] == "test.py"
+        assert bindings[0]["size"] == {
+            "type": "literal",
+            "value": "1024",
+            "datatype": "http://www.w3.org/2001/XMLSchema#integer"
+        }
+    
+    @pytest.mark.asyncio
+    async def test_query_stream_matches_query(self, local_client, sample_triples):
+        """Test streamed bindings equal the materialized ones"""
+        await local_client.add_triples(sample_triples)
+        sparql = "SELECT ?s ?p ?o WHERE { ?s ?p ?o }"
+        
+        streamed = [binding async for binding in local_client.query_stream(sparql)]
+        
+        assert streamed == (await local_client.query(sparql))["results"]["bindings"]
+        assert len(streamed) == 3
+    
+    @pytest.mark.asyncio
+    async def test_update_applies_multiple_operations(self, local_client):
+        """Test ';'-separated updates are applied and invalid ones reported"""
+        assert await local_client.update(
+            'INSERT DATA { <http://ex.org/a> <http://ex.org/p> "a" };\n'
+            'INSERT DATA { <http://ex.org/b> <http://ex.org/p> "b" }'
+        ) is True
+        assert (await local_client.get_repository_stats())["triple_count"] == 2
+        
+        assert await local_client.update("NOT SPARQL") is False
+    
+    @pytest.mark.asyncio
+    async def test_stats_and_clear(self, local_client, sample_triples):
+        """Test triple counting and clearing"""
+        await local_client.add_triples(sample_triples)
+        assert (await local_client.get_repository_stats())["triple_count"] == 3
+        
+        assert await local_client.add_triples_bulk([sample_triples[:1], sample_triples[1:]]) is True
+        assert (await local_client.get_repository_stats())["triple_count"] == 3
+        
+        assert await local_client.add_triples_stream(triple for triple in sample_triples) is True
+        assert (await local_client.get_repository_stats())["triple_count"] == 3
+        
+        bundle = await local_client.get_status_bundle()
+        assert bundle["repository_exists"] is True
+        assert bundle["stats"]["triple_count"] == 3
+        assert bundle["stats"]["graph_count"] == 0
+        
+        assert await local_client.clear_repository() is True
+        assert (await local_client.get_repository_stats())["triple_count"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_derived_caches(self, local_client, sample_triples):
+        """Test a read after a write sees the new data instead of a cached pre-write result"""
+        from unittest.mock import MagicMock
+        from app.api.graph import get_graph_analytics
+        from app.utils.cache import clear_query_caches, query_cache_generation
+        
+        clear_query_caches()
+        before = await get_graph_analytics(local_client, MagicMock())
+        generation = query_cache_generation()
+        
+        assert await local_client.add_triples(sample_triples) is True
+        after_add = await get_graph_analytics(local_client, MagicMock())
+        assert await local_client.update("DELETE WHERE { ?s <http://www.w3.org/2000/01/rdf-schema#label> ?o }") is True
+        after_update = await get_graph_analytics(local_client, MagicMock())
+        assert await local_client.clear_repository() is True
+        after_clear = await get_graph_analytics(local_client, MagicMock())
+        
+        assert before.data["basic_statistics"]["total_triples"] == 0
+        assert after_add.data["basic_statistics"]["total_triples"] == 3
+        assert after_update.data["basic_statistics"]["total_triples"] == 2
+        assert after_clear.data["basic_statistics"]["total_triples"] == 0
+        assert query_cache_generation() == generation + 3
+    
+    @pytest.mark.asyncio
+    async def test_invalid_query_raises(self, local_client):
+        """Test query errors are surfaced"""
+        with pytest.raises(Exception):
+            await local_client.query("NOT SPARQL")
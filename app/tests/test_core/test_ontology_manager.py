@@ -1,3 +1,5 @@
+import gzip
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from rdflib import Graph, URIRef, Literal, Namespace
@@ -110,4 +112,248 @@ class TestOntologyManager:
             for key in required_keys:
                 assert key in stats
                 assert isinstance(stats[key], int)
-                assert stats[key] >= 0 
\ No newline at end of file
+                assert stats[key] >= 0 
+
+@pytest.mark.asyncio
+async def test_class_hierarchy_is_precomputed_at_load(ontology_manager, sample_ontology_graph):
+    """Test the class tree is built from the subclass index once the ontology is loaded"""
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    ontology_manager._class_hierarchy = ontology_manager._build_class_hierarchy()
+    ontology_manager.loaded = True
+    
+    hierarchy = ontology_manager.get_class_hierarchy()
+    
+    assert hierarchy["total_classes"] == 3
+    assert [root["name"] for root in hierarchy["root_classes"]] == ["DigitalInformationCarrier"]
+    source = hierarchy["root_classes"][0]["subclasses"][0]
+    assert source["name"] == "SourceCodeFile"
+    assert [sub["name"] for sub in source["subclasses"]] == ["PythonSourceCodeFile"]
+    assert ontology_manager.get_class_hierarchy() is hierarchy
+
+
+@pytest.mark.asyncio
+async def test_class_and_property_metadata_come_from_index(ontology_manager, sample_ontology_graph):
+    """Test labels, superclasses and domains are served from the index built at load time"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    sample_ontology_graph.add((WDO.SourceCodeFile, RDFS.label, Literal("Source Code File")))
+    sample_ontology_graph.add((WDO.hasFileSize, RDFS.domain, WDO.DigitalInformationCarrier))
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    ontology_manager.loaded = True
+    
+    # Later graph changes are not visible: lookups no longer scan the graph
+    sample_ontology_graph.remove((WDO.SourceCodeFile, RDFS.label, None))
+    
+    classes = {cls["local_name"]: cls for cls in ontology_manager.get_classes()}
+    properties = {prop["local_name"]: prop for prop in ontology_manager.get_properties()}
+    
+    assert classes["SourceCodeFile"]["label"] == "Source Code File"
+    assert classes["SourceCodeFile"]["subclass_of"] == [str(WDO.DigitalInformationCarrier)]
+    assert classes["DigitalInformationCarrier"]["subclass_of"] == []
+    assert properties["hasFileSize"]["domain"] == [str(WDO.DigitalInformationCarrier)]
+    assert properties["hasMimeType"]["range"] == []
+
+
+@pytest.mark.asyncio
+async def test_validate_triple_checks_domain_and_range(ontology_manager, sample_ontology_graph):
+    """Test domain and range checks against the precomputed URIRef sets"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    asset = URIRef("http://sbekms.example.org/instances/asset_1")
+    module = URIRef("http://sbekms.example.org/instances/module_1")
+    sample_ontology_graph.add((WDO.isPartOf, RDF.type, OWL.ObjectProperty))
+    sample_ontology_graph.add((WDO.isPartOf, RDFS.domain, WDO.SourceCodeFile))
+    sample_ontology_graph.add((WDO.isPartOf, RDFS.range, WDO.SourceCodeFile))
+    sample_ontology_graph.add((asset, RDF.type, WDO.SourceCodeFile))
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    ontology_manager.loaded = True
+    
+    assert ontology_manager.validate_triple(asset, WDO.isPartOf, asset) is True
+    assert ontology_manager.validate_triple(module, WDO.isPartOf, asset) is False
+    assert ontology_manager.validate_triple(asset, WDO.isPartOf, module) is False
+    assert ontology_manager.validate_triple(asset, WDO.unknownProperty, asset) is False
+
+
+def test_rdf_xml_parse_matches_rdflib(ontology_manager, tmp_path):
+    """Test the pyoxigraph RDF/XML parse yields the same graph as rdflib, plain literals included"""
+    path = tmp_path / "mini.owl"
+    path.write_text(
+        '<?xml version="1.0"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"\n'
+        '         xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"\n'
+        '         xmlns:owl="http://www.w3.org/2002/07/owl#">\n'
+        '  <owl:Class rdf:about="http://purl.example.org/web_dev_km_bfo#SourceCodeFile">\n'
+        '    <rdfs:label xml:lang="en">source code file</rdfs:label>\n'
+        '    <rdfs:comment>plain comment</rdfs:comment>\n'
+        '  </owl:Class>\n'
+        '</rdf:RDF>\n'
+    )
+    expected = Graph()
+    expected.parse(str(path), format="xml")
+    
+    graph = Graph()
+    ontology_manager._parse_rdf_xml(graph, path)
+    
+    assert len(graph) == 3
+    assert graph.isomorphic(expected)
+    assert Literal("plain comment") in set(graph.objects(None, RDFS.comment))
+
+
+@pytest.mark.asyncio
+async def test_owl_closure_is_cached_on_disk(tmp_path, monkeypatch):
+    """Test the second load reads the materialized closure instead of re-running OWL-RL"""
+    from app.core import ontology_manager as module
+    
+    path = tmp_path / "skms_ontology.owl"
+    path.write_text(
+        '<?xml version="1.0"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"\n'
+        '         xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"\n'
+        '         xmlns:owl="http://www.w3.org/2002/07/owl#">\n'
+        '  <owl:Class rdf:about="http://purl.example.org/web_dev_km_bfo#SourceCodeFile">\n'
+        '    <rdfs:label>Source Code File</rdfs:label>\n'
+        '    <rdfs:subClassOf rdf:resource="http://purl.example.org/web_dev_km_bfo#DigitalInformationCarrier"/>\n'
+        '  </owl:Class>\n'
+        '</rdf:RDF>\n'
+    )
+    monkeypatch.setattr(module.settings, "ONTOLOGY_PATH", str(path))
+    
+    first = OntologyManager()
+    assert await first.load_ontology() is True
+    closure_files = list(tmp_path.glob("skms_ontology.closure.*"))
+    assert len(closure_files) == 1
+    # Plain JSON data, so a tampered cache file can at worst be rejected, never executed
+    assert closure_files[0].name.endswith(".json.gz")
+    with gzip.open(closure_files[0], "rb") as f:
+        assert len(orjson.loads(f.read())) == len(first.graph)
+    
+    with patch.object(module.owlrl, "DeductiveClosure") as closure:
+        second = OntologyManager()
+        assert await second.load_ontology() is True
+    
+    closure.assert_not_called()
+    assert second.graph.isomorphic(first.graph)
+    assert second.version_hash == first.version_hash
+
+
+@pytest.mark.asyncio
+async def test_validate_triple_uses_type_index(ontology_manager, sample_ontology_graph):
+    """Test validation reads rdf:type from the load-time index rather than the graph"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    asset = URIRef("http://sbekms.example.org/instances/asset_1")
+    sample_ontology_graph.add((WDO.isPartOf, RDF.type, OWL.ObjectProperty))
+    sample_ontology_graph.add((WDO.isPartOf, RDFS.domain, WDO.SourceCodeFile))
+    sample_ontology_graph.add((asset, RDF.type, WDO.SourceCodeFile))
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    ontology_manager.loaded = True
+    
+    with patch.object(ontology_manager, 'graph', Graph()):
+        assert ontology_manager.validate_triple(asset, WDO.isPartOf, asset) is True
+    
+    assert ontology_manager._types[asset] == frozenset({WDO.SourceCodeFile})
+
+
+def test_class_hierarchy_handles_shared_and_cyclic_subclasses(ontology_manager):
+    """Test subtrees reached through several parents are built once and cycles stop at the repeated class"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    root, left, shared, loop = WDO.Root, WDO.Left, WDO.Shared, WDO.Loop
+    ontology_manager.classes = {root, left, shared, loop}
+    ontology_manager._wdo_subclasses = frozenset({left, shared, loop})
+    ontology_manager._subclasses = {root: [left, shared], left: [shared], shared: [loop], loop: [shared]}
+    
+    hierarchy = ontology_manager._build_class_hierarchy()
+    
+    assert [node["name"] for node in hierarchy["root_classes"]] == ["Root"]
+    direct, via_left = hierarchy["root_classes"][0]["subclasses"][1], hierarchy["root_classes"][0]["subclasses"][0]["subclasses"][0]
+    assert direct["name"] == via_left["name"] == "Shared"
+    assert direct["subclasses"][0]["name"] == "Loop"
+    assert direct["subclasses"][0]["subclasses"] == [{}]
+
+
+@pytest.mark.parametrize("extension, expected", [
+    (".PY", ["PythonSourceCodeFile", "SourceCodeFile", "DigitalInformationCarrier"]),
+    (".md", ["DocumentationFile", "DigitalInformationCarrier"]),
+    (".bin", ["DigitalInformationCarrier"]),
+])
+def test_suggest_classes_for_file_is_ordered(ontology_manager, extension, expected):
+    """Test suggestions are deterministic and go from the specific class to the generic carrier"""
+    suggestions = ontology_manager.suggest_classes_for_file(extension, f"file{extension}")
+    
+    assert [uri.split('#')[-1] for uri in suggestions] == expected
+
+
+@pytest.mark.asyncio
+async def test_extracted_terms_are_frozen(ontology_manager, sample_ontology_graph):
+    """Test classes and properties are frozensets after extraction and predicates are checked against them"""
+    WDO = Namespace("http://purl.example.org/web_dev_km_bfo#")
+    sample_ontology_graph.add((WDO.isPartOf, RDF.type, OWL.ObjectProperty))
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    
+    assert isinstance(ontology_manager.classes, frozenset)
+    assert isinstance(ontology_manager.properties, frozenset)
+    assert ontology_manager.is_valid_predicate(WDO.isPartOf) is True
+    assert ontology_manager.is_valid_predicate(WDO.unknownProperty) is False
+
+
+@pytest.mark.asyncio
+async def test_load_ontology_reasons_off_the_event_loop(ontology_manager, monkeypatch):
+    """Test parsing and reasoning are handed to a worker thread"""
+    from app.core import ontology_manager as module
+    
+    to_thread = AsyncMock(return_value=(Graph(), "digest"))
+    monkeypatch.setattr(module.asyncio, "to_thread", to_thread)
+    
+    assert await ontology_manager.load_ontology() is True
+    
+    to_thread.assert_awaited_once()
+    assert to_thread.await_args.args[0] == ontology_manager._load_graph
+    assert ontology_manager.version_hash == "digest"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_swap_in_fresh_graphs_one_at_a_time(ontology_manager, sample_ontology_graph, monkeypatch):
+    """Test the serving graph is replaced rather than mutated, and overlapping loads do not interleave"""
+    import asyncio
+    from app.core import ontology_manager as module
+    
+    active, overlapped = 0, False
+    
+    async def load_in_thread(func, path):
+        nonlocal active, overlapped
+        active += 1
+        overlapped = overlapped or active > 1
+        await asyncio.sleep(0)
+        active -= 1
+        graph = Graph()
+        for triple in sample_ontology_graph:
+            graph.add(triple)
+        return graph, "digest"
+    
+    monkeypatch.setattr(module.asyncio, "to_thread", load_in_thread)
+    serving = ontology_manager.graph
+    
+    assert await asyncio.gather(ontology_manager.load_ontology(), ontology_manager.load_ontology()) == [True, True]
+    
+    assert overlapped is False
+    assert len(serving) == 0
+    assert ontology_manager.graph is not serving
+    assert len(ontology_manager.classes) == 3
+
+
+@pytest.mark.asyncio
+async def test_class_and_property_listings_are_memoized(ontology_manager, sample_ontology_graph):
+    """Test listings are built once per extraction and rebuilt after the ontology is re-extracted"""
+    ontology_manager.graph = sample_ontology_graph
+    await ontology_manager._extract_ontology_structure()
+    ontology_manager.loaded = True
+    
+    classes = ontology_manager.get_classes()
+    assert ontology_manager.get_classes() is classes
+    assert ontology_manager.get_properties() is ontology_manager.get_properties()
+    
+    await ontology_manager._extract_ontology_structure()
+    assert ontology_manager.get_classes() is not classes
+    assert ontology_manager.get_classes() == classes
@@ -86,6 +86,35 @@ class TestSemanticAnnotator:
         assert result == 0  # Should return 0 on failure
         mock_triplestore.add_triples.assert_called_once()
     
+    async def test_annotate_asset_batches_triples(self, semantic_annotator, sample_metadata, mock_triplestore):
+        """Test that triples are posted in batches of at most batch_size"""
+        result = await semantic_annotator.annotate_asset(sample_metadata, mock_triplestore, batch_size=5)
+        
+        batches = [call.args[0] for call in mock_triplestore.add_triples.call_args_list]
+        assert sum(len(batch) for batch in batches) == result
+        assert all(len(batch) <= 5 for batch in batches)
+        assert len(batches) > 1
+    
+    async def test_annotate_asset_rolls_back_when_a_later_batch_fails(self, semantic_annotator, sample_metadata, mock_triplestore):
+        """Test a failure after earlier batches were stored deletes the asset's triples and reports 0"""
+        mock_triplestore.add_triples.side_effect = [True, False]
+        mock_triplestore.update.return_value = True
+        
+        result = await semantic_annotator.annotate_asset(sample_metadata, mock_triplestore, batch_size=5)
+        
+        assert result == 0
+        assert mock_triplestore.add_triples.await_count == 2
+        mock_triplestore.update.assert_awaited_once_with(
+            f"DELETE WHERE {{ <http://sbekms.example.org/instances/asset_{sample_metadata['id']}> ?p ?o }}"
+        )
+    
+    async def test_annotate_asset_first_batch_failure_needs_no_rollback(self, semantic_annotator, sample_metadata, mock_triplestore):
+        """Test nothing is deleted when no batch was stored"""
+        mock_triplestore.add_triples.return_value = False
+        
+        assert await semantic_annotator.annotate_asset(sample_metadata, mock_triplestore, batch_size=5) == 0
+        mock_triplestore.update.assert_not_called()
+    
     async def test_annotate_asset_exception_handling(self, semantic_annotator, mock_triplestore):
         """Test exception handling during annotation"""
         mock_triplestore.add_triples.side_effect = Exception("Triplestore error")
@@ -99,4 +128,30 @@ class TestSemanticAnnotator:
         assert semantic_annotator.WDO is not None
         assert semantic_annotator.SBEKMS is not None
         assert str(semantic_annotator.WDO) == "http://purl.example.org/web_dev_km_bfo#"
-        assert str(semantic_annotator.SBEKMS) == "http://sbekms.example.org/instances/" 
\ No newline at end of file
+        assert str(semantic_annotator.SBEKMS) == "http://sbekms.example.org/instances/"
+    
+    async def test_annotate_assets_bulk_streams_all_assets(self, semantic_annotator, sample_metadata, mock_triplestore):
+        """Test several assets are stored through one triple stream"""
+        streamed = []
+        
+        async def add_triples_stream(triples):
+            streamed.extend(triples)
+            return True
+        
+        mock_triplestore.add_triples_stream.side_effect = add_triples_stream
+        assets = [{**sample_metadata, "id": f"asset-{i}"} for i in range(5)]
+        per_asset = len(semantic_annotator.build_asset_triples(sample_metadata))
+        
+        result = await semantic_annotator.annotate_assets_bulk(assets, mock_triplestore)
+        
+        assert result == len(streamed) == per_asset * 5
+        mock_triplestore.add_triples_stream.assert_awaited_once()
+        mock_triplestore.add_triples.assert_not_called()
+    
+    async def test_annotate_assets_bulk_failure(self, semantic_annotator, sample_metadata, mock_triplestore):
+        """Test bulk annotation returns 0 when the upload fails"""
+        mock_triplestore.add_triples_stream.return_value = False
+        
+        result = await semantic_annotator.annotate_assets_bulk([sample_metadata], mock_triplestore)
+        
+        assert result == 0
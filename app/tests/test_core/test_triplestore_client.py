@@ -1,15 +1,18 @@
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from rdflib import Graph, URIRef, Literal, Namespace
 from rdflib.namespace import RDF, RDFS
 
-from app.core.triplestore_client import TriplestoreClient
+from app.core.triplestore_client import TriplestoreClient, _parse_tsv_term
 from app.config import settings
+from app.utils.cache import clear_query_caches
 
 
 @pytest.fixture
 def triplestore_client():
-    """Create a TriplestoreClient instance for testing"""
+    """Create a TriplestoreClient instance for testing, with no results cached by earlier tests"""
+    clear_query_caches()
     return TriplestoreClient()
 
 
@@ -78,23 +81,306 @@ class TestTriplestoreClient:
         assert "test.py" in turtle_data
         assert "1024" in turtle_data
     
+    def test_serialize_triples_escapes_multiline_literals(self, triplestore_client, sample_triples):
+        """Test literals with newlines and quotes stay on one valid N-Triples line"""
+        description = Literal('first line\nsecond "quoted" line', lang="en")
+        
+        data = triplestore_client._serialize_triples([(sample_triples[0][0], RDFS.comment, description)])
+        
+        assert data.count("\n") == 1
+        assert list(Graph().parse(data=data, format="nt").objects(None, RDFS.comment)) == [description]
+    
     @patch('httpx.AsyncClient.post')
     async def test_query_sparql_success(self, mock_post, triplestore_client):
         """Test successful SPARQL query execution"""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "results": {
                 "bindings": [
                     {"s": {"value": "http://example.org/asset1"}}
                 ]
             }
-        }
+        })
         mock_post.return_value = mock_response
         
         query = "SELECT ?s WHERE { ?s a <http://example.org/Asset> }"
-        result = await triplestore_client.query_sparql(query)
+        result = await triplestore_client.query(query)
         
         assert result is not None
         assert "results" in result
-        mock_post.assert_called_once() 
\ No newline at end of file
+        mock_post.assert_called_once() 
+    
+    @pytest.mark.asyncio
+    async def test_query_stream_parses_tsv_rows(self, triplestore_client):
+        """Test streamed TSV results are decoded into SPARQL JSON bindings"""
+        import httpx
+        
+        body = (
+            "?asset\t?label\t?size\n"
+            '<http://example.org/a>\t"say \\"hi\\"\\tthere"@en\t42\n'
+            '<http://example.org/b>\t\t\n'
+        )
+        
+        def handler(request):
+            assert request.headers["accept"] == "text/tab-separated-values"
+            return httpx.Response(200, text=body)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            rows = [row async for row in triplestore_client.query_stream("SELECT * WHERE { ?s ?p ?o }")]
+        
+        assert rows == [
+            {
+                "asset": {"type": "uri", "value": "http://example.org/a"},
+                "label": {"type": "literal", "value": 'say "hi"\tthere', "xml:lang": "en"},
+                "size": {"type": "literal", "value": "42", "datatype": "http://www.w3.org/2001/XMLSchema#integer"}
+            },
+            {"asset": {"type": "uri", "value": "http://example.org/b"}}
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_query_stream_keeps_unicode_line_separators_in_literals(self, triplestore_client):
+        """Test only LF ends a TSV row, so U+2028 and similar characters stay inside their literal"""
+        import httpx
+        
+        title = "first\u2028second\x0cthird\x85end"
+        body = f'?asset\t?title\n<http://example.org/a>\t"{title}"\n'.encode("utf-8")
+        
+        split = body.index("\u2028".encode("utf-8")) + 1
+        
+        async def chunks():
+            # Split inside the multi-byte separator, so rows must be reassembled before decoding
+            yield body[:split]
+            yield body[split:]
+        
+        def handler(request):
+            return httpx.Response(200, content=chunks())
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            rows = [row async for row in triplestore_client.query_stream("SELECT * WHERE { ?s ?p ?o }")]
+        
+        assert rows == [{
+            "asset": {"type": "uri", "value": "http://example.org/a"},
+            "title": {"type": "literal", "value": title}
+        }]
+    
+    @pytest.mark.asyncio
+    async def test_query_stream_reassembles_rows_from_small_chunks(self, triplestore_client):
+        """Test rows split across many chunks, with several rows in one chunk, come back whole"""
+        import httpx
+        
+        description = "x" * 5000
+        body = f'?asset\t?description\r\n<http://example.org/a>\t"{description}"\n<http://example.org/b>\t"b"'.encode("utf-8")
+        
+        async def chunks():
+            for i in range(0, len(body), 7):
+                yield body[i:i + 7]
+        
+        def handler(request):
+            return httpx.Response(200, content=chunks())
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            rows = [row async for row in triplestore_client.query_stream("SELECT * WHERE { ?s ?p ?o }")]
+        
+        assert [row["description"]["value"] for row in rows] == [description, "b"]
+    
+    def test_parse_tsv_term_keeps_unrecognized_text_as_plain_literal(self):
+        """Test unquoted text that is not a number or boolean becomes a plain literal rather than an xsd:double"""
+        assert _parse_tsv_term("1.5e3")["datatype"] == "http://www.w3.org/2001/XMLSchema#double"
+        assert _parse_tsv_term('"half a literal') == {"type": "literal", "value": '"half a literal'}
+    
+    def test_parse_tsv_term_typed_literal(self):
+        """Test typed literals and unicode escapes in TSV terms"""
+        assert _parse_tsv_term('"caf\\u00e9"^^<http://www.w3.org/2001/XMLSchema#string>') == {
+            "type": "literal",
+            "value": "café",
+            "datatype": "http://www.w3.org/2001/XMLSchema#string"
+        }
+        assert _parse_tsv_term("") is None
+    
+    @pytest.mark.asyncio
+    async def test_query_decodes_raw_json_body(self, triplestore_client):
+        """Test SELECT is one form POST on the shared client, decoded from the raw response body"""
+        import httpx
+        
+        requests = []
+        body = b'{"head": {"vars": ["s"]}, "results": {"bindings": [{"s": {"type": "uri", "value": "http://example.org/a"}}]}}'
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=body)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            result = await triplestore_client.query("SELECT ?s WHERE { ?s ?p ?o }")
+        
+        assert result["results"]["bindings"][0]["s"]["value"] == "http://example.org/a"
+        assert requests[0].url == triplestore_client.sparql_endpoint
+        assert requests[0].headers["accept"] == "application/sparql-results+json"
+        assert b"query=SELECT" in requests[0].content
+    
+    @pytest.mark.asyncio
+    async def test_construct_query_parses_turtle(self, triplestore_client):
+        """Test CONSTRUCT results are requested as Turtle and parsed into a graph"""
+        import httpx
+        
+        def handler(request):
+            assert request.headers["accept"] == "text/turtle"
+            return httpx.Response(200, content=b'<http://example.org/a> <http://example.org/p> "x" .')
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            graph = await triplestore_client.construct_query("CONSTRUCT { ?s ?p ?o } WHERE { ?s ?p ?o }")
+        
+        assert len(graph) == 1
+        assert Literal("x") in set(graph.objects())
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code, body, expected_exists, expected_triples", [
+        (200, b'{"results": {"bindings": [{"triples": {"value": "641"}, "graphs": {"value": "2"}}]}}', True, 641),
+        (404, b'Unknown repository', False, None),
+    ])
+    async def test_get_status_bundle(self, triplestore_client, status_code, body, expected_exists, expected_triples):
+        """Test repository existence and stats come from a single SPARQL request"""
+        import httpx
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(status_code, content=body)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            bundle = await triplestore_client.get_status_bundle()
+        
+        assert len(requests) == 1
+        assert bundle["connected"] is True
+        assert bundle["repository_exists"] is expected_exists
+        assert (bundle["stats"] or {}).get("triple_count") == expected_triples
+    
+    @pytest.mark.asyncio
+    async def test_add_triples_bulk_posts_one_ntriples_body(self, triplestore_client, sample_triples):
+        """Test several triple lists are written as N-Triples in a single request"""
+        import httpx
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            result = await triplestore_client.add_triples_bulk([sample_triples[:2], sample_triples[2:]])
+        
+        assert result is True
+        assert len(requests) == 1
+        assert requests[0].headers["content-type"] == "application/n-triples"
+        lines = requests[0].content.decode().splitlines()
+        assert len(lines) == 3
+        assert lines[1] == '<http://sbekms.example.org/instances/asset_123> <http://www.w3.org/2000/01/rdf-schema#label> "test.py" .'
+    
+    @pytest.mark.asyncio
+    async def test_add_triples_stream_uploads_chunks_in_one_request(self, triplestore_client, sample_triples):
+        """Test a triple generator is streamed as one N-Triples request body"""
+        import httpx
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            result = await triplestore_client.add_triples_stream((triple for triple in sample_triples), chunk_size=2)
+            empty = await triplestore_client.add_triples_stream(iter(()))
+        
+        assert result is True and empty is True
+        assert len(requests) == 1
+        assert requests[0].headers["content-type"] == "application/n-triples"
+        assert requests[0].content.decode() == triplestore_client._serialize_triples(sample_triples)
+    
+    @pytest.mark.asyncio
+    async def test_warm_pool_opens_connections_concurrently(self, triplestore_client):
+        """Test warming sends one lightweight request per connection and counts the successes"""
+        import httpx
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200 if len(requests) < 3 else 503)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            warmed = await triplestore_client.warm_pool(connections=3)
+        
+        assert warmed == 2
+        assert len(requests) == 3
+        assert all(request.url.path.endswith("/protocol") for request in requests)
+    
+    @pytest.mark.asyncio
+    async def test_requests_share_one_http_client(self, triplestore_client):
+        """Test requests reuse one pooled HTTP client until it is closed"""
+        import httpx
+        
+        created = []
+        real_client = httpx.AsyncClient
+        
+        def make_client(**kwargs):
+            created.append(kwargs)
+            return real_client(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        
+        with patch("app.core.triplestore_client.httpx.AsyncClient", make_client):
+            assert await triplestore_client.test_connection() is True
+            assert await triplestore_client.repository_exists() is True
+            assert len(created) == 1
+            
+            await triplestore_client.aclose()
+            assert await triplestore_client.test_connection() is True
+            assert len(created) == 2
+        
+        await triplestore_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_query_results_are_cached_until_store_changes(self, triplestore_client, sample_triples):
+        """Test a repeated SELECT is served from the cache and a write invalidates it"""
+        import httpx
+        
+        body = b'{"head": {"vars": ["s"]}, "results": {"bindings": []}}'
+        queries = []
+        
+        def handler(request):
+            if request.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+                queries.append(request)
+                return httpx.Response(200, content=body)
+            return httpx.Response(204)
+        
+        real_client = httpx.AsyncClient
+        with patch("app.core.triplestore_client.httpx.AsyncClient",
+                   lambda **kwargs: real_client(transport=httpx.MockTransport(handler))):
+            await triplestore_client.query("SELECT ?s WHERE { ?s ?p ?o }")
+            await triplestore_client.query("  SELECT ?s WHERE { ?s ?p ?o }\n")
+            assert len(queries) == 1
+            
+            assert await triplestore_client.add_triples(sample_triples) is True
+            
+            await triplestore_client.query("SELECT ?s WHERE { ?s ?p ?o }")
+            assert len(queries) == 2
+            
+            await triplestore_client.query("SELECT ?s WHERE { ?s ?p ?o }", use_cache=False)
+            assert len(queries) == 3
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.update_buffer import SPARQLUpdateBuffer
+
+
+INSERT_A = 'INSERT DATA { <http://ex.org/a> <http://ex.org/p> "a" }'
+INSERT_B = 'INSERT DATA { <http://ex.org/b> <http://ex.org/p> "b" }'
+INSERT_EX = 'PREFIX ex: <http://ex.org/>\nINSERT DATA { ex:c ex:p "c" }'
+INSERT_OTHER_EX = 'PREFIX ex: <http://other.org/>\nINSERT DATA { ex:d ex:p "d" }'
+
+
+@pytest.fixture
+def triplestore():
+    """Mock triplestore whose updates succeed"""
+    store = AsyncMock()
+    store.update = AsyncMock(return_value=True)
+    return store
+
+
+class TestSPARQLUpdateBuffer:
+    """Test cases for SPARQLUpdateBuffer"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_share_one_request(self, triplestore):
+        """Test updates submitted together are sent as one multi-operation request"""
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=0.01)
+        
+        results = await asyncio.gather(buffer.submit(INSERT_A), buffer.submit(INSERT_B))
+        
+        assert results == [True, True]
+        triplestore.update.assert_awaited_once_with(f"{INSERT_A};\n{INSERT_B}")
+    
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self, triplestore):
+        """Test reaching max_batch sends without waiting for the delay"""
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=60.0, max_batch=2)
+        
+        results = await asyncio.wait_for(
+            asyncio.gather(buffer.submit(INSERT_A), buffer.submit(INSERT_B)), timeout=1.0
+        )
+        
+        assert results == [True, True]
+        assert triplestore.update.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_retries_individually(self, triplestore):
+        """Test a rejected batch isolates the failing update"""
+        triplestore.update = AsyncMock(side_effect=lambda sparql: sparql == INSERT_A)
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=0.01)
+        
+        results = await asyncio.gather(buffer.submit(INSERT_A), buffer.submit("NOT SPARQL"))
+        
+        assert results == [True, False]
+        assert triplestore.update.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_prologues_are_not_shared_between_callers(self, triplestore):
+        """Test only updates with identical PREFIX/BASE declarations share a request"""
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=0.01)
+        
+        results = await asyncio.gather(
+            buffer.submit(INSERT_EX), buffer.submit(INSERT_A), buffer.submit(INSERT_OTHER_EX), buffer.submit(INSERT_EX)
+        )
+        
+        assert results == [True, True, True, True]
+        requests = [call.args[0] for call in triplestore.update.await_args_list]
+        assert requests == [
+            'PREFIX ex: <http://ex.org/>\nINSERT DATA { ex:c ex:p "c" };\nINSERT DATA { ex:c ex:p "c" }',
+            INSERT_A,
+            INSERT_OTHER_EX,
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_update_declaring_prefixes_mid_request_is_sent_alone(self, triplestore):
+        """Test a PREFIX after the first operation, which would leak into later callers' operations, is not batched"""
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=0.01)
+        mid_request = f"{INSERT_A};\n{INSERT_EX}"
+        
+        await asyncio.gather(buffer.submit(mid_request), buffer.submit(INSERT_B))
+        
+        assert [call.args[0] for call in triplestore.update.await_args_list] == [mid_request, INSERT_B]
+    
+    @pytest.mark.asyncio
+    async def test_store_error_reaches_every_caller(self, triplestore):
+        """Test an exception from the store is raised to each caller instead of leaving them waiting"""
+        triplestore.update = AsyncMock(side_effect=RuntimeError("store down"))
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=0.01)
+        
+        results = await asyncio.wait_for(
+            asyncio.gather(buffer.submit(INSERT_A), buffer.submit(INSERT_EX), return_exceptions=True), timeout=1.0
+        )
+        
+        assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    
+    @pytest.mark.asyncio
+    async def test_cancelling_the_flushing_caller_does_not_strand_the_batch(self, triplestore):
+        """Test the caller that fills the batch can be cancelled without hanging the others"""
+        release = asyncio.Event()
+        
+        async def slow_update(sparql):
+            await release.wait()
+            return True
+        
+        triplestore.update = AsyncMock(side_effect=slow_update)
+        buffer = SPARQLUpdateBuffer(triplestore, max_delay=60.0, max_batch=2)
+        
+        first = asyncio.create_task(buffer.submit(INSERT_A))
+        await asyncio.sleep(0)
+        last = asyncio.create_task(buffer.submit(INSERT_B))
+        await asyncio.sleep(0.01)
+        last.cancel()
+        release.set()
+        
+        assert await asyncio.wait_for(first, timeout=1.0) is True
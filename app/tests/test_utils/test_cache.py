@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def cache():
+    """Create a small TTLCache for testing"""
+    return TTLCache(maxsize=2, ttl=10.0)
+
+
+class TestTTLCache:
+    """Test cases for TTLCache"""
+    
+    def test_get_missing_returns_default(self, cache):
+        """Test lookup of a key that was never stored"""
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+    
+    def test_set_and_get(self, cache):
+        """Test storing and retrieving a value"""
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == {"value": 1}
+    
+    def test_entries_expire(self, cache):
+        """Test that entries are dropped once their TTL has passed"""
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+        
+        with patch("app.utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+    
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        """Test that the cache never grows beyond maxsize"""
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_clear(self, cache):
+        """Test clearing the cache"""
+        cache.set("a", 1)
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,92 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after a fixed time-to-live"""
+    
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Results derived from triplestore contents; cleared whenever the store is modified
+graph_cache = TTLCache(maxsize=128, ttl=60.0)
+search_cache = TTLCache(maxsize=1024, ttl=60.0)
+# Raw SELECT results keyed by store generation and query digest, filled by TriplestoreClient.query
+sparql_cache = TTLCache(maxsize=1024, ttl=60.0)
+# System status and ontology listings polled by dashboards; entries set their own TTL
+system_cache = TTLCache(maxsize=16, ttl=10.0)
+
+# Bumped on every store modification so long-lived derived data knows to rebuild
+_generation = 0
+
+
+def clear_query_caches():
+    """Invalidate every cache holding triplestore-derived results"""
+    global _generation
+    graph_cache.clear()
+    search_cache.clear()
+    sparql_cache.clear()
+    system_cache.clear()
+    _generation += 1
+
+
+def query_cache_generation() -> int:
+    """Return the current store modification counter"""
+    return _generation
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against the current ETag, using weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
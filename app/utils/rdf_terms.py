@@ -0,0 +1,39 @@
+# Conversions between rdflib, pyoxigraph and SPARQL JSON result terms
+from typing import Dict
+from rdflib import URIRef, BNode, Literal
+import pyoxigraph as ox
+
+
+def to_oxigraph(term):
+    """Convert an rdflib term to its pyoxigraph equivalent"""
+    if isinstance(term, URIRef):
+        return ox.NamedNode(str(term))
+    if isinstance(term, BNode):
+        return ox.BlankNode(str(term))
+    if term.language:
+        return ox.Literal(str(term), language=term.language)
+    if term.datatype:
+        return ox.Literal(str(term), datatype=ox.NamedNode(str(term.datatype)))
+    return ox.Literal(str(term))
+
+
+def to_rdflib(term):
+    """Convert a pyoxigraph term to its rdflib equivalent"""
+    if isinstance(term, ox.NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, ox.BlankNode):
+        return BNode(term.value)
+    if term.language:
+        return Literal(term.value, lang=term.language)
+    return Literal(term.value, datatype=URIRef(term.datatype.value))
+
+
+def to_json_term(term) -> Dict[str, str]:
+    """Convert a pyoxigraph term to a SPARQL JSON results binding"""
+    if isinstance(term, ox.NamedNode):
+        return {'type': 'uri', 'value': term.value}
+    if isinstance(term, ox.BlankNode):
+        return {'type': 'bnode', 'value': term.value}
+    if term.language:
+        return {'type': 'literal', 'value': term.value, 'xml:lang': term.language}
+    return {'type': 'literal', 'value': term.value, 'datatype': term.datatype.value}